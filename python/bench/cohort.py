@@ -0,0 +1,167 @@
+"""Check the NumPy cohort against the scalar engine.
+
+    python bench/cohort.py [--students 300] [--days 4] [--seed 0]
+
+Lockstep: a one-student Cohort with random events off plays its decisions
+on a Simulation too, and every stat and quest must be equal after every
+second of game time. Distributions: with random events on, a cohort of
+--students is run next to as many Simulations, each steered by a
+one-student cohort that decides on the Simulation's own state. Events use
+different random generators on the two sides, so only the per-day means are
+compared; they must agree within --tolerance standard errors.
+
+Exits with status 1 on any mismatch. Needs NumPy.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from game import actions  # noqa: E402
+from game.actions import SCHOOLS  # noqa: E402
+from game.cohort import Cohort, IDLE, QUEST_BIT, QUESTS, SECONDS_PER_DAY, SLEEP, STATS, STEPS, np  # noqa: E402
+from game.consts import SIM_HZ  # noqa: E402
+from game.engine import Simulation  # noqa: E402
+from game.montecarlo import HeuristicPlayer  # noqa: E402
+from game.state import GameState  # noqa: E402
+
+FIELDS = STATS + ('quests',)
+
+
+def scalar_row(s):
+    """The cohort's FIELDS read from a GameState."""
+    bits = sum(QUEST_BIT[q] for q in QUESTS if s.quests[q])
+    return (s.energy, s.knowledge, s.stress, s.reputation, s.discipline, s.xp, s.collected_points, bits)
+
+
+class Paired(Cohort):
+    """One-student cohort whose decisions are also played on a Simulation.
+
+    With follow=True it loads the Simulation's state before deciding, so it
+    only acts as the Simulation's player; otherwise it keeps its own state
+    and the two can be compared.
+    """
+
+    def __init__(self, sim, seed, follow=False, **opts):
+        super().__init__(1, seed=seed, **opts)
+        self.sim = sim
+        self.follow = follow
+
+    def load(self, s):
+        for name, v in zip(FIELDS, scalar_row(s)):
+            getattr(self, name)[0] = v
+        self.meal_coupon[0] = s.flags['mealCoupon']
+        self.program_done[0] = sum(1 for v in s.meta['programCourses'].values() if v)
+        self.department_done[0] = sum(1 for v in s.meta['courses'].values() if v)
+
+    def step(self):
+        self.sim.run(SIM_HZ)
+        super().step()
+
+    def collect_coins(self, acting):
+        if self.follow:
+            self.load(self.sim.state)
+        left = int(self.coins_left[0])
+        super().collect_coins(acting)
+        if self.coins_left[0] < left:
+            self.sim.act(actions.collect_coin)
+
+    def apply(self, choice):
+        super().apply(choice)
+        sim, s = self.sim, self.sim.state
+        step = int(choice[0])
+        if step == SLEEP:
+            sim.visit('dorm')
+            sim.act(actions.go_to_bed)
+            if s.dorm_player_state == 'sleeping':
+                s.dorm_action_timer = 1
+                sim.act(actions.tick_dorm_action)
+        elif step != IDLE:
+            name, building = STEPS[step][:2]
+            args = ()
+            if name == 'choose_school':
+                args = (sorted(SCHOOLS)[0],)
+            elif name == 'choose_department':
+                args = (sorted(SCHOOLS[s.meta['school']]['departments'])[0],)
+            sim.visit(building)
+            sim.act(HeuristicPlayer.STEP_ACTIONS[name], *args)
+
+
+def new_sim(seed, **params):
+    return Simulation(GameState.variant(rng=random.Random(seed), **params)())
+
+
+def lockstep(days, seed):
+    """First (second, field, cohort value, scalar value) that differs, or None."""
+    pair = Paired(new_sim(seed, EVENT_CHANCE=0), seed, event_chance=0)
+    for second in range(1, days * SECONDS_PER_DAY + 1):
+        pair.step()
+        for name, theirs in zip(FIELDS, scalar_row(pair.sim.state)):
+            ours = int(getattr(pair, name)[0])
+            if ours != theirs:
+                return second, name, ours, theirs
+    return None
+
+
+def distributions(students, days, seed, tolerance):
+    """Per day and field: (cohort mean, scalar mean, z); and whether all pass."""
+    cohort = Cohort(students, seed=seed)
+    pairs = [Paired(new_sim(seed + 1 + i), seed + 1 + i, follow=True, event_chance=0)
+             for i in range(students)]
+    rows, ok = [], True
+    for day in range(1, days + 1):
+        for _ in range(SECONDS_PER_DAY):
+            cohort.step()
+            for pair in pairs:
+                pair.step()
+        scalar = np.array([scalar_row(p.sim.state) for p in pairs], float)
+        for col, name in enumerate(STATS):
+            a, b = getattr(cohort, name).astype(float), scalar[:, col]
+            err = math.sqrt((a.var() + b.var()) / students)
+            # Half a point of slack for the integer stats
+            z = abs(a.mean() - b.mean()) / (err + 0.5 / math.sqrt(students))
+            ok &= z <= tolerance
+            rows.append((day, name, a.mean(), b.mean(), z))
+    return rows, ok
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Cohort vs scalar engine check")
+    ap.add_argument('--students', type=int, default=300)
+    ap.add_argument('--days', type=int, default=4)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--tolerance', type=float, default=4.0, help="allowed difference in standard errors")
+    args = ap.parse_args(argv)
+    if np is None:
+        sys.exit("bench/cohort.py needs NumPy (pip install numpy)")
+
+    failed = False
+    t0 = time.perf_counter()
+    diff = lockstep(args.days, args.seed)
+    if diff:
+        second, name, ours, theirs = diff
+        print(f"lockstep: {name} differs after {second}s: cohort {ours}, scalar {theirs}")
+        failed = True
+    else:
+        print(f"lockstep: {args.days} days equal ({time.perf_counter() - t0:.1f}s)")
+
+    t0 = time.perf_counter()
+    rows, ok = distributions(args.students, args.days, args.seed, args.tolerance)
+    print(f"distributions: {args.students} students, {time.perf_counter() - t0:.1f}s")
+    print("day  stat         cohort   scalar     z")
+    for day, name, a, b, z in rows:
+        flag = '  <-' if z > args.tolerance else ''
+        print(f"{day:>3}  {name:<10} {a:>8.1f} {b:>8.1f} {z:>5.1f}{flag}")
+    if not ok:
+        print(f"distributions differ by more than {args.tolerance} standard errors")
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,286 @@
+"""Frame times of the pygame front end on scripted scenarios, headless.
+
+    python bench/frames.py [--frames 300] [--json out.json] [--baseline base.json]
+    python bench/frames.py --replay session.rec
+
+Runs the real main.py drawing code on the SDL dummy driver. Each scenario
+(walk the campus, each building popup, showering in the dorm, walking the
+city) starts from a fresh game with a fixed seed and feeds the same keys
+every run. Per scenario it reports frame time percentiles (sim ticks plus
+render(), without the display flip), the median cost of render(), draw_map,
+draw_city_view, draw_dorm_interior and Popup.draw, sim ticks per second and,
+from a separate traced pass so it doesn't skew the timings, how much memory
+a frame allocates at its peak and how much it keeps.
+
+--json writes the results; --baseline compares them with an earlier --json
+file and exits with status 1 if a scenario's frame time p50/p95 or peak
+allocation grew by more than --tolerance. --replay times a recording from
+main.py --record instead of the scripted scenarios.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame  # noqa: E402
+
+from game.popup import Popup  # noqa: E402
+from game.replay import HeldKeys  # noqa: E402
+
+SEED = 1
+LEFT, RIGHT = 1, 2  # HeldKeys bits, see game.replay.HELD_KEYS
+TIMED = ('render', 'sim_step', 'draw_map', 'draw_city_view', 'draw_dorm_interior')
+DRAWN = ('render', 'draw_map', 'draw_city_view', 'draw_dorm_interior', 'Popup.draw')
+WARMUP_FRAMES = 10  # Bakes layers, sprites and text caches before measuring
+
+
+class Probe:
+    """Wraps functions so each call adds its time to the current frame."""
+
+    def __init__(self):
+        self.frame = {}
+
+    def wrap(self, owner, name, label=None):
+        fn = getattr(owner, name)
+        label = label or name
+        frame = self.frame
+
+        def timed(*args, **kwargs):
+            t = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                frame[label] = frame.get(label, 0.0) + time.perf_counter() - t
+
+        setattr(owner, name, timed)
+
+    def take(self):
+        """Seconds per timed function since the last take()."""
+        frame = dict(self.frame)
+        self.frame.clear()
+        return frame
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+# Scenarios: generators yielding the held-key mask of each frame. They get
+# the main module and may act on it between frames.
+
+def campus_walk(m, frames):
+    for i in range(frames):
+        yield RIGHT if (i // 120) % 2 == 0 else LEFT
+
+
+def popup_scenario(key):
+    def scenario(m, frames):
+        m.open_popup_for(key)
+        for _ in range(frames):
+            yield 0
+        m.close_popup()
+    scenario.__name__ = f'popup_{key}'
+    return scenario
+
+
+def dorm_shower(m, frames):
+    m.open_popup_for('dorm')
+    for _ in range(frames):
+        if m.state.dorm_player_state == 'idle':
+            m.state.energy = 100
+            m.use_dorm_item('shower')
+        yield 0
+
+
+def city_walk(m, frames):
+    m.SCENES.push('city')
+    m.scene.transition_alpha = 0
+    for i in range(frames):
+        yield RIGHT if (i // 100) % 2 == 0 else LEFT
+
+
+SCENARIOS = [campus_walk] + [popup_scenario(k) for k in ('classroom', 'library', 'cafeteria', 'admin')] \
+    + [dorm_shower, city_walk]
+
+
+def start(m):
+    """A fresh game on the campus with nothing open."""
+    m.close_popup()
+    m.reset_game()
+    m.player_rect.topleft = m.player_prev.topleft = (m.scene.x, m.scene.y)
+    m.SHOWER_PARTICLES.clear()
+
+
+def play(m, probe, scenario, frames, per_frame):
+    ticks = m.SIM_HZ // m.FPS
+    start(m)
+    for i, mask in enumerate(scenario(m, frames + WARMUP_FRAMES)):
+        keys = HeldKeys(mask)
+        for _ in range(ticks):
+            m.sim_step(keys)
+        m.render()
+        if i >= WARMUP_FRAMES:
+            per_frame()
+        else:
+            probe.take()
+
+
+def summarize(frames, ticks, allocs=None):
+    totals = [f.get('sim_step', 0.0) + f.get('render', 0.0) for f in frames]
+    sim_time = sum(f.get('sim_step', 0.0) for f in frames)
+    result = {
+        'frames': len(frames),
+        'frame_ms': {
+            'p50': percentile(totals, 0.5) * 1000,
+            'p95': percentile(totals, 0.95) * 1000,
+            'p99': percentile(totals, 0.99) * 1000,
+            'max': max(totals) * 1000,
+        },
+        'draw_ms': {
+            # Median over the frames that called it
+            name: percentile([f[name] for f in frames if name in f], 0.5) * 1000
+            for name in DRAWN if any(name in f for f in frames)
+        },
+        'sim_ticks_per_s': ticks / sim_time if sim_time else None,
+    }
+    if allocs:
+        result['alloc_peak_kb'] = percentile([a[0] for a in allocs], 0.5) / 1024
+        result['alloc_kept_kb'] = sum(a[1] for a in allocs) / len(allocs) / 1024
+    return result
+
+
+def run_scenario(m, probe, scenario, frames, alloc_frames):
+    timed = []
+    play(m, probe, scenario, frames, lambda: timed.append(probe.take()))
+    ticks = len(timed) * (m.SIM_HZ // m.FPS)
+
+    allocs = []
+    if alloc_frames:
+        tracemalloc.start()
+        mark = [tracemalloc.get_traced_memory()[0]]
+
+        def traced():
+            current, peak = tracemalloc.get_traced_memory()
+            allocs.append((peak - mark[0], current - mark[0]))
+            tracemalloc.reset_peak()
+            mark[0] = tracemalloc.get_traced_memory()[0]
+
+        play(m, probe, scenario, alloc_frames, traced)
+        tracemalloc.stop()
+        probe.take()
+    return summarize(timed, ticks, allocs)
+
+
+def run_replay(m, probe):
+    """Time main.main() playing back the recording it was started with."""
+    frames = []
+    render = m.render  # Already timed
+
+    def render_frame():
+        render()
+        frames.append(probe.take())
+
+    m.render = render_frame
+    first_tick = m.SIM.ticks
+    m.main()
+    return summarize(frames, m.SIM.ticks - first_tick)
+
+
+def compare(results, baseline, tolerance, floor_ms=0.05):
+    """Lines describing each change beyond `tolerance`, and whether any is a regression."""
+    lines = []
+    regressed = False
+    for name, now in results['scenes'].items():
+        before = baseline.get('scenes', {}).get(name)
+        if before is None:
+            lines.append(f"  {name:<18} new scenario")
+            continue
+        checks = [(f'frame {p}', now['frame_ms'][p], before['frame_ms'][p], floor_ms) for p in ('p50', 'p95')]
+        if 'alloc_peak_kb' in now and 'alloc_peak_kb' in before:
+            checks.append(('alloc peak', now['alloc_peak_kb'], before['alloc_peak_kb'], 1.0))
+        for label, new, old, floor in checks:
+            if new > old * (1 + tolerance) and new - old > floor:
+                lines.append(f"  {name:<18} {label:<11} {old:8.3f} -> {new:8.3f}  REGRESSION")
+                regressed = True
+            elif new < old * (1 - tolerance) and old - new > floor:
+                lines.append(f"  {name:<18} {label:<11} {old:8.3f} -> {new:8.3f}  faster")
+    return lines, regressed
+
+
+def report(results):
+    print(f"{'scenario':<18} {'p50':>7} {'p95':>7} {'p99':>7} {'max':>7}  {'ticks/s':>9}  {'alloc':>8}  draw (p50 ms)")
+    for name, r in results['scenes'].items():
+        ms = r['frame_ms']
+        tps = f"{r['sim_ticks_per_s']:9.0f}" if r['sim_ticks_per_s'] else f"{'-':>9}"
+        alloc = f"{r['alloc_peak_kb']:6.1f}kB" if 'alloc_peak_kb' in r else f"{'-':>8}"
+        draws = ', '.join(f"{k} {v:.3f}" for k, v in r['draw_ms'].items())
+        print(f"{name:<18} {ms['p50']:7.3f} {ms['p95']:7.3f} {ms['p99']:7.3f} {ms['max']:7.3f}  {tps}  {alloc}  {draws}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless frame time benchmark")
+    ap.add_argument('--frames', type=int, default=300, help="measured frames per scenario")
+    ap.add_argument('--alloc-frames', type=int, default=60, help="frames in the traced pass (0 = skip)")
+    ap.add_argument('--only', default=None, help="comma-separated scenario names")
+    ap.add_argument('--replay', default=None, help="time a recording instead of the scenarios")
+    ap.add_argument('--json', default=None, help="write results to this file")
+    ap.add_argument('--baseline', default=None, help="compare with results from an earlier --json")
+    ap.add_argument('--tolerance', type=float, default=0.2, help="allowed relative slowdown (default 0.2)")
+    args = ap.parse_args(argv)
+
+    # main.py reads its options at import
+    main_argv = ['main.py', '--no-save', f'--seed={SEED}']
+    if args.replay:
+        main_argv += [f'--replay={args.replay}', '--fps=0']
+    sys.argv = main_argv
+    import main as m
+
+    m.toast = lambda text, color=None: None
+    m.SIM.on_message = None
+    probe = Probe()
+    for name in TIMED:
+        probe.wrap(m, name)
+    probe.wrap(Popup, 'draw', 'Popup.draw')
+
+    results = {
+        'meta': {
+            'python': platform.python_version(),
+            'pygame': pygame.version.ver,
+            'machine': platform.machine(),
+            'frames': args.frames,
+            'seed': SEED,
+        },
+        'scenes': {},
+    }
+    if args.replay:
+        results['scenes']['replay'] = run_replay(m, probe)
+    else:
+        only = set(args.only.split(',')) if args.only else None
+        for scenario in SCENARIOS:
+            if only is None or scenario.__name__ in only:
+                results['scenes'][scenario.__name__] = run_scenario(m, probe, scenario, args.frames, args.alloc_frames)
+
+    report(results)
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        lines, regressed = compare(results, baseline, args.tolerance)
+        print(f"against {args.baseline} (tolerance {args.tolerance:.0%}):")
+        print('\n'.join(lines) if lines else "  no change")
+        if regressed:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
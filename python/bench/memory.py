@@ -0,0 +1,151 @@
+"""Bytes per game session: the old dict-based GameState vs the slotted one.
+
+    python bench/memory.py [--sessions 100000]
+
+Sessions are kept alive in a list while tracemalloc measures what they
+allocated, so the numbers include every dict, set and list a session owns.
+"""
+import argparse
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from game.state import GameState, SceneState  # noqa: E402
+
+
+class LegacyGameState:
+    """GameState as it was laid out before the slots change: one __dict__
+    per session holding scene fields and a fresh dict per quest/flag group."""
+
+    def __init__(self):
+        self.version = 0
+        self.versions = {}
+        self.x = 100
+        self.y = 269
+        self.speed = 3
+        self.energy = 80
+        self.knowledge = 20
+        self.stress = 30
+        self.reputation = 25
+        self.discipline = 40
+        self.xp = 0
+        self.inventory = set()
+        self.quests = {
+            'firstClass': False,
+            'studentId': False,
+            'libraryVisit': False,
+            'timetable': False,
+            'eatMeal': False,
+            'chooseSchool': False,
+            'programOrientation': False,
+            'completeProgramCourses': False,
+            'chooseDepartment': False,
+            'completeDepartmentCourses': False
+        }
+        self.flags = {
+            'dormKey': False,
+            'firstClassBadge': False,
+            'libraryCard': False,
+            'mealCoupon': False,
+            'studentId': False,
+            'timetable': False,
+            'ateMeal': False,
+            'dormStudyDone': False
+        }
+        self.meta = {
+            'school': None,
+            'department': None,
+            'coursesDone': 0,
+            'courses': {},
+            'programCourses': {},
+            'booksRead': 0
+        }
+        self.day = 1
+        self.time_of_day = 'Morning'
+        self.time_tick = 0
+        self.last_time_update = 0
+        self.popup_open = False
+        self.suppress_until_exit = False
+        self.victory_awarded = False
+        self.show_city_view = False
+        self.show_dorm_interior = False
+        self.transition_alpha = 0
+        self.city_car_positions = [100, 300, 500, 700, 900]
+        self.city_player_x = 600
+        self.city_player_y = 525
+        self.dorm_player_x = 600
+        self.dorm_player_y = 500
+        self.dorm_player_state = 'idle'
+        self.dorm_action_timer = 0
+        self.locker_open = False
+        self.collected_points = 0
+        self.achievements = {
+            'firstSteps': False,
+            'coinCollector': False,
+            'coinMaster': False,
+            'cityExplorer': False,
+            'nightOwl': False,
+            'earlyBird': False,
+            'socialButterfly': False,
+            'scholar': False,
+            'zenMaster': False,
+            'speedDemon': False,
+            'perfectDay': False,
+            'veteran': False
+        }
+        self.daily_challenges = {
+            'collect_coins': {'target': 5, 'current': 0, 'reward': 10},
+            'visit_buildings': {'target': 3, 'current': 0, 'reward': 15},
+            'maintain_stress': {'target': 50, 'current': 0, 'reward': 20},
+            'gain_knowledge': {'target': 10, 'current': 0, 'reward': 25}
+        }
+        self.last_challenge_reset_day = 1
+        self.upgrades = {
+            'speed': 0,
+            'energy_max': 0,
+            'coin_magnet': 0,
+            'stress_resistance': 0,
+            'knowledge_boost': 0
+        }
+        self.active_events = []
+        self.event_cooldown = 0
+        self.daily_streak = 0
+        self.last_active_day = 0
+        self.difficulty_level = 1
+        self.stress_multiplier = 1.0
+
+
+def bytes_per_session(make, sessions):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [make() for _ in range(sessions)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    # The list itself holds one pointer per session
+    return (after - before - sys.getsizeof(kept)) / len(kept)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Memory per GameState session")
+    ap.add_argument('--sessions', type=int, default=100000)
+    args = ap.parse_args(argv)
+
+    # Build one of each first so class-level caches aren't counted
+    LegacyGameState(), GameState(), SceneState()
+
+    legacy = bytes_per_session(LegacyGameState, args.sessions)
+    core = bytes_per_session(GameState, args.sessions)
+    full = bytes_per_session(lambda: (GameState(), SceneState()), args.sessions)
+
+    print(f"sessions                  {args.sessions}")
+    print(f"legacy GameState          {legacy:8.0f} bytes")
+    print(f"GameState (headless)      {core:8.0f} bytes  {legacy / core:.1f}x smaller")
+    print(f"GameState + SceneState    {full:8.0f} bytes  {legacy / full:.1f}x smaller")
+    print(f"headless total            {core * args.sessions / 2**20:.1f} MiB "
+          f"(was {legacy * args.sessions / 2**20:.1f} MiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,142 @@
+"""Save size, load time and the cost of autosaving to the game loop.
+
+    python bench/save.py [--dir /tmp]
+
+Measures a fresh game and one played for 10 in-game days: bytes on disk,
+snapshot / encode / decode / atomic write times, and what a 60 fps loop pays
+per frame when it autosaves every frame through the background Autosaver
+compared with saving synchronously. Then the same for --journal mode: the
+cost of a journaled mutation, bytes per commit and recovery time.
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from game import save  # noqa: E402
+from game.journal import Journal  # noqa: E402
+from game.engine import Simulation  # noqa: E402
+from game.montecarlo import HeuristicPlayer  # noqa: E402
+from game.state import GameState  # noqa: E402
+
+FRAME_MS = 1000 / 60
+
+
+def played_state(days=10, seed=1):
+    rng = random.Random(seed)
+    sim = Simulation(GameState.variant(rng=rng)())
+    player = HeuristicPlayer(rng)
+    target = sim.state.day + days
+    while sim.state.day < target:
+        sim.run(player.decision_every * 60)
+        player.act(sim)
+    sim.sync()
+    return sim.state
+
+
+def timed(fn, repeat):
+    """(mean, max) milliseconds per call."""
+    worst = 0.0
+    start = time.perf_counter()
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        worst = max(worst, time.perf_counter() - t)
+    return (time.perf_counter() - start) * 1000 / repeat, worst * 1000
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))]
+
+
+def frame_costs(fn, frames):
+    """Call fn once per frame at 60 fps; returns what each call cost the frame."""
+    costs = []
+    for _ in range(frames):
+        t = time.perf_counter()
+        fn()
+        cost = time.perf_counter() - t
+        costs.append(cost * 1000)
+        time.sleep(max(0.0, FRAME_MS / 1000 - cost))
+    return costs
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Save system benchmark")
+    ap.add_argument('--dir', default=None, help="where to write test saves (default: a temp dir)")
+    ap.add_argument('--frames', type=int, default=300)
+    args = ap.parse_args(argv)
+
+    folder = args.dir or tempfile.mkdtemp(prefix='fq-save-')
+    path = os.path.join(folder, 'bench.sav')
+
+    for label, s in (('fresh', GameState()), ('10 days', played_state())):
+        data = save.encode(s)
+        save.write_atomic(path, data)
+        snap_ms, _ = timed(lambda: save.snapshot(s), 2000)
+        enc_ms, _ = timed(lambda: save.encode(s), 2000)
+        dec_ms, _ = timed(lambda: save.decode(data), 2000)
+        load_ms, _ = timed(lambda: save.load(path), 200)
+        write_ms, write_max = timed(lambda: save.write_atomic(path, data), 50)
+        print(f"{label}")
+        print(f"  size             {len(data)} bytes")
+        print(f"  snapshot         {snap_ms * 1000:7.1f} us")
+        print(f"  encode           {enc_ms * 1000:7.1f} us")
+        print(f"  decode           {dec_ms * 1000:7.1f} us")
+        print(f"  load from disk   {load_ms * 1000:7.1f} us")
+        print(f"  atomic write     {write_ms:7.2f} ms (max {write_max:.2f} ms)")
+
+    # What the frame pays: saving every frame is far more often than the
+    # game does (every AUTOSAVE_SECONDS), so this is a worst case
+    s = played_state()
+    saver = save.Autosaver(path)
+    background = frame_costs(lambda: saver.submit(save.snapshot(s)), args.frames)
+    saver.close()
+    blocking = frame_costs(lambda: save.save(s, path), args.frames)
+    print(f"per-frame cost over {args.frames} frames (budget {FRAME_MS:.1f} ms)")
+    for label, costs in (('autosaver', background), ('synchronous', blocking)):
+        print(f"  {label:<12} p50 {percentile(costs, 0.5):6.3f} ms  p99 {percentile(costs, 0.99):6.3f} ms"
+              f"  max {max(costs):6.3f} ms")
+    print(f"  autosaver wrote {saver.saves} saves, error: {saver.last_error}")
+
+    # Journal: one commit per second of play, recover after a "crash"
+    snap_path = os.path.join(folder, 'journal.sav')
+    for leftover in (snap_path, snap_path + '.log'):
+        if os.path.exists(leftover):
+            os.remove(leftover)
+    plain = GameState()
+    journal = Journal(snap_path)
+    rng = random.Random(2)
+    s = journal.recover(GameState.variant(rng=rng))
+    journal.attach(s)
+    plain_ms, _ = timed(lambda: plain.add_xp(1), 100000)
+    journaled_ms, _ = timed(lambda: s.add_xp(1), 100000)
+    sim = Simulation(s)
+    player = HeuristicPlayer(rng)
+    batches = []
+    for _ in range(args.frames):
+        sim.run(60)
+        if sim.ticks % (player.decision_every * 60) == 0:
+            player.act(sim)
+        sim.sync()
+        batches.append(journal.commit())
+    commit_ms, _ = timed(journal.commit, 2000)
+    time.sleep(0.5)  # let the writer catch up, then recover as after a crash
+    log_size = os.path.getsize(journal.log_path)
+    recover_ms, _ = timed(journal.recover, 50)
+    journal.close()
+    print(f"journal over {args.frames} commits")
+    print(f"  mutation         {plain_ms * 1000:7.2f} us plain, {journaled_ms * 1000:.2f} us journaled")
+    print(f"  commit (idle)    {commit_ms * 1000:7.1f} us")
+    print(f"  bytes per commit mean {sum(batches) / len(batches):.0f}, max {max(batches)}")
+    print(f"  compactions      {journal.compactions}, error: {journal.last_error}")
+    print(f"  recover          {recover_ms:7.2f} ms (log {log_size} bytes)")
+
+
+if __name__ == '__main__':
+    main()
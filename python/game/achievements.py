@@ -0,0 +1,124 @@
+"""Achievement rules, indexed by the parts of the state they read.
+
+Each rule names its inputs: GameState change-tracking groups ('stats',
+'progress', 'clock', 'quests'...; 'activity' is touched by Simulation.act
+when a building or dorm activity was done) or 'flags'. A check only re-tests the rules
+whose inputs changed since the last check, and returns every unlock at once.
+"""
+
+
+class Rule:
+    __slots__ = ('key', 'title', 'inputs', 'test')
+
+    def __init__(self, key, title, inputs, test):
+        self.key = key
+        self.title = title
+        self.inputs = inputs
+        self.test = test
+
+
+# How to tell that an input changed: a stamp that differs after any change
+SOURCES = {
+    'clock': lambda s: s.versions.get('clock', 0),
+    'progress': lambda s: s.versions.get('progress', 0),
+    'stats': lambda s: s.versions.get('stats', 0),
+    'quests': lambda s: s.versions.get('quests', 0),
+    'activity': lambda s: s.versions.get('activity', 0),
+    'flags': lambda s: s.flags.bits,
+}
+
+ZEN_STRESS = 20  # Stress has to stay below this...
+ZEN_DAYS = 3  # ...for this many days
+SPEED_DEMON_COINS = 5  # Coins within one day
+
+RULES = [
+    Rule('firstSteps', 'First Steps', ('quests',),
+         lambda s, w: any(s.quests.values())),
+    Rule('coinCollector', 'Coin Collector', ('progress',),
+         lambda s, w: s.collected_points >= 10),
+    Rule('coinMaster', 'Coin Master', ('progress',),
+         lambda s, w: s.collected_points >= 50),
+    Rule('cityExplorer', 'City Explorer', ('flags',),
+         lambda s, w: s.flags['cityVisited']),
+    # Only re-tested right after an activity, so "did one just now"
+    Rule('nightOwl', 'Night Owl', ('activity',),
+         lambda s, w: s.time_of_day == 'Night'),
+    Rule('earlyBird', 'Early Bird', ('activity',),
+         lambda s, w: s.time_of_day == 'Morning'),
+    Rule('socialButterfly', 'Social Butterfly', ('stats',),
+         lambda s, w: s.reputation >= 50),
+    Rule('scholar', 'Scholar', ('stats',),
+         lambda s, w: s.knowledge >= 50),
+    Rule('zenMaster', 'Zen Master', ('stats', 'clock'),
+         lambda s, w: w.calm_since is not None and s.day - w.calm_since >= ZEN_DAYS),
+    Rule('speedDemon', 'Speed Demon', ('progress',),
+         lambda s, w: w.coins_today >= SPEED_DEMON_COINS),
+    # Every quest completed within one day
+    Rule('perfectDay', 'Perfect Day', ('quests',),
+         lambda s, w: w.quests_today == (1 << len(s.quests)) - 1),
+    Rule('veteran', 'Veteran', ('clock',),
+         lambda s, w: s.day >= 10),
+]
+
+# input -> rules that read it, in RULES order
+INDEX = {name: [r for r in RULES if name in r.inputs] for name in SOURCES}
+
+
+class AchievementTracker:
+    """Per-session side of the rules: what was last seen, and the windows
+    (coins picked up and quests completed today, how long stress has stayed
+    low) that multi-day and per-day achievements are measured against.
+
+    The game reports into the daily counters: coin_picked_up(),
+    quest_completed(bit), and new_day() when the day rolls over.
+    """
+
+    __slots__ = ('seen', 'coins_today', 'quests_today', 'calm_since')
+
+    def __init__(self, s):
+        # The first check sees every input as changed; an activity must not be
+        self.seen = {'activity': SOURCES['activity'](s)}
+        self.coins_today = 0
+        self.quests_today = 0  # Bits of the quests completed today
+        self.calm_since = s.day if s.stress < ZEN_STRESS else None
+
+    def new_day(self):
+        self.coins_today = 0
+        self.quests_today = 0
+
+    def coin_picked_up(self):
+        self.coins_today += 1
+
+    def quest_completed(self, bit):
+        self.quests_today |= bit
+
+    def _update_windows(self, s, changed):
+        if 'stats' in changed:
+            if s.stress >= ZEN_STRESS:
+                self.calm_since = None
+            elif self.calm_since is None:
+                self.calm_since = s.day
+
+    def check(self, s):
+        """Unlock every achievement whose rule now holds. Returns their messages."""
+        seen = self.seen
+        changed = []
+        for name, stamp in SOURCES.items():
+            value = stamp(s)
+            if seen.get(name) != value:
+                seen[name] = value
+                changed.append(name)
+        if not changed:
+            return []
+
+        self._update_windows(s, changed)
+        unlocked = s.achievements
+        affected = set()
+        for name in changed:
+            affected.update(INDEX[name])
+        messages = []
+        for rule in RULES:
+            if rule in affected and not unlocked[rule.key] and rule.test(s, self):
+                unlocked[rule.key] = True
+                messages.append(f"Achievement Unlocked: {rule.title}!")
+        return messages
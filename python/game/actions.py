@@ -0,0 +1,453 @@
+"""Game actions as plain functions of a GameState.
+
+Every action applies its effects to `s` and returns the message to show the
+player (or None). Nothing here touches pygame, so the same rules drive the
+building popups, the dorm interior and the headless engine.
+"""
+
+SCHOOLS = {
+    'civil': {
+        'name': 'School of Civil & Water Resources',
+        'departments': {
+            'civil': 'Civil Engineering',
+            'water': 'Water Resources Engineering'
+        },
+        'programCore': ['Calculus I', 'Physics I', 'Intro to Engineering'],
+        'deptCourses': {
+            'civil': ['Intro to Structures', 'Soil Mechanics', 'Surveying'],
+            'water': ['Fluid Mechanics', 'Hydrology', 'Irrigation Engineering']
+        }
+    },
+    'ece': {
+        'name': 'School of Electrical & Computer',
+        'departments': {
+            'electrical': 'Electrical Engineering',
+            'computer': 'Computer Engineering'
+        },
+        'programCore': ['Calculus I', 'Programming Basics', 'Digital Systems I'],
+        'deptCourses': {
+            'electrical': ['Circuit Analysis', 'Electromagnetics', 'Power Systems'],
+            'computer': ['Programming I', 'Data Structures', 'Computer Architecture']
+        }
+    },
+    'mech': {
+        'name': 'School of Mechanical & Materials',
+        'departments': {
+            'mechanical': 'Mechanical Engineering',
+            'materials': 'Materials Science'
+        },
+        'programCore': ['Calculus I', 'Engineering Graphics', 'Materials Basics'],
+        'deptCourses': {
+            'mechanical': ['Statics', 'Dynamics', 'Thermodynamics'],
+            'materials': ['Materials Science', 'Manufacturing Processes', 'Strength of Materials']
+        }
+    }
+}
+
+BOOK_CATEGORIES = {
+    'Engineering': ['Statics Basics', 'Digital Logic', 'Fluid Flow 101'],
+    'Science': ['Physics Primer', 'Organic Chemistry', 'Biology of Cells'],
+    'Literature': ['Poetry Classics', 'Modern Novels', 'World Myths']
+}
+
+# Dorm interior actions run for this many ticks before the player is idle again
+SLEEP_TICKS = 180  # 3 seconds
+SHOWER_TICKS = 120  # 2 seconds
+STUDY_TICKS = 180  # 3 seconds
+EXIT_TICKS = 60  # 1 second
+
+
+# --- Visiting buildings ---
+
+def visit_building(s, key):
+    """Record a building visit for the daily challenge."""
+    if key in ['dorm', 'classroom', 'library', 'cafeteria', 'admin']:
+        s.progress_challenge('visit_buildings')
+    return None
+
+
+def collect_coin(s):
+    """Award a picked-up coin (streak bonus applies to the XP)."""
+    s.collected_points += 1
+    s.achievement_tracker.coin_picked_up()
+    base_xp = 5
+    streak_bonus = s.get_streak_bonus()
+    xp_gain = int(base_xp * (1 + streak_bonus))
+    s.add_xp(xp_gain)
+    s.progress_challenge('collect_coins')
+    return f"💰 Coin collected! (+{xp_gain} XP, Total: {s.collected_points} coins)"
+
+
+# --- Admin office ---
+
+def get_student_id(s):
+    if s.flags['studentId']:
+        return None
+    if s.energy < 10:
+        return "Too tired! Need at least 10 energy."
+    s.flags['studentId'] = True
+    s.add_item('Student ID Card')
+    s.add_xp(15)
+    s.add_reputation(3)  # Official student status
+    s.add_energy(-10)
+    s.complete_quest('studentId')
+    return 'Student ID collected (+15 XP, +3 Reputation)'
+
+
+def collect_timetable(s):
+    if s.flags['timetable']:
+        return None
+    s.flags['timetable'] = True
+    s.add_item('Timetable')
+    s.complete_quest('timetable')
+    return 'Timetable collected'
+
+
+# --- Cafeteria ---
+
+def get_meal_coupon(s):
+    if s.flags['mealCoupon']:
+        return None
+    s.flags['mealCoupon'] = True
+    s.add_item('Meal Coupon')
+    return 'Meal coupon collected'
+
+
+def eat_meal(s):
+    if not s.flags['ateMeal'] and s.flags['mealCoupon']:
+        s.flags['ateMeal'] = True
+        s.set_energy(100)
+        s.add_xp(5)
+        s.add_stress(-5)  # Eating reduces stress
+        s.add_reputation(2)  # Socializing at cafeteria
+        s.complete_quest('eatMeal')
+        return 'Meal eaten (+5 XP, Energy 100, -5 Stress, +2 Reputation)'
+    if s.flags['mealCoupon'] and s.energy < 80:
+        # Can eat again if energy is low (but no quest completion)
+        s.set_energy(min(100, s.energy + 30))
+        s.add_stress(-3)
+        s.add_reputation(1)
+        return 'Meal eaten (Energy +30, -3 Stress, +1 Reputation)'
+    return None
+
+
+# --- Library ---
+
+def register_library_card(s):
+    if s.flags['libraryCard']:
+        return None
+    if s.energy < 10:
+        return "Too tired! Need at least 10 energy."
+    s.flags['libraryCard'] = True
+    s.add_item('Library Card')
+    s.add_xp(20)
+    s.add_reputation(5)  # Getting library card is a responsible action
+    s.add_energy(-10)
+    s.complete_quest('libraryVisit')
+    return "Library card registered (+20 XP, +5 Reputation)"
+
+
+def read_book(s, title):
+    if s.energy < 15:
+        return "Too tired to read! Need at least 15 energy."
+    s.meta['booksRead'] = int(s.meta.get('booksRead', 0)) + 1
+    s.add_xp(2)
+    knowledge_gain = 6
+    # High knowledge makes reading more effective
+    if s.knowledge > 50:
+        knowledge_gain += 2
+    s.add_knowledge(knowledge_gain)
+    s.add_stress(-2)  # Reading is relaxing
+    s.add_energy(-15)
+    s.add_discipline(2)
+    return f'Read: {title} (+2 XP, +{knowledge_gain} Knowledge, -2 Stress)'
+
+
+# --- Classroom ---
+
+def attend_first_class(s):
+    if s.flags['firstClassBadge'] or not s.quests['programOrientation']:
+        return None
+    if s.energy < 10:
+        return "Too tired to attend class! Need at least 10 energy."
+    s.flags['firstClassBadge'] = True
+    s.add_item('First Class Badge')
+    s.add_xp(10)
+    s.add_knowledge(12)
+    s.add_stress(2)
+    s.add_energy(-10)
+    s.add_reputation(3)  # Attending class improves reputation
+    s.complete_quest('firstClass')
+    return "First Class completed (+10 XP, +12 Knowledge, +3 Reputation)"
+
+
+def choose_school(s, sid):
+    s.meta['school'] = sid
+    s.set_quest('programOrientation', False)
+    s.set_quest('completeProgramCourses', False)
+    s.set_quest('chooseDepartment', False)
+    s.set_quest('completeDepartmentCourses', False)
+    s.meta['department'] = None
+    s.meta['programCourses'] = {}
+    s.meta['courses'] = {}
+    s.meta['coursesDone'] = 0
+    s.complete_quest('chooseSchool')
+    s.add_item('School: ' + SCHOOLS[sid]['name'])
+    return None
+
+
+def attend_orientation(s):
+    if s.energy < 15:
+        return "Too tired for orientation! Need at least 15 energy."
+    s.complete_quest('programOrientation')
+    s.add_xp(10)
+    s.add_knowledge(5)
+    s.add_reputation(5)  # Meeting people at orientation
+    s.add_energy(-15)
+    s.add_stress(1)
+    return "Orientation complete (+10 XP, +5 Knowledge, +5 Reputation)"
+
+
+def _course_progress(done_map, keys):
+    """(index of the next course to take, number of courses done)."""
+    next_idx = 0
+    for i, k in enumerate(keys):
+        if not done_map.get(k):
+            next_idx = i
+            break
+    done = sum(1 for k in keys if done_map.get(k))
+    return next_idx, done
+
+
+def program_course_keys(s):
+    plist = SCHOOLS[s.meta['school']]['programCore']
+    return [f"pcourse:{s.meta['school']}:{i}" for i in range(len(plist))]
+
+
+def program_progress(s):
+    return _course_progress(s.meta['programCourses'], program_course_keys(s))
+
+
+def complete_program_course(s):
+    if s.energy < 20:
+        return "Too tired for class! Need at least 20 energy."
+    keys = program_course_keys(s)
+    next_idx, done = _course_progress(s.meta['programCourses'], keys)
+    k = keys[next_idx]
+    if not s.meta['programCourses'].get(k):
+        s.meta['programCourses'][k] = True
+        s.add_xp(5)
+        knowledge_gain = 10
+        # High knowledge makes learning easier
+        if s.knowledge > 60:
+            knowledge_gain += 2
+        s.add_knowledge(knowledge_gain)
+        s.add_stress(3)
+        s.add_energy(-20)
+        s.add_discipline(3)
+        if done + 1 >= len(keys):
+            s.complete_quest('completeProgramCourses')
+            s.add_reputation(10)  # Bonus for completing program
+    return None
+
+
+def choose_department(s, did):
+    name = SCHOOLS[s.meta['school']]['departments'][did]
+    s.meta['department'] = { 'id': did, 'name': name, 'school': s.meta['school'] }
+    s.complete_quest('chooseDepartment')
+    s.add_item('Department: ' + name)
+    return None
+
+
+def department_course_keys(s):
+    dep_id = s.meta['department']['id']
+    dlist = SCHOOLS[s.meta['school']]['deptCourses'][dep_id]
+    return [f"course:{s.meta['school']}:{dep_id}:{i}" for i in range(len(dlist))]
+
+
+def department_progress(s):
+    return _course_progress(s.meta['courses'], department_course_keys(s))
+
+
+def complete_department_course(s):
+    if s.energy < 25:
+        return "Too tired for advanced class! Need at least 25 energy."
+    keys = department_course_keys(s)
+    next_idx, done = _course_progress(s.meta['courses'], keys)
+    k = keys[next_idx]
+    if not s.meta['courses'].get(k):
+        s.meta['courses'][k] = True
+        s.add_xp(5)
+        knowledge_gain = 15
+        if s.knowledge > 70:
+            knowledge_gain += 3
+        s.add_knowledge(knowledge_gain)
+        s.add_stress(4)
+        s.add_energy(-25)
+        s.add_discipline(4)
+        if done + 1 >= len(keys):
+            s.complete_quest('completeDepartmentCourses')
+            s.add_reputation(15)  # Major achievement
+    return None
+
+
+# --- Dormitory popup ---
+
+def rest(s):
+    if s.energy < 100 or s.stress > 0:
+        # Sleep restores energy and reduces stress
+        s.set_energy(100)
+        stress_reduction = min(20, s.stress)
+        s.add_stress(-stress_reduction)
+        return f"Energy restored to 100, Stress -{stress_reduction}"
+    return "You're already well-rested!"
+
+
+def study(s):
+    if s.energy < 20:
+        return "Too tired to study! Need at least 20 energy."
+    if not s.flags['dormStudyDone']:
+        s.flags['dormStudyDone'] = True
+        # Study increases knowledge but costs energy and adds stress
+        knowledge_gain = 8
+        stress_gain = 3
+        energy_cost = 15
+        # High stress reduces knowledge gain efficiency
+        if s.stress > 70:
+            knowledge_gain = int(knowledge_gain * 0.7)
+        s.add_xp(10)
+        s.add_knowledge(knowledge_gain)
+        s.add_stress(stress_gain)
+        s.add_energy(-energy_cost)
+        s.add_discipline(2)  # Studying builds discipline
+        return f"+10 XP, +{knowledge_gain} Knowledge, +{stress_gain} Stress, -{energy_cost} Energy"
+    # Can study again, but with reduced rewards
+    knowledge_gain = 5
+    stress_gain = 2
+    energy_cost = 15
+    if s.stress > 70:
+        knowledge_gain = int(knowledge_gain * 0.7)
+    s.add_xp(5)
+    s.add_knowledge(knowledge_gain)
+    s.add_stress(stress_gain)
+    s.add_energy(-energy_cost)
+    s.add_discipline(1)
+    return f"+5 XP, +{knowledge_gain} Knowledge, +{stress_gain} Stress, -{energy_cost} Energy"
+
+
+def take_dorm_key(s):
+    if s.flags['dormKey']:
+        return None
+    s.flags['dormKey'] = True
+    s.add_item('Dorm Key')
+    return "Dorm Key collected"
+
+
+# --- Dormitory interior (timed actions) ---
+
+def go_to_bed(s):
+    if not (s.energy < 100 or s.stress > 0):
+        return "You're already well-rested!"
+    s.dorm_player_state = 'sleeping'
+    s.dorm_action_timer = SLEEP_TICKS
+    s.add_xp(5)
+    s.collected_points += 2
+    return "💤 Going to sleep... (+5 XP, +2 coins)"
+
+
+def take_shower(s):
+    if s.energy < 5:
+        return "Too tired to shower! Need at least 5 energy."
+    s.dorm_player_state = 'showering'
+    s.dorm_action_timer = SHOWER_TICKS
+    s.add_stress(-10)
+    s.add_energy(-5)
+    s.add_xp(3)
+    s.collected_points += 1
+    return "🚿 Showering... Stress -10, Energy -5 (+3 XP, +1 coin)"
+
+
+def use_locker(s):
+    if s.locker_open:
+        s.locker_open = False
+        return "🔒 Locker closed"
+    s.locker_open = True
+    if not s.flags['dormKey']:
+        s.flags['dormKey'] = True
+        s.add_item('Dorm Key')
+        s.add_xp(10)
+        s.collected_points += 3
+        return "🔑 Locker opened! Dorm Key collected! (+10 XP, +3 coins)"
+    # Still award small points for opening
+    s.add_xp(1)
+    s.collected_points += 1
+    return "🔑 Locker opened (empty) (+1 XP, +1 coin)"
+
+
+def study_at_desk(s):
+    if s.energy < 20:
+        return "Too tired to study! Need at least 20 energy."
+    s.dorm_player_state = 'studying'
+    s.dorm_action_timer = STUDY_TICKS
+    if not s.flags['dormStudyDone']:
+        s.flags['dormStudyDone'] = True
+        knowledge_gain = 8
+        if s.stress > 70:
+            knowledge_gain = int(knowledge_gain * 0.7)
+        s.add_xp(10)
+        s.add_knowledge(knowledge_gain)
+        s.add_stress(3)
+        s.add_energy(-15)
+        s.add_discipline(2)
+        s.collected_points += 5
+        return f"📚 Studying... +10 XP, +{knowledge_gain} Knowledge, +5 coins"
+    knowledge_gain = 5
+    if s.stress > 70:
+        knowledge_gain = int(knowledge_gain * 0.7)
+    s.add_xp(5)
+    s.add_knowledge(knowledge_gain)
+    s.add_stress(2)
+    s.add_energy(-15)
+    s.add_discipline(1)
+    s.collected_points += 3
+    return f"📚 Studying... +5 XP, +{knowledge_gain} Knowledge, +3 coins"
+
+
+def leave_dorm(s):
+    s.dorm_player_state = 'exiting'
+    s.dorm_action_timer = EXIT_TICKS
+    return "Exiting dormitory..."
+
+
+def tick_dorm_action(s):
+    """Count down the running dorm action and finish it when the timer ends."""
+    if s.dorm_action_timer <= 0:
+        return None
+    s.dorm_action_timer -= 1
+    if s.dorm_action_timer:
+        return None
+    current_state = s.dorm_player_state
+    if current_state == 'exiting':
+        # The front end closes the dorm view when the player is back to idle
+        s.dorm_player_state = 'idle'
+        return "Exited dormitory"
+    if current_state == 'sleeping':
+        s.set_energy(100)
+        stress_reduction = min(20, s.stress)
+        s.add_stress(-stress_reduction)
+        s.dorm_player_state = 'idle'
+        return f"💤 Slept! Energy restored to 100, Stress -{stress_reduction}"
+    if current_state in ['showering', 'studying']:
+        s.dorm_player_state = 'idle'
+    return None
+
+
+# What counts as doing an activity (Night Owl, Early Bird): the building and
+# dorm actions, not picking up coins, walking in or out, or dorm timers
+ACTIVITIES = frozenset((
+    get_student_id, collect_timetable, get_meal_coupon, eat_meal,
+    register_library_card, read_book, attend_first_class, choose_school,
+    attend_orientation, complete_program_course, choose_department,
+    complete_department_course, rest, study, take_dorm_key,
+    go_to_bed, take_shower, use_locker, study_at_desk,
+))
@@ -0,0 +1,432 @@
+"""Vectorized simulation of a whole freshman cohort.
+
+Every student's state is one slot in a set of NumPy arrays (struct of
+arrays), and the GameState rules -- stat decay, clamping, difficulty scaling,
+daily challenges, random events and the building actions -- are applied to
+all students at once. The arithmetic mirrors GameState exactly, including the
+int() truncation in the add_* helpers, so with random events off a cohort
+run gives the same numbers as the scalar engine playing the same decisions.
+Events are drawn from NumPy's generator rather than GameState.rng, so with
+them on the two only agree in distribution. bench/cohort.py checks both.
+
+NumPy is optional: the game itself does not need it.
+
+    python -m game.cohort --students 10000 --days 10
+"""
+import argparse
+
+try:
+    import numpy as np
+except ImportError:  # Only cohort runs need NumPy
+    np = None
+
+from .consts import SIM_HZ
+from .state import GameState, TIME_PERIODS, PERIOD_TICKS
+
+QUESTS = list(GameState().quests)
+QUEST_BIT = {q: 1 << i for i, q in enumerate(QUESTS)}
+ALL_QUESTS = (1 << len(QUESTS)) - 1
+STATS = ('energy', 'knowledge', 'stress', 'reputation', 'discipline', 'xp', 'coins')
+
+TIMES = TIME_PERIODS
+TICKS_PER_PERIOD = PERIOD_TICKS
+SECONDS_PER_DAY = TICKS_PER_PERIOD * len(TIMES) // SIM_HZ
+
+# Steps of the heuristic player, in the order it tries them:
+# (name, building, quest, energy needed)
+STEPS = (
+    ('choose_school', 'classroom', 'chooseSchool', 0),
+    ('orientation', 'classroom', 'programOrientation', 15),
+    ('first_class', 'classroom', 'firstClass', 10),
+    ('student_id', 'admin', 'studentId', 10),
+    ('timetable', 'admin', 'timetable', 0),
+    ('library_card', 'library', 'libraryVisit', 10),
+    ('meal_coupon', 'cafeteria', None, 0),
+    ('eat_meal', 'cafeteria', 'eatMeal', 0),
+    ('program_course', 'classroom', 'completeProgramCourses', 20),
+    ('choose_department', 'classroom', 'chooseDepartment', 0),
+    ('department_course', 'classroom', 'completeDepartmentCourses', 25),
+)
+SLEEP = len(STEPS)
+IDLE = -1
+COURSES_PER_TRACK = 3
+
+
+def building_open(key, time_of_day):
+    """Same opening hours as GameState.can_access_building."""
+    if key in ('cafeteria', 'library', 'classroom') and time_of_day == 'Night':
+        return False
+    if key == 'admin' and time_of_day in ['Evening', 'Night']:
+        return False
+    return True
+
+
+class Cohort:
+    """Struct-of-arrays model of `students` GameStates advanced together.
+
+    Time runs in whole seconds of game time (SIM_HZ ticks), which is the
+    granularity of every GameState rule. The clock, streak and challenge
+    resets only depend on the day, so they are shared scalars.
+
+    Players follow a heuristic: every `decision_every` seconds each student
+    acts with probability `activity` (drawn per student), may pick up a coin,
+    then does the first unfinished quest step whose building is open, or
+    sleeps if they are too tired for it.
+    """
+
+    def __init__(self, students, seed=0, event_chance=GameState.EVENT_CHANCE, decision_every=2,
+                 activity=(0.3, 1.0), sleep_below=(20, 45), coin_chance=0.3,
+                 map_coins=33):
+        if np is None:
+            raise RuntimeError("The cohort simulator needs NumPy (pip install numpy)")
+        self.n = students
+        self.rng = np.random.default_rng(seed)
+        self.event_chance = event_chance
+        self.decision_every = decision_every
+        self.coin_chance = coin_chance
+
+        base = GameState()
+        n = students
+        i32 = np.int32
+        self.energy = np.full(n, base.energy, i32)
+        self.knowledge = np.full(n, base.knowledge, i32)
+        self.stress = np.full(n, base.stress, i32)
+        self.reputation = np.full(n, base.reputation, i32)
+        self.discipline = np.full(n, base.discipline, i32)
+        self.xp = np.zeros(n, i32)
+        self.coins = np.zeros(n, i32)
+        self.coins_left = np.full(n, map_coins, i32)
+        self.quests = np.zeros(n, np.uint16)
+        self.meal_coupon = np.zeros(n, bool)
+        self.program_done = np.zeros(n, np.int8)
+        self.department_done = np.zeros(n, np.int8)
+        self.difficulty = np.ones(n, i32)
+        self.stress_multiplier = np.ones(n)
+        self.event_cooldown = np.zeros(n, i32)
+        self.challenge_coins = np.zeros(n, i32)
+        self.challenge_visits = np.zeros(n, i32)
+        self.quest_day = np.zeros((len(QUESTS), n), np.int16)  # 0 = not done
+        # No upgrades are bought in cohort runs; kept so the formulas match
+        self.stress_resistance = 0
+        self.knowledge_boost = 0
+
+        lo, hi = activity
+        self.activity = self.rng.uniform(lo, hi, n)
+        lo, hi = sleep_below
+        self.sleep_below = self.rng.integers(lo, hi + 1, n)
+
+        # Shared clock and streak
+        self.seconds = 0
+        self.day = 1
+        self.time_idx = 0
+        self.daily_streak = 0
+        self.last_active_day = 0
+        self.last_challenge_reset_day = 1
+        self.daily = []
+
+    # --- GameState arithmetic, vectorized ---
+
+    @staticmethod
+    def _add(arr, v, mask=None):
+        """arr = clamp(arr + int(v), 0, 100); `v` may be an array."""
+        v = np.trunc(v).astype(np.int32)
+        if mask is None:
+            np.clip(arr + v, 0, 100, out=arr)
+        else:
+            arr[mask] = np.clip(arr[mask] + (v[mask] if np.ndim(v) else v), 0, 100)
+
+    def _add_knowledge(self, v, mask=None):
+        self._add(self.knowledge, np.asarray(v) * (1.0 + self.knowledge_boost * 0.2), mask)
+
+    def process_stat_decay(self):
+        discipline_factor = np.maximum(0.3, 1.0 - self.discipline / 150.0)
+        stress_increase = 0.5 * discipline_factor * (1.0 - self.stress_resistance * 0.15)
+        stress_increase = np.where(self.stress > 70, stress_increase * 1.5, stress_increase)
+        self._add(self.stress, stress_increase)
+        low = self.discipline < 30
+        if low.any():
+            self._add_knowledge(-0.2 * (1.0 - discipline_factor), low)
+        low = self.discipline < 40
+        if low.any():
+            self._add(self.reputation, -0.1 * (1.0 - discipline_factor), low)
+
+    def update_difficulty(self):
+        base_difficulty = min(5, (self.day - 1) // 2 + 1)
+        self.difficulty = base_difficulty + np.minimum(3, self.xp // 30)
+        self.stress_multiplier = 1.0 + (self.difficulty - 1) * 0.2
+
+    def update_streak(self):
+        if self.day > self.last_active_day:
+            if self.last_active_day == self.day - 1:
+                self.daily_streak += 1
+            else:
+                self.daily_streak = 1
+            self.last_active_day = self.day
+
+    def streak_bonus(self):
+        for min_days, bonus in GameState.STREAK_BONUSES:
+            if self.daily_streak >= min_days:
+                return bonus
+        return 0
+
+    def update_daily_challenges(self):
+        if self.day > self.last_challenge_reset_day:
+            self.last_challenge_reset_day = self.day
+            self.challenge_coins[:] = 0
+            self.challenge_visits[:] = 0
+
+    def check_daily_challenges(self):
+        done = self.challenge_coins >= 5
+        self.xp[done] += 10
+        self.challenge_coins[done] = 0
+        done = self.challenge_visits >= 3
+        self.xp[done] += 15
+        self.challenge_visits[done] = 0
+
+    def trigger_random_events(self):
+        cooling = self.event_cooldown > 0
+        self.event_cooldown[cooling] -= 1
+        fire = ~cooling & (self.rng.random(self.n) < self.event_chance)
+        if not fire.any():
+            return
+        idx = np.flatnonzero(fire)
+        stressed = self.stress[idx] > 60
+        behind = self.knowledge[idx] < 40
+        tired = self.energy[idx] < 50
+        # random.choice over the eligible events, in GameState's list order
+        k = 1 + stressed + behind + tired
+        pick = (self.rng.random(idx.size) * k).astype(np.int32)
+        kind = np.full(idx.size, 2)  # coin_bonus
+        kind[stressed & (pick == 0)] = 0
+        slot = pick - stressed
+        kind[behind & (slot == 0)] = 1
+        slot = slot - behind
+        kind[slot == 1] = 3
+        self.event_cooldown[idx] = GameState.EVENT_COOLDOWN
+        self._add(self.stress, -10, _scatter(self.n, idx[kind == 0]))
+        self._add_knowledge(5, _scatter(self.n, idx[kind == 1]))
+        bonus = idx[kind == 2]
+        self.coins[bonus] += self.rng.integers(2, 6, bonus.size)
+        self._add(self.energy, 15, _scatter(self.n, idx[kind == 3]))
+
+    # --- Player decisions ---
+
+    def _todo(self, step):
+        name, _, quest, _ = STEPS[step]
+        q = self.quests
+        if name == 'meal_coupon':
+            return ~self.meal_coupon
+        if name == 'eat_meal':
+            return self.meal_coupon & ((q & QUEST_BIT['eatMeal']) == 0)
+        todo = (q & QUEST_BIT[quest]) == 0
+        if name == 'first_class':
+            todo &= (q & QUEST_BIT['programOrientation']) != 0
+        elif name == 'orientation':
+            todo &= (q & QUEST_BIT['chooseSchool']) != 0
+        elif name == 'program_course':
+            todo &= (q & QUEST_BIT['programOrientation']) != 0
+        elif name == 'choose_department':
+            todo &= (q & QUEST_BIT['completeProgramCourses']) != 0
+        elif name == 'department_course':
+            todo &= (q & QUEST_BIT['chooseDepartment']) != 0
+        return todo
+
+    def choose(self, acting):
+        """Action index per student (a STEPS index, SLEEP or IDLE)."""
+        tod = TIMES[self.time_idx]
+        choice = np.full(self.n, IDLE)
+        need = np.zeros(self.n, np.int32)
+        for step in reversed(range(len(STEPS))):
+            if not building_open(STEPS[step][1], tod):
+                continue
+            m = self._todo(step)
+            choice[m] = step
+            need[m] = STEPS[step][3]
+        tired = (choice != IDLE) & (self.energy < need)
+        tired |= (choice == IDLE) & (self.energy < self.sleep_below)
+        choice[tired] = SLEEP
+        choice[~acting] = IDLE
+        return choice
+
+    def _complete(self, quest, mask):
+        bit = QUEST_BIT[quest]
+        new = mask & ((self.quests & bit) == 0)
+        self.quests[new] |= bit
+        self.quest_day[QUESTS.index(quest)][new] = self.day
+
+    def apply(self, choice):
+        """Apply each student's chosen action with the game.actions rules."""
+        for step, (name, _, quest, _) in enumerate(STEPS):
+            m = choice == step
+            if not m.any():
+                continue
+            if name == 'choose_school':
+                self._complete(quest, m)
+            elif name == 'orientation':
+                self._complete(quest, m)
+                self.xp[m] += 10
+                self._add_knowledge(5, m)
+                self._add(self.reputation, 5, m)
+                self._add(self.energy, -15, m)
+                self._add(self.stress, 1, m)
+            elif name == 'first_class':
+                self.xp[m] += 10
+                self._add_knowledge(12, m)
+                self._add(self.stress, 2, m)
+                self._add(self.energy, -10, m)
+                self._add(self.reputation, 3, m)
+                self._complete(quest, m)
+            elif name == 'student_id':
+                self.xp[m] += 15
+                self._add(self.reputation, 3, m)
+                self._add(self.energy, -10, m)
+                self._complete(quest, m)
+            elif name == 'timetable':
+                self._complete(quest, m)
+            elif name == 'library_card':
+                self.xp[m] += 20
+                self._add(self.reputation, 5, m)
+                self._add(self.energy, -10, m)
+                self._complete(quest, m)
+            elif name == 'meal_coupon':
+                self.meal_coupon[m] = True
+            elif name == 'eat_meal':
+                self.energy[m] = 100
+                self.xp[m] += 5
+                self._add(self.stress, -5, m)
+                self._add(self.reputation, 2, m)
+                self._complete(quest, m)
+            elif name == 'program_course':
+                self.xp[m] += 5
+                self._add_knowledge(np.where(self.knowledge > 60, 12, 10), m)
+                self._add(self.stress, 3, m)
+                self._add(self.energy, -20, m)
+                self._add(self.discipline, 3, m)
+                self.program_done[m] += 1
+                track = m & (self.program_done >= COURSES_PER_TRACK)
+                self._complete(quest, track)
+                self._add(self.reputation, 10, track)
+            elif name == 'choose_department':
+                self._complete(quest, m)
+            elif name == 'department_course':
+                self.xp[m] += 5
+                self._add_knowledge(np.where(self.knowledge > 70, 18, 15), m)
+                self._add(self.stress, 4, m)
+                self._add(self.energy, -25, m)
+                self._add(self.discipline, 4, m)
+                self.department_done[m] += 1
+                track = m & (self.department_done >= COURSES_PER_TRACK)
+                self._complete(quest, track)
+                self._add(self.reputation, 15, track)
+        # Bed in the dorm: go_to_bed, then the sleep finishing
+        m = choice == SLEEP
+        if m.any():
+            self.xp[m] += 5
+            self.coins[m] += 2
+            self.energy[m] = 100
+            self._add(self.stress, -np.minimum(20, self.stress), m)
+        # Each action is a building visit
+        self.challenge_visits[choice != IDLE] += 1
+
+    def collect_coins(self, acting):
+        m = acting & (self.coins_left > 0) & (self.rng.random(self.n) < self.coin_chance)
+        self.coins_left[m] -= 1
+        self.coins[m] += 1
+        self.xp[m] += int(5 * (1 + self.streak_bonus()))
+        self.challenge_coins[m] += 1
+
+    # --- Driving the cohort ---
+
+    def step(self):
+        """Advance every student by one second of game time."""
+        self.seconds += 1
+        ticks = self.seconds * SIM_HZ
+        new_day = False
+        if ticks % TICKS_PER_PERIOD == 0:
+            self.time_idx = (self.time_idx + 1) % len(TIMES)
+            if self.time_idx == 0:
+                self.day += 1
+                new_day = True
+
+        self.process_stat_decay()
+        self._add(self.stress, (self.stress_multiplier - 1.0) * 0.1)
+        self.update_daily_challenges()
+        self.update_streak()
+        self.update_difficulty()
+        self.check_daily_challenges()
+        if ticks % (SIM_HZ * 2) == 0:
+            self.trigger_random_events()
+
+        if self.seconds % self.decision_every == 0:
+            acting = self.rng.random(self.n) < self.activity
+            self.collect_coins(acting)
+            self.apply(self.choose(acting))
+
+        if new_day:
+            self.daily.append(self.snapshot(self.day - 1))
+
+    def run_days(self, days):
+        for _ in range(days * SECONDS_PER_DAY):
+            self.step()
+        return self.daily
+
+    def snapshot(self, day):
+        """Distribution of every stat plus quest progress at the end of `day`."""
+        row = {'day': day}
+        for name in STATS:
+            v = getattr(self, name)
+            p10, p50, p90 = np.percentile(v, (10, 50, 90))
+            row[name] = {'mean': float(v.mean()), 'p10': float(p10), 'p50': float(p50), 'p90': float(p90)}
+        done = np.zeros(self.n, np.int32)
+        for bit in QUEST_BIT.values():
+            done += (self.quests & bit) != 0
+        row['quests_mean'] = float(done.mean())
+        row['all_quests'] = float((self.quests == ALL_QUESTS).mean())
+        return row
+
+    def quest_times(self):
+        """Per quest: share of students who finished it and on which day."""
+        out = {}
+        for i, q in enumerate(QUESTS):
+            days = self.quest_day[i]
+            done = days[days > 0]
+            if done.size:
+                p10, p50, p90 = np.percentile(done, (10, 50, 90))
+                out[q] = {'rate': done.size / self.n, 'p10': float(p10), 'p50': float(p50), 'p90': float(p90)}
+            else:
+                out[q] = {'rate': 0.0, 'p10': None, 'p50': None, 'p90': None}
+        return out
+
+
+def _scatter(n, idx):
+    m = np.zeros(n, bool)
+    m[idx] = True
+    return m
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Simulate a freshman cohort")
+    ap.add_argument('--students', type=int, default=10000)
+    ap.add_argument('--days', type=int, default=10)
+    ap.add_argument('--seed', type=int, default=0)
+    args = ap.parse_args(argv)
+
+    cohort = Cohort(args.students, seed=args.seed)
+    daily = cohort.run_days(args.days)
+    print("day  energy  knowledge  stress  reputation  discipline     xp  quests  done")
+    for row in daily:
+        print(f"{row['day']:>3}  {row['energy']['p50']:>6.0f}  {row['knowledge']['p50']:>9.0f}"
+              f"  {row['stress']['p50']:>6.0f}  {row['reputation']['p50']:>10.0f}"
+              f"  {row['discipline']['p50']:>10.0f}  {row['xp']['p50']:>5.0f}"
+              f"  {row['quests_mean']:>6.1f}  {row['all_quests']:>4.0%}")
+    print()
+    print("quest                       rate   p10   p50   p90  (day completed)")
+    for q, t in cohort.quest_times().items():
+        if t['rate']:
+            print(f"{q:<26} {t['rate']:>5.0%} {t['p10']:>5.0f} {t['p50']:>5.0f} {t['p90']:>5.0f}")
+        else:
+            print(f"{q:<26} {t['rate']:>5.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -3,7 +3,15 @@ SCREEN_H = 600
 MAP_W = 880
 MAP_H = 560
 HUD_W = 320
-FPS = 60
+FPS = 60  # Render frame cap
+# Fixed simulation rate; game balance (clock, decay, events) is tuned for 60
+SIM_HZ = 60
+# Most sim ticks run per rendered frame before the game slows down instead
+MAX_SIM_STEPS = 5
+# Seconds of game time between autosaves
+AUTOSAVE_SECONDS = 10
+# Seconds of game time between journal commits (--journal)
+JOURNAL_COMMIT_SECONDS = 1
 
 # Colors (R,G,B)
 WHITE = (255,255,255)
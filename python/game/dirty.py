@@ -0,0 +1,77 @@
+import pygame
+from pygame import Rect
+
+
+class DirtyRects:
+    """Collects the screen regions that changed this frame.
+
+    Each frame the renderer marks the rects it touched; `present()` then pushes
+    only those to the display with `pygame.display.update(rects)` instead of a
+    full `flip()`. Anything that changes the whole screen (scene switch, fade,
+    popup...) calls `request_full()` or changes the `sync_mode()` key.
+    """
+
+    def __init__(self, screen_size, full_ratio=0.5):
+        self.screen_rect = Rect((0, 0), screen_size)
+        # Above this share of the screen a single flip is cheaper than many rects
+        self.full_ratio = full_ratio
+        self.rects = []
+        self.full = True
+        self.mode = None
+        self._tracked = {}
+        self._values = {}
+        self.pixels_pushed = 0
+
+    def request_full(self):
+        self.full = True
+
+    def sync_mode(self, key):
+        """Force a full update whenever `key` differs from last frame."""
+        if key != self.mode:
+            self.mode = key
+            self.full = True
+
+    def mark(self, rect):
+        r = Rect(rect).clip(self.screen_rect)
+        if r.w > 0 and r.h > 0:
+            self.rects.append(r)
+
+    def track(self, key, rect):
+        """Mark a moving sprite: its old and new rects, only if it moved.
+
+        Pass None when the sprite is no longer drawn so its last rect is cleared.
+        """
+        old = self._tracked.get(key)
+        if rect is None:
+            if old is not None:
+                self.mark(old)
+                del self._tracked[key]
+            return
+        rect = Rect(rect)
+        if rect != old:
+            if old is not None:
+                self.mark(old)
+            self.mark(rect)
+            self._tracked[key] = rect
+
+    def changed(self, key, value, rect):
+        """Mark `rect` when the value drawn in it differs from last frame."""
+        if self._values.get(key) != value:
+            self._values[key] = value
+            self.mark(rect)
+
+    def present(self):
+        """Push this frame to the display and start collecting the next one."""
+        rects = self.rects
+        area = sum(r.w * r.h for r in rects)
+        total = self.screen_rect.w * self.screen_rect.h
+        if self.full or area > total * self.full_ratio:
+            pygame.display.flip()
+            self.pixels_pushed = total
+        elif rects:
+            pygame.display.update(rects)
+            self.pixels_pushed = area
+        else:
+            self.pixels_pushed = 0
+        self.rects = []
+        self.full = False
@@ -0,0 +1,168 @@
+from .consts import SIM_HZ
+from .scheduler import Scheduler
+from .state import GameState, PERIOD_TICKS
+from . import actions
+
+
+# Random events are rolled this often
+EVENT_TICKS = SIM_HZ * 2
+
+
+class Simulation:
+    """Headless driver for a GameState.
+
+    Runs the per-tick rules (clock, stat decay, challenges, random events,
+    dorm action timers) without pygame, a display or fonts, so it can be used
+    by the game loop as well as by balance experiments and CI runs.
+
+    The rules are jobs on a Scheduler (next period of the day, once a second,
+    every event roll), so ticks between them do no bookkeeping and run()
+    jumps from one job to the next.
+
+    Messages that the game would show as toasts go to `on_message` (if set)
+    and are otherwise dropped.
+    """
+
+    def __init__(self, state=None, on_message=None):
+        self.state = state if state is not None else GameState()
+        self.on_message = on_message
+        self.clock = Scheduler()
+        self._schedule()
+
+    def _schedule(self):
+        """Register the rule jobs, picking up where the state left off."""
+        s = self.state
+        clock = self.clock
+        # Registration order is the order jobs due on the same tick run in
+        self.period_job = clock.every(PERIOD_TICKS, self._next_period,
+                                      first=PERIOD_TICKS - s.time_tick)
+        self.second_job = clock.every(SIM_HZ, self._each_second)
+        self.event_job = None
+        self.cooldown_job = None
+        if s.event_cooldown > 0:
+            self._cool_down(s.event_cooldown)
+        else:
+            self.event_job = clock.every(EVENT_TICKS, self._roll_event)
+
+    def reset(self):
+        """Start the rule jobs over after the state was reset in place.
+
+        Jobs registered by others (autosave...) are kept.
+        """
+        for job in (self.period_job, self.second_job, self.event_job, self.cooldown_job):
+            if job is not None:
+                self.clock.cancel(job)
+        self._schedule()
+
+    @property
+    def ticks(self):
+        return self.clock.now
+
+    def _say(self, msg):
+        if msg and self.on_message is not None:
+            self.on_message(msg)
+
+    def _next_period(self):
+        s = self.state
+        s.time_tick = 0
+        s.advance_period()
+
+    def _each_second(self):
+        s = self.state
+        s.process_stat_decay()
+        # Apply difficulty scaling to stress
+        stress_increase = s.stress_multiplier - 1.0
+        if stress_increase > 0:
+            s.add_stress(stress_increase * 0.1)
+
+        s.update_daily_challenges()
+        s.update_streak()
+        s.update_difficulty()
+        for reward_msg in s.check_daily_challenges():
+            self._say(reward_msg)
+        self.check_achievements()
+
+    def _roll_event(self):
+        s = self.state
+        self._say(s.trigger_random_event())
+        if s.event_cooldown > 0:
+            # An event fired: no rolls until the cooldown is over
+            self.clock.cancel(self.event_job)
+            self.event_job = None
+            self._cool_down(s.event_cooldown)
+
+    def _cool_down(self, rolls):
+        """Skip the next `rolls` event rolls with one job at the end of them."""
+        self.cooldown_job = self.clock.after(rolls * EVENT_TICKS, self._cooldown_over)
+
+    def _cooldown_over(self):
+        self.cooldown_job = None
+        self.state.event_cooldown = 0
+        self.event_job = self.clock.every(EVENT_TICKS, self._roll_event)
+
+    def sync(self):
+        """Write the counters the scheduler keeps (period ticks, event cooldown) back to the state."""
+        s = self.state
+        now = self.clock.now
+        s.time_tick = PERIOD_TICKS - (self.period_job.due - now)
+        s.last_time_update = now
+        if self.cooldown_job is not None:
+            # Rolls still to be skipped, as a save stores them
+            s.event_cooldown = -(-(self.cooldown_job.due - now) // EVENT_TICKS)
+
+    def advance(self, ticks):
+        """Advance the game by `ticks` ticks, jumping over ticks with nothing due."""
+        s = self.state
+        end = self.clock.now + ticks
+        while self.clock.now < end:
+            timer = s.dorm_action_timer
+            if timer <= 0:
+                self.clock.advance(end - self.clock.now)
+                break
+            # A dorm action is running: jump to the tick it ends on
+            n = min(timer, end - self.clock.now)
+            self.clock.advance(n)
+            s.dorm_action_timer -= n - 1
+            self._say(actions.tick_dorm_action(s))
+
+    def step(self):
+        """Advance the game by one tick (1 / SIM_HZ seconds of game time)."""
+        self.advance(1)
+
+    def run(self, ticks):
+        self.advance(ticks)
+        return self.state
+
+    def run_days(self, days):
+        """Run until `days` more in-game days have started."""
+        target = self.state.day + days
+        while self.state.day < target:
+            self.advance(self.period_job.due - self.clock.now)
+        return self.state
+
+    def act(self, action, *args):
+        """Apply a function from game.actions to the state; returns its message."""
+        s = self.state
+        before = (s.version, s.flags.bits)
+        msg = action(s, *args)
+        if action in actions.ACTIVITIES and (s.version, s.flags.bits) != before:
+            # Done, not refused ("Too tired!"): feeds the activity achievements
+            s.touch('activity')
+        self._say(msg)
+        self.check_achievements()
+        return msg
+
+    def check_achievements(self):
+        """Report every achievement unlocked by changes since the last check."""
+        for msg in self.state.check_achievements():
+            self._say(msg)
+
+    def visit(self, key):
+        """Enter a building as the game does. Returns False if it is closed."""
+        s = self.state
+        if not s.can_access_building(key):
+            self._say(f"{key.capitalize()} is closed at this time.")
+            return False
+        self._say(actions.visit_building(s, key))
+        self.check_achievements()
+        return True
@@ -0,0 +1,76 @@
+from collections import OrderedDict
+import threading
+
+import pygame
+
+_FONTS = {}
+
+
+def get_font(family="Segoe UI", size=18, bold=False):
+    """Return the shared Font for (family, size, bold), resolving it only once.
+
+    `pygame.font.SysFont` scans the system font list on every call, so all
+    fonts should come from here instead of being created ad hoc.
+    """
+    key = (family, size, bold)
+    font = _FONTS.get(key)
+    if font is None:
+        font = _FONTS[key] = pygame.font.SysFont(family, size, bold=bold)
+    return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces with a memory cap.
+
+    Keyed by (font, text, color, antialias). Returned surfaces are shared, so
+    callers must blit them and never draw on them. Safe to use from the
+    scene prebake thread: the lock also covers font.render(), since the Font
+    objects are shared with the main thread.
+    """
+
+    def __init__(self, max_bytes=4 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        entries = self._entries
+        with self._lock:
+            surf = entries.get(key)
+            if surf is not None:
+                entries.move_to_end(key)
+                self.hits += 1
+                return surf
+            self.misses += 1
+            surf = font.render(text, antialias, color)
+            entries[key] = surf
+            self.bytes += surf.get_pitch() * surf.get_height()
+            while self.bytes > self.max_bytes and len(entries) > 1:
+                _, old = entries.popitem(last=False)
+                self.bytes -= old.get_pitch() * old.get_height()
+            return surf
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self):
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+        }
+
+
+TEXT_CACHE = TextCache()
+
+
+def render_text(font, text, color, antialias=True):
+    """Cached replacement for `font.render(text, antialias, color)`."""
+    return TEXT_CACHE.render(font, text, color, antialias)
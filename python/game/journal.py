@@ -0,0 +1,291 @@
+"""Append-only journal of GameState changes, on top of a save snapshot.
+
+Attach a Journal to a state and commit() now and then: it compares every
+journaled field (the scalars, inventory, meta and the packed quest/flag/
+upgrade/challenge containers) with what it last wrote, turns the changed ones
+into compact records (field id + new value) and hands them to a background
+thread, which appends them to the log as one CRC-checked batch and fsyncs it.
+The state itself pays nothing per assignment.
+
+Records hold absolute values, so replaying the log over the snapshot is
+idempotent. Once the log grows past `compact_bytes` it is folded into a fresh
+snapshot (written with game.save) and restarted. Recovery loads the snapshot
+and replays every complete batch; a batch torn by a crash is dropped, so at
+most one commit interval of progress is lost.
+
+    journal = Journal('saves/freshman.sav')
+    state = journal.recover()
+    journal.attach(state)
+    ...  # call journal.commit() every second or so
+    journal.close()
+"""
+import os
+import queue
+import struct
+import threading
+import zlib
+from array import array
+
+from . import save
+from .save import pack_str, pack_strs, Reader, DORM_STATES, DORM_INDEX, enum_value
+from .state import GameState, TIME_PERIODS, PERIOD_INDEX
+
+LOG_MAGIC = b'FQJL'
+LOG_VERSION = 3
+LOG_HEADER = save.HEADER.pack(LOG_MAGIC, LOG_VERSION)
+FRAME = struct.Struct('<II')  # payload length, crc32
+
+
+def _same(v):
+    return v
+
+
+# Fields journaled as they are assigned: (name, struct format, to stored, from stored)
+SCALARS = (
+    ('energy', 'h', _same, _same),
+    ('knowledge', 'h', _same, _same),
+    ('stress', 'h', _same, _same),
+    ('reputation', 'h', _same, _same),
+    ('discipline', 'h', _same, _same),
+    ('speed', 'h', _same, _same),
+    ('xp', 'I', _same, _same),
+    ('collected_points', 'I', _same, _same),
+    ('day', 'I', _same, _same),
+    ('time_of_day', 'B', PERIOD_INDEX.__getitem__, lambda i: enum_value(TIME_PERIODS, i)),
+    ('time_tick', 'H', _same, _same),
+    ('last_time_update', 'Q', _same, _same),
+    ('victory_awarded', '?', _same, _same),
+    ('dorm_player_state', 'B', DORM_INDEX.__getitem__, lambda i: enum_value(DORM_STATES, i)),
+    ('dorm_action_timer', 'H', _same, _same),
+    ('locker_open', '?', _same, _same),
+    ('last_challenge_reset_day', 'I', _same, _same),
+    ('event_cooldown', 'I', _same, _same),
+    ('daily_streak', 'I', _same, _same),
+    ('last_active_day', 'I', _same, _same),
+    ('difficulty_level', 'H', _same, _same),
+    ('stress_multiplier', 'd', _same, _same),
+)
+SCALAR_INDEX = {
+    name: (fid, struct.Struct('<' + fmt), to_raw)
+    for fid, (name, fmt, to_raw, _) in enumerate(SCALARS)
+}
+
+BITS = struct.Struct('<I')
+META = struct.Struct('<HI')  # coursesDone, booksRead
+WINDOWS = struct.Struct('<IHi')  # see AchievementTracker
+
+
+def _pack_meta(s):
+    meta = s.meta
+    department = meta['department']
+    out = bytearray()
+    pack_str(out, meta['school'] or '')
+    pack_str(out, department['id'] if department else '')
+    out += META.pack(meta['coursesDone'], meta['booksRead'])
+    pack_strs(out, [k for k, done in meta['programCourses'].items() if done])
+    pack_strs(out, [k for k, done in meta['courses'].items() if done])
+    return bytes(out)
+
+
+def _read_meta(r, s):
+    school, department = r.str(), r.str()
+    courses_done, books_read = r.unpack(META)
+    pcourses, courses = r.strs(), r.strs()
+    s.meta = save.build_meta(school, department, courses_done, books_read, pcourses, courses)
+
+
+def _pack_inventory(s):
+    out = bytearray()
+    pack_strs(out, sorted(s.inventory))
+    return bytes(out)
+
+
+def _read_inventory(r, s):
+    s.inventory = set(r.strs())
+    s.touch('inventory')
+
+
+def _pack_windows(s):
+    w = s.achievement_tracker
+    return WINDOWS.pack(w.coins_today, w.quests_today,
+                        -1 if w.calm_since is None else w.calm_since)
+
+
+def _read_windows(r, s):
+    w = s.achievement_tracker
+    w.coins_today, w.quests_today, calm = r.unpack(WINDOWS)
+    w.calm_since = None if calm < 0 else calm
+
+
+def _read_bits(field, group=None):
+    def read(r, s):
+        (getattr(s, field).bits,) = r.unpack(BITS)
+        if group:
+            s.touch(group)
+    return read
+
+
+def _read_upgrades(r, s):
+    levels = r.take(r.byte())
+    if len(levels) != len(s.upgrades.levels):
+        raise ValueError("Save file is corrupt")
+    s.upgrades.levels[:] = levels
+
+
+def _read_challenges(r, s):
+    current = s.daily_challenges.current
+    data = r.take(2 * r.byte())
+    if len(data) != 2 * len(current):
+        raise ValueError("Save file is corrupt")
+    current[:] = array('H', data)
+    s.touch('challenges')
+
+
+# Fields compared at commit time: (pack state -> bytes, read bytes into state)
+CONTAINERS = (
+    (lambda s: BITS.pack(s.quests.bits), _read_bits('quests', 'quests')),
+    (lambda s: BITS.pack(s.flags.bits), _read_bits('flags')),
+    (lambda s: BITS.pack(s.achievements.bits), _read_bits('achievements')),
+    (lambda s: bytes([len(s.upgrades.levels)]) + s.upgrades.levels, _read_upgrades),
+    (lambda s: bytes([len(s.daily_challenges.current)]) + s.daily_challenges.current.tobytes(), _read_challenges),
+    (_pack_inventory, _read_inventory),
+    (_pack_meta, _read_meta),
+    (_pack_windows, _read_windows),
+)
+FIRST_CONTAINER = len(SCALARS)
+
+
+def apply_records(s, payload):
+    """Apply one batch of records to `s`."""
+    r = Reader(payload, 0)
+    while r.pos < len(payload):
+        fid = r.byte()
+        if fid < FIRST_CONTAINER:
+            name, fmt, _, from_raw = SCALARS[fid]
+            (raw,) = r.unpack(SCALAR_INDEX[name][1])
+            setattr(s, name, from_raw(raw))
+        elif fid - FIRST_CONTAINER < len(CONTAINERS):
+            CONTAINERS[fid - FIRST_CONTAINER][1](r, s)
+        else:
+            raise ValueError(f"Unknown journal field {fid}")
+
+
+def replay(s, data):
+    """Apply every complete batch in log `data` to `s`. Returns how many were applied."""
+    if data[:len(LOG_HEADER)] != LOG_HEADER:
+        raise ValueError("Not a journal file")
+    pos = len(LOG_HEADER)
+    batches = 0
+    while pos + FRAME.size <= len(data):
+        length, crc = FRAME.unpack_from(data, pos)
+        payload = data[pos + FRAME.size:pos + FRAME.size + length]
+        if len(payload) < length or zlib.crc32(payload) != crc:
+            break  # Torn by a crash mid-write
+        apply_records(s, payload)
+        pos += FRAME.size + length
+        batches += 1
+    return batches
+
+
+class Journal:
+    """Journaling save for one GameState; see the module docstring."""
+
+    def __init__(self, snapshot_path, log_path=None, compact_bytes=64 * 1024):
+        self.snapshot_path = snapshot_path
+        self.log_path = log_path or snapshot_path + '.log'
+        self.compact_bytes = compact_bytes
+        self.state = None
+        self.log_bytes = 0
+        self.commits = 0
+        self.compactions = 0
+        self.last_error = None
+        self._written = {}
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def recover(self, cls=GameState):
+        """The last snapshot with the log replayed over it (a new game if neither exists)."""
+        if os.path.exists(self.snapshot_path):
+            s = save.load(self.snapshot_path, cls)
+        else:
+            s = cls()
+        if os.path.exists(self.log_path):
+            with open(self.log_path, 'rb') as f:
+                replay(s, f.read())
+        return s
+
+    def attach(self, s):
+        """Start journaling `s`. Compacts right away so the log starts clean."""
+        self.state = s
+        self._written = {}
+        for fid, (name, _, _, _) in enumerate(SCALARS):
+            _, st, to_raw = SCALAR_INDEX[name]
+            self._written[fid] = st.pack(to_raw(getattr(s, name)))
+        for i, (pack, _) in enumerate(CONTAINERS):
+            self._written[FIRST_CONTAINER + i] = pack(s)
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name='journal', daemon=True)
+            self._thread.start()
+        self.compact()
+
+    def _record(self, out, fid, payload):
+        if self._written.get(fid) != payload:
+            self._written[fid] = payload
+            out.append(fid)
+            out += payload
+
+    def commit(self):
+        """Queue everything changed since the last commit as one batch."""
+        s = self.state
+        out = bytearray()
+        for name, (fid, st, to_raw) in SCALAR_INDEX.items():
+            self._record(out, fid, st.pack(to_raw(getattr(s, name))))
+        for i, (pack, _) in enumerate(CONTAINERS):
+            self._record(out, FIRST_CONTAINER + i, pack(s))
+        if not out:
+            return 0
+        batch = FRAME.pack(len(out), zlib.crc32(out)) + out
+        self._queue.put(('batch', batch))
+        self.commits += 1
+        self.log_bytes += len(batch)
+        if self.log_bytes > self.compact_bytes:
+            self.compact()
+        return len(batch)
+
+    def compact(self):
+        """Fold the log into a fresh snapshot (written in the background)."""
+        self._queue.put(('compact', save.snapshot(self.state)))
+        self.log_bytes = 0
+        self.compactions += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            kind, data = item
+            try:
+                if kind == 'batch':
+                    with open(self.log_path, 'ab') as f:
+                        if f.tell() == 0:
+                            f.write(LOG_HEADER)
+                        f.write(data)
+                        f.flush()
+                        os.fsync(f.fileno())
+                else:
+                    # Snapshot first: if we crash before the log is reset,
+                    # replaying the old log over it changes nothing
+                    save.write_atomic(self.snapshot_path, save.encode_snapshot(data))
+                    save.write_atomic(self.log_path, LOG_HEADER)
+            except (OSError, ValueError) as e:
+                self.last_error = e
+
+    def close(self):
+        """Commit, compact and wait for the writes to finish."""
+        if self.state is not None:
+            self.commit()
+            self.compact()
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,105 @@
+import threading
+
+import pygame
+
+
+class BakedLayer:
+    """A static scene layer rendered once into an off-screen surface.
+
+    The layer is drawn by `draw_fn(surface)` the first time it is needed and
+    then reused every frame until something calls `invalidate()` (map change,
+    time-of-day tint, window resize...). `sync(key)` is a shortcut for layers
+    that depend on a small piece of state: the layer is rebuilt whenever the
+    key differs from the one it was last baked with; patch(key, fn) updates
+    it in place instead.
+
+    Layers may be baked ahead of time on another thread (see game.scenes);
+    get() holds a lock so a layer is never baked twice at once.
+    """
+
+    def __init__(self, size, draw_fn, alpha=False):
+        self.size = size
+        self.draw_fn = draw_fn
+        self.alpha = alpha
+        self.surface = None
+        self.dirty = True
+        self.key = None
+        self.builds = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        self.dirty = True
+
+    def resize(self, size):
+        if tuple(size) != tuple(self.size):
+            self.size = size
+            self.surface = None
+            self.dirty = True
+
+    def sync(self, key):
+        if key != self.key:
+            self.key = key
+            self.dirty = True
+
+    def patch(self, key, patch_fn):
+        """Like sync(key), but bring the baked surface up to date in place.
+
+        patch_fn(surface, old_key) is called with `key` already set, for
+        layers where a new key changes only a few pixels. A layer that isn't
+        baked yet is just marked for a full bake.
+        """
+        with self._lock:
+            if key == self.key:
+                return
+            old, self.key = self.key, key
+            if self.dirty or self.surface is None or old is None:
+                self.dirty = True
+            else:
+                patch_fn(self.surface, old)
+
+    def _new_surface(self):
+        flags = pygame.SRCALPHA if self.alpha else 0
+        surf = pygame.Surface(self.size, flags)
+        # Match the display pixel format so per-frame blits are plain copies
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert_alpha() if self.alpha else surf.convert()
+        return surf
+
+    @property
+    def ready(self):
+        """True if get() would not have to bake."""
+        return not self.dirty and self.surface is not None
+
+    def get(self):
+        """Return the baked surface, rebuilding it first if it is dirty."""
+        with self._lock:
+            if self.dirty or self.surface is None:
+                if self.surface is None:
+                    self.surface = self._new_surface()
+                # Cleared first: an invalidate() that lands mid-bake bakes again
+                self.dirty = False
+                self.surface.fill((0, 0, 0, 0))
+                try:
+                    self.draw_fn(self.surface)
+                except BaseException:
+                    self.dirty = True
+                    raise
+                self.builds += 1
+            return self.surface
+
+    def blit_to(self, target, pos=(0, 0), area=None):
+        return target.blit(self.get(), pos, area)
+
+
+_LAYERS = []
+
+
+def register(layer):
+    """Track a layer so it can be invalidated together with all the others."""
+    _LAYERS.append(layer)
+    return layer
+
+
+def invalidate_all():
+    for layer in _LAYERS:
+        layer.invalidate()
@@ -0,0 +1,271 @@
+"""Monte Carlo balance runs of full headless playthroughs.
+
+Seeds and parameter sets are split into chunks that run in a
+ProcessPoolExecutor. Each worker plays its chunk with the scalar engine and
+sends back only a small aggregate (sums and counts), never GameState objects,
+so the runner scales with the number of cores.
+
+    python -m game.montecarlo --runs 2000 --event-chance 0.02,0.05,0.1
+"""
+import argparse
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import product
+
+from . import actions
+from .actions import SCHOOLS
+from .cohort import STEPS, SECONDS_PER_DAY
+from .consts import SIM_HZ
+from .engine import Simulation
+from .state import GameState
+
+# GameState class attributes a parameter set may override
+PARAMETERS = ('EVENT_CHANCE', 'EVENT_COOLDOWN', 'STREAK_BONUSES', 'UPGRADE_COSTS')
+ACHIEVEMENTS = list(GameState().achievements)
+STEP_QUEST = {name: quest for name, _, quest, _ in STEPS}
+
+
+class HeuristicPlayer:
+    """Scripted player: quests in a fixed order, sleep when tired, buy upgrades.
+
+    Every `decision_every` seconds it picks up a coin with `coin_chance`, then
+    does the first unfinished quest step whose building is open (sleeping
+    first if it lacks the energy), and spends coins on the cheapest upgrade
+    it can afford.
+    """
+
+    STEP_ACTIONS = {
+        'choose_school': actions.choose_school,
+        'orientation': actions.attend_orientation,
+        'first_class': actions.attend_first_class,
+        'student_id': actions.get_student_id,
+        'timetable': actions.collect_timetable,
+        'library_card': actions.register_library_card,
+        'meal_coupon': actions.get_meal_coupon,
+        'eat_meal': actions.eat_meal,
+        'program_course': actions.complete_program_course,
+        'choose_department': actions.choose_department,
+        'department_course': actions.complete_department_course,
+    }
+
+    def __init__(self, rng, decision_every=2, coin_chance=0.3, sleep_below=30, map_coins=33, buy_upgrades=True):
+        self.rng = rng
+        self.decision_every = decision_every
+        self.coin_chance = coin_chance
+        self.sleep_below = sleep_below
+        self.coins_left = map_coins
+        self.buy_upgrades = buy_upgrades
+
+    def _todo(self, s, name):
+        q = s.quests
+        if name == 'choose_school':
+            return not q['chooseSchool']
+        if name == 'orientation':
+            return q['chooseSchool'] and not q['programOrientation']
+        if name == 'first_class':
+            return q['programOrientation'] and not q['firstClass']
+        if name == 'meal_coupon':
+            return not s.flags['mealCoupon']
+        if name == 'eat_meal':
+            return s.flags['mealCoupon'] and not q['eatMeal']
+        if name == 'program_course':
+            return q['programOrientation'] and not q['completeProgramCourses']
+        if name == 'choose_department':
+            return q['completeProgramCourses'] and not q['chooseDepartment']
+        if name == 'department_course':
+            return q['chooseDepartment'] and not q['completeDepartmentCourses']
+        return not q[STEP_QUEST[name]]
+
+    def _args(self, s, name):
+        if name == 'choose_school':
+            return (self.rng.choice(sorted(SCHOOLS)),)
+        if name == 'choose_department':
+            return (self.rng.choice(sorted(SCHOOLS[s.meta['school']]['departments'])),)
+        return ()
+
+    def act(self, sim):
+        s = sim.state
+        if self.coins_left and self.rng.random() < self.coin_chance:
+            self.coins_left -= 1
+            sim.act(actions.collect_coin)
+
+        step = None
+        for name, building, _, need in STEPS:
+            if s.can_access_building(building) and self._todo(s, name):
+                step = (name, building, need)
+                break
+        if step and s.energy >= step[2]:
+            name, building, _ = step
+            sim.visit(building)
+            sim.act(self.STEP_ACTIONS[name], *self._args(s, name))
+        elif step or s.energy < self.sleep_below:
+            # Bed in the dorm: start sleeping and wake up rested
+            sim.visit('dorm')
+            sim.act(actions.go_to_bed)
+            if s.dorm_player_state == 'sleeping':
+                s.dorm_action_timer = 1
+                sim.act(actions.tick_dorm_action)
+
+        if self.buy_upgrades:
+            for key in sorted(s.upgrades, key=lambda k: self._next_cost(s, k)):
+                if s.collected_points >= self._next_cost(s, key):
+                    s.purchase_upgrade(key)
+                    break
+
+    @staticmethod
+    def _next_cost(s, key):
+        costs = s.UPGRADE_COSTS.get(key, [])
+        level = s.upgrades[key]
+        return costs[level] if level < len(costs) else float('inf')
+
+
+def play(params, seed, max_days=10, player_opts=None):
+    """One playthrough. Returns (victory day or None, XP at each day end, achievement bits)."""
+    rng = random.Random(seed)
+    for name in params:
+        if name not in PARAMETERS:
+            raise ValueError(f"Unknown balance parameter: {name}")
+    state = GameState.variant(rng=rng, **params)()
+    sim = Simulation(state)
+    player = HeuristicPlayer(rng, **(player_opts or {}))
+
+    xp_by_day = []
+    victory_day = None
+    ticks_per_decision = player.decision_every * SIM_HZ
+    total = max_days * SECONDS_PER_DAY * SIM_HZ
+    while sim.ticks < total:
+        day = state.day
+        sim.run(ticks_per_decision)
+        player.act(sim)
+        if state.day != day:
+            xp_by_day.append(state.xp)
+        if victory_day is None and state.all_quests_done():
+            victory_day = state.day
+    while len(xp_by_day) < max_days:
+        xp_by_day.append(state.xp)
+
+    unlocked = 0
+    for i, key in enumerate(ACHIEVEMENTS):
+        if state.achievements[key]:
+            unlocked |= 1 << i
+    return victory_day, xp_by_day, unlocked
+
+
+def new_aggregate(max_days):
+    return {
+        'runs': 0,
+        'victories': 0,
+        'victory_days': 0,
+        'xp_by_day': [0] * max_days,
+        'achievements': [0] * len(ACHIEVEMENTS),
+    }
+
+
+def merge(into, part):
+    into['runs'] += part['runs']
+    into['victories'] += part['victories']
+    into['victory_days'] += part['victory_days']
+    into['xp_by_day'] = [a + b for a, b in zip(into['xp_by_day'], part['xp_by_day'])]
+    into['achievements'] = [a + b for a, b in zip(into['achievements'], part['achievements'])]
+    return into
+
+
+def run_chunk(params, seeds, max_days=10, player_opts=None):
+    """Play every seed in `seeds` and return only their aggregate (worker entry point)."""
+    agg = new_aggregate(max_days)
+    for seed in seeds:
+        victory_day, xp_by_day, unlocked = play(params, seed, max_days, player_opts)
+        agg['runs'] += 1
+        if victory_day is not None:
+            agg['victories'] += 1
+            agg['victory_days'] += victory_day
+        for d, xp in enumerate(xp_by_day):
+            agg['xp_by_day'][d] += xp
+        for i in range(len(ACHIEVEMENTS)):
+            if unlocked >> i & 1:
+                agg['achievements'][i] += 1
+    return agg
+
+
+def summarize(agg):
+    runs = max(1, agg['runs'])
+    return {
+        'runs': agg['runs'],
+        'victory_rate': agg['victories'] / runs,
+        'mean_days_to_victory': agg['victory_days'] / agg['victories'] if agg['victories'] else None,
+        'mean_xp_by_day': [x / runs for x in agg['xp_by_day']],
+        'achievement_rates': {k: n / runs for k, n in zip(ACHIEVEMENTS, agg['achievements'])},
+    }
+
+
+def parameter_grid(**axes):
+    """Every combination of the given GameState parameters, as dicts."""
+    names = list(axes)
+    return [dict(zip(names, values)) for values in product(*(axes[n] for n in names))]
+
+
+def run_sweep(grid, runs, workers=None, chunk_size=50, max_days=10, seed=0, player_opts=None):
+    """Run `runs` playthroughs for each parameter set in `grid` in parallel.
+
+    Yields (index into grid, params, running aggregate) every time a chunk
+    finishes, so callers can report progress and stop early.
+    """
+    max_workers = workers or os.cpu_count() or 1
+    totals = [new_aggregate(max_days) for _ in grid]
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {}
+        for i, params in enumerate(grid):
+            for start in range(0, runs, chunk_size):
+                # Seeds differ per parameter set but are reproducible
+                seeds = range(seed + i * runs + start, seed + i * runs + min(runs, start + chunk_size))
+                fut = pool.submit(run_chunk, params, seeds, max_days, player_opts)
+                futures[fut] = i
+        for fut in as_completed(futures):
+            i = futures[fut]
+            merge(totals[i], fut.result())
+            yield i, grid[i], totals[i]
+
+
+def _floats(text):
+    return [float(v) for v in text.split(',')]
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Parallel Monte Carlo balance runs")
+    ap.add_argument('--runs', type=int, default=1000, help="playthroughs per parameter set")
+    ap.add_argument('--days', type=int, default=10)
+    ap.add_argument('--workers', type=int, default=None)
+    ap.add_argument('--chunk', type=int, default=50)
+    ap.add_argument('--seed', type=int, default=0)
+    ap.add_argument('--event-chance', type=_floats, default=[GameState.EVENT_CHANCE])
+    ap.add_argument('--upgrade-scale', type=_floats, default=[1.0],
+                    help="multiply every upgrade cost, e.g. 0.5,1,2")
+    args = ap.parse_args(argv)
+
+    upgrade_sets = [
+        {k: [max(1, round(c * scale)) for c in costs] for k, costs in GameState.UPGRADE_COSTS.items()}
+        for scale in args.upgrade_scale
+    ]
+    grid = parameter_grid(EVENT_CHANCE=args.event_chance, UPGRADE_COSTS=upgrade_sets)
+    labels = [f"event_chance={c} upgrade_scale={u}" for c, u in product(args.event_chance, args.upgrade_scale)]
+
+    done = [0] * len(grid)
+    chunks = -(-args.runs // args.chunk)
+    for i, _, agg in run_sweep(grid, args.runs, args.workers, args.chunk, args.days, args.seed):
+        done[i] += 1
+        if done[i] == chunks:
+            res = summarize(agg)
+            mean = res['mean_days_to_victory']
+            print(labels[i])
+            line = f"  runs {res['runs']}  victory {res['victory_rate']:.0%}"
+            if mean is not None:
+                line += f"  mean days to victory {mean:.2f}"
+            print(line)
+            print("  xp by day " + " ".join(f"{x:.0f}" for x in res['mean_xp_by_day']))
+            rates = ", ".join(f"{k} {v:.0%}" for k, v in res['achievement_rates'].items() if v)
+            print(f"  achievements {rates}")
+
+
+if __name__ == '__main__':
+    main()
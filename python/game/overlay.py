@@ -0,0 +1,56 @@
+"""Shared overlay surfaces for dimming, fades and tints.
+
+Full-screen overlays used to be new 1200x600 surfaces every frame (a few MB
+allocated and filled per frame while a popup was open). These are created
+once per size and colour and reused:
+
+- tinted(size, rgba): a surface filled with a translucent colour, for fixed
+  overlays like the popup dimming or a button highlight.
+- fade(target, rgb, alpha): darkens/tints all of `target` by `alpha` using one
+  opaque surface and set_alpha(), so an animated fade needs no fill either.
+
+Call clear() when the display format changes.
+"""
+import pygame
+
+MAX_TINTS = 64  # Distinct (size, colour) tints kept; plenty for the UI
+
+_TINTS = {}
+_FADES = {}
+
+
+def tinted(size, rgba):
+    """Shared SRCALPHA surface of `size` filled with `rgba`. Blit it, never draw on it."""
+    key = (tuple(size), tuple(rgba))
+    surf = _TINTS.get(key)
+    if surf is None:
+        if len(_TINTS) >= MAX_TINTS:
+            _TINTS.clear()
+        surf = _TINTS[key] = pygame.Surface(size, pygame.SRCALPHA)
+        surf.fill(rgba)
+    return surf
+
+
+def fade(target, rgb, alpha):
+    """Blend `rgb` over all of `target` with opacity `alpha` (0-255)."""
+    if alpha <= 0:
+        return
+    if alpha >= 255:
+        target.fill(rgb)
+        return
+    size = target.get_size()
+    key = (size, tuple(rgb))
+    surf = _FADES.get(key)
+    if surf is None:
+        surf = pygame.Surface(size)
+        if pygame.display.get_surface() is not None:
+            surf = surf.convert()
+        surf.fill(rgb)
+        _FADES[key] = surf
+    surf.set_alpha(alpha)
+    target.blit(surf, (0, 0))
+
+
+def clear():
+    _TINTS.clear()
+    _FADES.clear()
@@ -0,0 +1,165 @@
+from array import array
+from collections.abc import Mapping, MutableMapping
+
+
+class FlagSet(MutableMapping):
+    """Fixed set of boolean flags packed into one int.
+
+    Behaves like the `{name: bool}` dict it replaces (`flags['dormKey']`,
+    `.values()`, `.items()`...), but the key names live once on the class and
+    each instance only stores an int bitmask. Create a schema with
+    `FlagSet.schema(names)`; assigning an unknown name raises KeyError.
+    """
+
+    __slots__ = ('bits',)
+    NAMES = ()
+    INDEX = {}
+
+    @classmethod
+    def schema(cls, name, names):
+        names = tuple(names)
+        return type(name, (cls,), {
+            '__slots__': (),
+            'NAMES': names,
+            'INDEX': {n: 1 << i for i, n in enumerate(names)},
+        })
+
+    def __init__(self, bits=0):
+        self.bits = bits
+
+    def __getitem__(self, key):
+        return bool(self.bits & self.INDEX[key])
+
+    def __setitem__(self, key, value):
+        bit = self.INDEX[key]
+        if value:
+            self.bits |= bit
+        else:
+            self.bits &= ~bit
+
+    def __delitem__(self, key):
+        raise TypeError("FlagSet keys are fixed")
+
+    def __contains__(self, key):
+        return key in self.INDEX
+
+    def __iter__(self):
+        return iter(self.NAMES)
+
+    def __len__(self):
+        return len(self.NAMES)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)})"
+
+    def all(self):
+        return self.bits == (1 << len(self.NAMES)) - 1
+
+
+class LevelMap(MutableMapping):
+    """Fixed `{name: small int}` mapping backed by one bytearray (0-255 per key)."""
+
+    __slots__ = ('levels',)
+    NAMES = ()
+    INDEX = {}
+
+    @classmethod
+    def schema(cls, name, names):
+        names = tuple(names)
+        return type(name, (cls,), {
+            '__slots__': (),
+            'NAMES': names,
+            'INDEX': {n: i for i, n in enumerate(names)},
+        })
+
+    def __init__(self):
+        self.levels = bytearray(len(self.NAMES))
+
+    def __getitem__(self, key):
+        return self.levels[self.INDEX[key]]
+
+    def __setitem__(self, key, value):
+        self.levels[self.INDEX[key]] = value
+
+    def __delitem__(self, key):
+        raise TypeError("LevelMap keys are fixed")
+
+    def __contains__(self, key):
+        return key in self.INDEX
+
+    def __iter__(self):
+        return iter(self.NAMES)
+
+    def __len__(self):
+        return len(self.NAMES)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({dict(self)})"
+
+
+class Challenge(Mapping):
+    """One daily challenge as a `{'target', 'current', 'reward'}` view."""
+
+    __slots__ = ('_owner', '_i')
+    FIELDS = ('target', 'current', 'reward')
+
+    def __init__(self, owner, i):
+        self._owner = owner
+        self._i = i
+
+    def __getitem__(self, field):
+        if field == 'current':
+            return self._owner.current[self._i]
+        if field == 'target':
+            return self._owner.TARGETS[self._i]
+        if field == 'reward':
+            return self._owner.REWARDS[self._i]
+        raise KeyError(field)
+
+    def __setitem__(self, field, value):
+        if field != 'current':
+            raise KeyError(f"Challenge {field} is fixed")
+        self._owner.current[self._i] = value
+
+    def __iter__(self):
+        return iter(self.FIELDS)
+
+    def __len__(self):
+        return len(self.FIELDS)
+
+
+class ChallengeSet(Mapping):
+    """Daily challenges: targets and rewards are shared, only progress is per session."""
+
+    __slots__ = ('current',)
+    NAMES = ()
+    INDEX = {}
+    TARGETS = ()
+    REWARDS = ()
+
+    @classmethod
+    def schema(cls, name, defs):
+        """`defs` is {challenge: (target, reward)}."""
+        names = tuple(defs)
+        return type(name, (cls,), {
+            '__slots__': (),
+            'NAMES': names,
+            'INDEX': {n: i for i, n in enumerate(names)},
+            'TARGETS': tuple(defs[n][0] for n in names),
+            'REWARDS': tuple(defs[n][1] for n in names),
+        })
+
+    def __init__(self):
+        self.current = array('H', bytes(2 * len(self.NAMES)))
+
+    def __getitem__(self, key):
+        return Challenge(self, self.INDEX[key])
+
+    def __iter__(self):
+        return iter(self.NAMES)
+
+    def __len__(self):
+        return len(self.NAMES)
+
+    def __repr__(self):
+        return f"{type(self).__name__}({ {k: dict(v) for k, v in self.items()} })"
@@ -2,6 +2,8 @@ import pygame
 from pygame import Rect
 from .consts import PANEL, BORDER, TEXT, WHITE, BLACK
 from .widgets import Button
+from .fonts import get_font, render_text
+from . import overlay
 
 class Popup:
     def __init__(self, title, width=500, height=360):
@@ -9,6 +11,9 @@ class Popup:
         self.rect = Rect(0, 0, width, height)
         self.buttons = []
         self.lines = []
+        self._body = None
+        self._layout_key = None
+        self._placed_for = None
 
     def center_on(self, screen_w, screen_h):
         self.rect.x = (screen_w - self.rect.w)//2
@@ -16,17 +21,56 @@ class Popup:
 
     def add_line(self, text, small=False, color=TEXT):
         self.lines.append((text, small, color))
+        self._layout_key = None
 
     def add_button(self, text, on_click, primary=False, disabled=False):
         # Calculate button width based on text length to prevent text overflow
-        font = pygame.font.SysFont("Segoe UI", 18)
+        font = get_font("Segoe UI", 18)
         text_width = font.size(text)[0]
         btn_w = max(160, min(240, text_width + 28))  # Min 160, max 240, or fit text + padding
         btn_h = 38
         self.buttons.append(Button(Rect(0,0,btn_w,btn_h), text, on_click, primary=primary, disabled=disabled))
+        self._placed_for = None
+
+    def update_from(self, other):
+        """Reconcile this popup with a freshly declared version of itself.
+
+        Building UIs re-declare their popup from the current state; only what
+        differs is touched here. The body is re-rendered only if the title or
+        lines changed, and buttons whose text is unchanged are kept (with
+        their rendered face) and just get the new callback and flags.
+        Returns True if anything that shows on screen changed.
+        """
+        changed = False
+        if other.title != self.title or other.lines != self.lines or other.rect.size != self.rect.size:
+            self.title = other.title
+            self.lines = other.lines
+            self.rect.size = other.rect.size
+            self._layout_key = None
+            changed = True
+        buttons = []
+        for i, new in enumerate(other.buttons):
+            old = self.buttons[i] if i < len(self.buttons) else None
+            if old is not None and old.text == new.text and old.rect.size == new.rect.size:
+                if old.primary != new.primary or old.disabled != new.disabled:
+                    changed = True
+                old.on_click = new.on_click
+                old.primary = new.primary
+                old.disabled = new.disabled
+                buttons.append(old)
+            else:
+                buttons.append(new)
+                self._placed_for = None
+                changed = True
+        if len(buttons) != len(self.buttons):
+            self._placed_for = None
+            changed = True
+        self.buttons = buttons
+        return changed
 
     def _update_button_positions(self, screen_size):
         """Update button positions based on current popup position."""
+        self._placed_for = tuple(screen_size)
         self.center_on(*screen_size)
         # Better button layout - wrap if needed
         bx = self.rect.x + 20
@@ -44,58 +88,70 @@ class Popup:
             btn.rect.topleft = (current_x, current_y)
             current_x += btn.rect.w + gap
 
-    def draw(self, surface, fonts, screen_size):
+    def invalidate(self):
+        """Force the next draw to lay the popup out again."""
+        self._layout_key = None
+
+    def layout(self, fonts, screen_size):
+        """Position the popup and pre-render its static body.
+
+        Runs only when the content, fonts or screen size changed since the
+        last call, so `draw` is just a few blits regardless of line count.
+        """
+        key = (tuple(screen_size), fonts['font'], fonts['font_sm'], fonts['font_lg'])
+        if self._placed_for != tuple(screen_size):
+            self._update_button_positions(screen_size)
+        if key == self._layout_key:
+            return
+        self._update_button_positions(screen_size)
+        self._body = self._render_body(fonts)
+        self._layout_key = key
+
+    def _render_body(self, fonts):
+        """Render shadow, panel, title and wrapped lines into one surface."""
         font = fonts['font']
         font_sm = fonts['font_sm']
         font_lg = fonts['font_lg']
-
-        self._update_button_positions(screen_size)
-        
-        # Enhanced overlay with gradient effect
-        overlay = pygame.Surface(screen_size, pygame.SRCALPHA)
-        overlay.fill((15,23,42,160))
-        surface.blit(overlay, (0,0))
+        w, h = self.rect.w, self.rect.h
 
         # Popup shadow for depth
         shadow_offset = 4
-        shadow_rect = Rect(self.rect.x + shadow_offset, self.rect.y + shadow_offset, 
-                          self.rect.w, self.rect.h)
-        shadow_surf = pygame.Surface((self.rect.w, self.rect.h), pygame.SRCALPHA)
-        shadow_surf.fill((0, 0, 0, 80))
-        surface.blit(shadow_surf, (shadow_rect.x, shadow_rect.y), special_flags=pygame.BLEND_ALPHA_SDL2)
+        body = pygame.Surface((w + shadow_offset, h + shadow_offset), pygame.SRCALPHA)
+        body.fill((0, 0, 0, 0))
+        body.fill((0, 0, 0, 80), Rect(shadow_offset, shadow_offset, w, h))
+        rect = Rect(0, 0, w, h)
 
         # Main popup background with subtle gradient effect
-        pygame.draw.rect(surface, PANEL, self.rect, border_radius=16)
+        pygame.draw.rect(body, PANEL, rect, border_radius=16)
         
         # Add subtle inner highlight at top
-        highlight_rect = Rect(self.rect.x, self.rect.y, self.rect.w, 40)
-        highlight_surf = pygame.Surface((self.rect.w, 40), pygame.SRCALPHA)
+        highlight_surf = pygame.Surface((w, 40), pygame.SRCALPHA)
         highlight_surf.fill((255, 255, 255, 30))
-        surface.blit(highlight_surf, (highlight_rect.x, highlight_rect.y), special_flags=pygame.BLEND_ALPHA_SDL2)
+        body.blit(highlight_surf, (0, 0), special_flags=pygame.BLEND_ALPHA_SDL2)
         
         # Enhanced border
-        pygame.draw.rect(surface, BORDER, self.rect, 2, border_radius=16)
+        pygame.draw.rect(body, BORDER, rect, 2, border_radius=16)
         
         # Title with icon space and better styling
-        title_y = self.rect.y + 18
-        title_text = font_lg.render(self.title, True, TEXT)
+        title_y = 18
+        title_text = render_text(font_lg, self.title, TEXT)
         # Add subtle underline decoration
-        pygame.draw.line(surface, (79, 70, 229), 
-                        (self.rect.x + 18, title_y + title_text.get_height() + 4),
-                        (self.rect.x + 18 + title_text.get_width(), title_y + title_text.get_height() + 4), 2)
-        surface.blit(title_text, (self.rect.x + 18, title_y))
+        pygame.draw.line(body, (79, 70, 229), 
+                        (18, title_y + title_text.get_height() + 4),
+                        (18 + title_text.get_width(), title_y + title_text.get_height() + 4), 2)
+        body.blit(title_text, (18, title_y))
         
         # Content area with better spacing and background
         content_padding = 20
-        content_x = self.rect.x + content_padding
-        content_y = self.rect.y + 55
-        content_width = self.rect.w - (content_padding * 2)
-        content_height = self.rect.bottom - 20 - 50 - content_y  # Space for buttons
+        content_x = content_padding
+        content_y = 55
+        content_width = w - (content_padding * 2)
+        content_height = h - 20 - 50 - content_y  # Space for buttons
         
         content_bg = Rect(content_x, content_y, content_width, content_height)
         content_surf = pygame.Surface((content_bg.w, content_bg.h), pygame.SRCALPHA)
         content_surf.fill((248, 250, 252, 180))
-        surface.blit(content_surf, (content_bg.x, content_bg.y), special_flags=pygame.BLEND_ALPHA_SDL2)
+        body.blit(content_surf, (content_bg.x, content_bg.y), special_flags=pygame.BLEND_ALPHA_SDL2)
         
         # Text rendering with word wrapping
         ly = content_y + 12
@@ -112,8 +168,7 @@ class Popup:
             current_width = 0
             
             for word in words:
-                word_surf = f.render(word + ' ', True, color)
-                word_width = word_surf.get_width()
+                word_width = f.size(word + ' ')[0]
                 
                 if current_width + word_width > max_text_width and current_line:
                     lines.append(' '.join(current_line))
@@ -134,31 +189,41 @@ class Popup:
                 # Bullet point for first line of each item
                 if line_text == lines[0] and not small:
                     bullet_color = (79, 70, 229)
-                    pygame.draw.circle(surface, bullet_color, (content_x + 12, ly + line_height//2), 3)
+                    pygame.draw.circle(body, bullet_color, (content_x + 12, ly + line_height//2), 3)
                     text_x = content_x + 24
                 else:
                     text_x = content_x + 12 if small else content_x + 24
                 
                 # Render text with subtle shadow
-                text_surf = f.render(line_text, True, color)
+                text_surf = render_text(f, line_text, color)
                 # Shadow
-                shadow_surf = f.render(line_text, True, (0, 0, 0, 20))
-                surface.blit(shadow_surf, (text_x + 1, ly + 1))
+                shadow_surf = render_text(f, line_text, (0, 0, 0, 20))
+                body.blit(shadow_surf, (text_x + 1, ly + 1))
                 # Main text
-                surface.blit(text_surf, (text_x, ly))
+                body.blit(text_surf, (text_x, ly))
                 
                 ly += line_height
             
             # Add spacing between items
             ly += 4
+        return body
+
+    def draw(self, surface, fonts, screen_size):
+        self.layout(fonts, screen_size)
+        
+        # Dim the game behind the popup (shared surface, not one per frame)
+        surface.blit(overlay.tinted(screen_size, (15,23,42,160)), (0,0))
+
+        surface.blit(self._body, self.rect.topleft)
 
         # Buttons with better spacing
         for btn in self.buttons:
-            btn.draw(surface, font)
+            btn.draw(surface, fonts['font'])
 
     def handle_event(self, event, screen_size):
         """Handle events, ensuring button positions are updated first."""
-        self._update_button_positions(screen_size)
+        if self._placed_for != tuple(screen_size):
+            self._update_button_positions(screen_size)
         handled = False
         for btn in self.buttons:
             handled = btn.handle_event(event) or handled
@@ -0,0 +1,165 @@
+"""Per-section frame profiler with an on-screen overlay.
+
+Sections are functions looked up by name on a module or class, e.g.
+(main_module, 'draw_hud') or (Popup, 'draw'). While the overlay is on they
+are swapped for timing wrappers that add their time to the current frame;
+while it is off the originals are put back, so the timers cost nothing
+unless the overlay is shown.
+
+capture() records the next N frames with cProfile and writes the stats to a
+file, independently of the overlay.
+"""
+import cProfile
+import os
+import pstats
+import time
+import types
+from collections import deque
+
+import pygame
+
+GRAPH_FRAMES = 120
+SMOOTHING = 0.1  # Weight of the newest frame in the per-section averages
+BUDGET_MS = 1000 / 60
+
+
+def section_label(owner, name):
+    """'draw_hud' for module functions, 'Popup.draw' for methods."""
+    if isinstance(owner, types.ModuleType):
+        return name
+    return f"{owner.__name__}.{name}"
+
+
+class FrameProfiler:
+    def __init__(self, sections):
+        # (owner, attribute, depth); depth indents the section in the overlay
+        self.sections = [(owner, name, depth, section_label(owner, name)) for owner, name, depth in sections]
+        self.enabled = False
+        self.frame_ms = deque(maxlen=GRAPH_FRAMES)
+        self.average = {}
+        self._current = {}
+        self._originals = []
+        self._label_surfs = {}
+        self._capture = None
+        self._capture_left = 0
+        self._capture_path = None
+
+    def _wrap(self, fn, label):
+        current = self._current
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            t = perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                current[label] = current.get(label, 0.0) + perf_counter() - t
+
+        return timed
+
+    def toggle(self):
+        """Show or hide the overlay, installing or removing the timers."""
+        if self.enabled:
+            for owner, name, fn in reversed(self._originals):
+                setattr(owner, name, fn)
+            self._originals = []
+        else:
+            for owner, name, _, label in self.sections:
+                fn = getattr(owner, name)
+                self._originals.append((owner, name, fn))
+                setattr(owner, name, self._wrap(fn, label))
+            self.average.clear()
+            self.frame_ms.clear()
+        self._current.clear()
+        self.enabled = not self.enabled
+        return self.enabled
+
+    def end_frame(self, frame_ms):
+        """Close the frame that just finished; `frame_ms` is its length."""
+        if self._capture is not None:
+            self._capture_left -= 1
+            if self._capture_left <= 0:
+                self._finish_capture()
+        if not self.enabled:
+            return
+        self.frame_ms.append(frame_ms)
+        average = self.average
+        for label in average:
+            if label not in self._current:
+                average[label] *= 1 - SMOOTHING
+        for label, seconds in self._current.items():
+            ms = seconds * 1000
+            average[label] = average[label] + (ms - average[label]) * SMOOTHING if label in average else ms
+        self._current.clear()
+
+    def capture(self, frames, path):
+        """Profile the next `frames` frames with cProfile and write them to `path`.
+
+        Returns False if a capture is already running.
+        """
+        if self._capture is not None:
+            return False
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        self._capture_path = path
+        self._capture_left = frames
+        self._capture = cProfile.Profile()
+        self._capture.enable()
+        return True
+
+    @property
+    def capturing(self):
+        return self._capture is not None
+
+    def close(self):
+        """Write out a capture that is still running."""
+        if self._capture is not None:
+            self._finish_capture()
+
+    def _finish_capture(self):
+        profile, self._capture = self._capture, None
+        profile.disable()
+        profile.dump_stats(self._capture_path)
+        print(f"Profile written to {self._capture_path}")
+        pstats.Stats(profile).sort_stats('cumulative').print_stats(15)
+
+    def draw(self, surface, font):
+        """Frame time graph and per-section averages in the top left corner."""
+        # Sections that ran lately (baked layers only draw now and then)
+        rows = [(label, depth) for _, _, depth, label in self.sections
+                if self.average.get(label, 0.0) >= 0.005]
+        line_h = font.get_linesize()
+        graph_h = 60
+        w = 260
+        h = 8 + graph_h + 6 + line_h * (len(rows) + 1) + 6
+        panel = pygame.Surface((w, h), pygame.SRCALPHA)
+        panel.fill((15, 23, 42, 200))
+
+        # One bar per frame; the line is the 60 fps budget
+        scale = graph_h / (BUDGET_MS * 3)
+        x0 = w - 8 - GRAPH_FRAMES * 2
+        for i, ms in enumerate(self.frame_ms):
+            bar = min(graph_h, int(ms * scale))
+            color = (34, 197, 94) if ms <= BUDGET_MS * 1.1 else (234, 179, 8) if ms <= BUDGET_MS * 2 else (239, 68, 68)
+            pygame.draw.rect(panel, color, (x0 + i * 2, 8 + graph_h - bar, 2, bar))
+        budget_y = 8 + graph_h - int(BUDGET_MS * scale)
+        pygame.draw.line(panel, (148, 163, 184), (8, budget_y), (w - 8, budget_y))
+
+        y = 8 + graph_h + 6
+        last = self.frame_ms[-1] if self.frame_ms else 0.0
+        worst = max(self.frame_ms) if self.frame_ms else 0.0
+        head = f"frame {last:5.1f} ms  worst {worst:5.1f} ms"
+        if self.capturing:
+            head += "  [profiling]"
+        panel.blit(font.render(head, True, (255, 255, 255)), (8, y))
+        for label, depth in rows:
+            y += line_h
+            surf = self._label_surfs.get(label)
+            if surf is None:
+                surf = self._label_surfs[label] = font.render(label, True, (203, 213, 225))
+            panel.blit(surf, (8 + depth * 12, y))
+            value = font.render(f"{self.average[label]:6.2f} ms", True, (203, 213, 225))
+            panel.blit(value, (w - 8 - value.get_width(), y))
+        surface.blit(panel, (8, 8))
+        return pygame.Rect(8, 8, w, h)
@@ -0,0 +1,145 @@
+"""Record a play session's input and play it back exactly.
+
+A recording holds the session seed, the game state it started from (as save
+bytes) and then one entry per rendered frame: how many sim ticks ran, which
+movement keys were held during them, and the key presses, clicks and quit
+events the frame handled. Replaying feeds the same input to the same ticks,
+so with the same seed the session ends in exactly the same state; run it with
+--fps=0 to use it as a repeatable benchmark workload.
+"""
+import struct
+
+import pygame
+
+MAGIC = b'FQRC'
+FORMAT_VERSION = 1
+
+HEADER = struct.Struct('<4sHQHI')  # magic, version, seed, sim rate, start state size
+FRAME = struct.Struct('<BHB')  # sim ticks, held keys, event count
+KEYDOWN = struct.Struct('<I')
+MOUSEUP = struct.Struct('<hhB')
+
+# Keys the simulation reads while held, one bit each
+HELD_KEYS = (pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN)
+KEY_BITS = {key: 1 << i for i, key in enumerate(HELD_KEYS)}
+
+EV_QUIT, EV_KEYDOWN, EV_MOUSEUP = range(3)
+
+
+def key_mask(pressed):
+    """Bitmask of the HELD_KEYS down in `pressed` (from pygame.key.get_pressed())."""
+    mask = 0
+    for key, bit in KEY_BITS.items():
+        if pressed[key]:
+            mask |= bit
+    return mask
+
+
+class HeldKeys:
+    """Stands in for pygame.key.get_pressed() with only the recorded keys."""
+
+    __slots__ = ('mask',)
+
+    def __init__(self, mask):
+        self.mask = mask
+
+    def __getitem__(self, key):
+        return bool(self.mask & KEY_BITS.get(key, 0))
+
+
+def _pack_events(events):
+    kept = 0
+    body = bytearray()
+    for e in events:
+        if e.type == pygame.QUIT:
+            body.append(EV_QUIT)
+        elif e.type == pygame.KEYDOWN:
+            body.append(EV_KEYDOWN)
+            body += KEYDOWN.pack(e.key)
+        elif e.type == pygame.MOUSEBUTTONUP:
+            body.append(EV_MOUSEUP)
+            body += MOUSEUP.pack(e.pos[0], e.pos[1], e.button)
+        else:
+            continue
+        kept += 1
+    return kept, body
+
+
+class Recorder:
+    """Writes a recording as the session runs."""
+
+    def __init__(self, path, seed, start_state, sim_hz):
+        self.path = path
+        self.frames = 0
+        self._f = open(path, 'wb')
+        self._f.write(HEADER.pack(MAGIC, FORMAT_VERSION, seed, sim_hz, len(start_state)))
+        self._f.write(start_state)
+
+    def frame(self, ticks, mask, events):
+        count, body = _pack_events(events)
+        self._f.write(FRAME.pack(ticks, mask, count))
+        self._f.write(body)
+        self.frames += 1
+
+    def close(self):
+        self._f.close()
+
+
+class Replay:
+    """A loaded recording; next_frame() hands out its frames in order."""
+
+    def __init__(self, seed, sim_hz, start_state, frames):
+        self.seed = seed
+        self.sim_hz = sim_hz
+        self.start_state = start_state
+        self.frames = frames
+        self.pos = 0
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            raise ValueError("Not a recording")
+        magic, version, seed, sim_hz, state_size = HEADER.unpack_from(data)
+        if magic != MAGIC:
+            raise ValueError("Not a recording")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported recording format version {version}")
+        pos = HEADER.size
+        start_state = data[pos:pos + state_size]
+        pos += state_size
+
+        frames = []
+        try:
+            while pos < len(data):
+                ticks, mask, count = FRAME.unpack_from(data, pos)
+                pos += FRAME.size
+                events = []
+                for _ in range(count):
+                    kind = data[pos]
+                    pos += 1
+                    if kind == EV_QUIT:
+                        events.append(pygame.event.Event(pygame.QUIT))
+                    elif kind == EV_KEYDOWN:
+                        (key,) = KEYDOWN.unpack_from(data, pos)
+                        pos += KEYDOWN.size
+                        events.append(pygame.event.Event(pygame.KEYDOWN, key=key))
+                    elif kind == EV_MOUSEUP:
+                        x, y, button = MOUSEUP.unpack_from(data, pos)
+                        pos += MOUSEUP.size
+                        events.append(pygame.event.Event(pygame.MOUSEBUTTONUP, pos=(x, y), button=button))
+                    else:
+                        raise ValueError(f"Unknown event {kind} in recording")
+                frames.append((ticks, mask, events))
+        except (struct.error, IndexError):
+            pass  # Recording cut off (e.g. the game crashed); keep whole frames
+        return cls(seed, sim_hz, start_state, frames)
+
+    def next_frame(self):
+        """(sim ticks, held key mask, events) of the next frame, or None at the end."""
+        if self.pos >= len(self.frames):
+            return None
+        frame = self.frames[self.pos]
+        self.pos += 1
+        return frame
@@ -0,0 +1,127 @@
+try:
+    import numpy as np
+except ImportError:  # Batch queries fall back to a loop
+    np = None
+
+
+def point_on_road(x, y, buildings, main_road_y, road_width=50, side_road_width=40, margin=0):
+    """Geometric test: is (x, y) on the main road or a building's access road?"""
+    # Check if on main horizontal road
+    if abs(y - main_road_y) < road_width // 2 + margin:
+        return True
+
+    # Check if on any vertical road connecting to buildings
+    road_margin = side_road_width // 2 + margin
+    for b in buildings:
+        building_rect = b['rect']
+        gate_x = building_rect.centerx
+        gate_y = building_rect.bottom
+        if abs(x - gate_x) < road_margin:
+            if gate_y < main_road_y:
+                if gate_y <= y <= main_road_y:
+                    return True
+            else:
+                if main_road_y <= y <= gate_y:
+                    return True
+    return False
+
+
+class RoadGrid:
+    """The road network rasterized into a 1-bit-per-pixel occupancy mask.
+
+    Bit x of row y is set when the integer point (x, y) is on a road, so a
+    query is one bytearray lookup no matter how many buildings there are.
+    Points outside the map or with fractional coordinates fall back to the
+    exact geometric test.
+    """
+
+    def __init__(self, size, buildings, main_road_y, road_width=50, side_road_width=40, margin=0):
+        self.width, self.height = size
+        self.buildings = buildings
+        self.main_road_y = main_road_y
+        self.params = (road_width, side_road_width, margin)
+        self.stride = (self.width + 7) // 8
+        self.bits = self._rasterize()
+        # (height, stride) view of the mask for contains_many
+        self.rows = None if np is None else np.frombuffer(self.bits, np.uint8).reshape(self.height, self.stride)
+
+    def _rasterize(self):
+        w, h, stride = self.width, self.height, self.stride
+        road_width, side_road_width, margin = self.params
+        main_road_y = self.main_road_y
+        bits = bytearray(stride * h)
+        full_row = (1 << w) - 1
+        main_margin = road_width // 2 + margin
+        side_margin = side_road_width // 2 + margin
+        # Column span and row span of each vertical access road
+        spans = []
+        for b in self.buildings:
+            gate_x = b['rect'].centerx
+            gate_y = b['rect'].bottom
+            x0 = max(0, gate_x - side_margin + 1)
+            x1 = min(w - 1, gate_x + side_margin - 1)
+            if x0 > x1:
+                continue
+            cols = ((1 << (x1 - x0 + 1)) - 1) << x0
+            spans.append((min(gate_y, main_road_y), max(gate_y, main_road_y), cols))
+        for y in range(h):
+            if abs(y - main_road_y) < main_margin:
+                row = full_row
+            else:
+                row = 0
+                for y0, y1, cols in spans:
+                    if y0 <= y <= y1:
+                        row |= cols
+            if row:
+                bits[y * stride:(y + 1) * stride] = row.to_bytes(stride, 'little')
+        return bits
+
+    def contains(self, x, y):
+        if type(x) is int and type(y) is int and 0 <= x < self.width and 0 <= y < self.height:
+            return (self.bits[y * self.stride + (x >> 3)] >> (x & 7)) & 1 == 1
+        return point_on_road(x, y, self.buildings, self.main_road_y, *self.params)
+
+    def contains_many(self, points):
+        """Batch query: one bool per (x, y) in `points`, as a NumPy array.
+
+        Integer points inside the map are looked up in the mask in one go;
+        the rest take the geometric test. Without NumPy it returns a list.
+        """
+        if np is None:
+            return [self.contains(x, y) for x, y in points]
+        pts = np.asarray(points)
+        if pts.dtype.kind not in 'iu':
+            pts = pts.astype(float)
+        pts = pts.reshape(-1, 2)
+        x, y = pts[:, 0], pts[:, 1]
+        inside = (x >= 0) & (x < self.width) & (y >= 0) & (y < self.height)
+        if pts.dtype.kind == 'f':
+            inside &= (x == np.floor(x)) & (y == np.floor(y))
+        xi = x[inside].astype(np.intp)
+        yi = y[inside].astype(np.intp)
+        out = np.zeros(len(pts), bool)
+        out[inside] = (self.rows[yi, xi >> 3] >> (xi & 7)) & 1
+        for i in np.flatnonzero(~inside):
+            out[i] = point_on_road(float(x[i]), float(y[i]), self.buildings, self.main_road_y, *self.params)
+        return out
+
+
+class RoadNetwork:
+    """Lazily built RoadGrid per (road_width, side_road_width, margin) variant."""
+
+    def __init__(self, size, buildings, main_road_y):
+        self.size = size
+        self.buildings = buildings
+        self.main_road_y = main_road_y
+        self._grids = {}
+
+    def grid(self, road_width=50, side_road_width=40, margin=0):
+        key = (road_width, side_road_width, margin)
+        g = self._grids.get(key)
+        if g is None:
+            g = self._grids[key] = RoadGrid(self.size, self.buildings, self.main_road_y, *key)
+        return g
+
+    def invalidate(self):
+        """Drop every grid, e.g. after buildings were added or moved."""
+        self._grids.clear()
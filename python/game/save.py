@@ -0,0 +1,283 @@
+"""Versioned binary save files for GameState, and a background autosaver.
+
+A save is a small header (magic, format version) followed by one fixed
+struct of scalars and bitmasks and then the variable parts (upgrade levels,
+challenge progress, inventory and course strings). A fresh game is 123 bytes,
+a finished one a few hundred.
+
+snapshot() copies what a save needs into plain immutable values. It is cheap
+enough to call from the game loop; encoding and disk I/O happen later, e.g. on
+the Autosaver thread.
+"""
+import os
+import struct
+import threading
+from array import array
+
+from .actions import SCHOOLS
+from .state import GameState, TIME_PERIODS, PERIOD_INDEX
+
+MAGIC = b'FQSV'
+FORMAT_VERSION = 3
+
+HEADER = struct.Struct('<4sH')
+COUNT = struct.Struct('<H')
+CORE = struct.Struct(
+    '<'
+    'hhhhhh'  # energy, knowledge, stress, reputation, discipline, speed
+    'II'      # xp, collected_points
+    'IBHQ'    # day, time_of_day, time_tick, last_time_update
+    '?BH?'    # victory_awarded, dorm_player_state, dorm_action_timer, locker_open
+    'III'     # quest, flag and achievement bits
+    'IIIIHd'  # last_challenge_reset_day, event_cooldown, daily_streak, last_active_day, difficulty_level, stress_multiplier
+    'HI'      # meta coursesDone, booksRead
+    'IHi'     # achievement windows: coins_today, quests_today, calm_since
+)
+
+DORM_STATES = ('idle', 'sleeping', 'showering', 'studying', 'exiting')
+DORM_INDEX = {name: i for i, name in enumerate(DORM_STATES)}
+
+
+def enum_value(names, index):
+    """`names[index]` for an index read from a file; ValueError if it is out of range."""
+    if index >= len(names):
+        raise ValueError("Save file is corrupt")
+    return names[index]
+
+
+def snapshot(s):
+    """Everything a save needs from `s`, copied into immutable values."""
+    meta = s.meta
+    w = s.achievement_tracker
+    department = meta['department']
+    core = (
+        s.energy, s.knowledge, s.stress, s.reputation, s.discipline, s.speed,
+        s.xp, s.collected_points,
+        s.day, PERIOD_INDEX[s.time_of_day], s.time_tick, s.last_time_update,
+        s.victory_awarded, DORM_INDEX[s.dorm_player_state], s.dorm_action_timer, s.locker_open,
+        s.quests.bits, s.flags.bits, s.achievements.bits,
+        s.last_challenge_reset_day, s.event_cooldown, s.daily_streak, s.last_active_day,
+        s.difficulty_level, s.stress_multiplier,
+        meta['coursesDone'], meta['booksRead'],
+        w.coins_today, w.quests_today,
+        -1 if w.calm_since is None else w.calm_since,
+    )
+    strings = (
+        tuple(sorted(s.inventory)),  # Same bytes for the same state
+        meta['school'] or '',
+        department['id'] if department else '',
+        tuple(k for k, done in meta['programCourses'].items() if done),
+        tuple(k for k, done in meta['courses'].items() if done),
+    )
+    return core, bytes(s.upgrades.levels), s.daily_challenges.current.tobytes(), strings
+
+
+def pack_str(out, text):
+    data = text.encode('utf-8')
+    if len(data) > 255:
+        raise ValueError(f"String too long to save: {text[:20]}...")
+    out.append(len(data))
+    out += data
+
+
+def pack_strs(out, items):
+    out += COUNT.pack(len(items))
+    for text in items:
+        pack_str(out, text)
+
+
+def encode_snapshot(snap):
+    core, upgrades, challenges, (inventory, school, department, pcourses, courses) = snap
+    out = bytearray(HEADER.pack(MAGIC, FORMAT_VERSION))
+    out += CORE.pack(*core)
+    out.append(len(upgrades))
+    out += upgrades
+    out.append(len(challenges) // 2)
+    out += challenges
+    pack_strs(out, inventory)
+    pack_str(out, school)
+    pack_str(out, department)
+    pack_strs(out, pcourses)
+    pack_strs(out, courses)
+    return bytes(out)
+
+
+def encode(s):
+    return encode_snapshot(snapshot(s))
+
+
+class Reader:
+    __slots__ = ('data', 'pos')
+
+    def __init__(self, data, pos):
+        self.data = data
+        self.pos = pos
+
+    def take(self, n):
+        end = self.pos + n
+        if end > len(self.data):
+            raise ValueError("Save file is truncated")
+        chunk = self.data[self.pos:end]
+        self.pos = end
+        return chunk
+
+    def unpack(self, st):
+        return st.unpack(self.take(st.size))
+
+    def byte(self):
+        return self.take(1)[0]
+
+    def str(self):
+        return self.take(self.byte()).decode('utf-8')
+
+    def strs(self):
+        (n,) = self.unpack(COUNT)
+        return [self.str() for _ in range(n)]
+
+
+def decode(data, cls=GameState):
+    """Build a `cls` instance from save bytes. Raises ValueError on a bad or unknown file."""
+    if len(data) < HEADER.size:
+        raise ValueError("Not a save file")
+    magic, version = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("Not a save file")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported save format version {version}")
+
+    r = Reader(data, HEADER.size)
+    (energy, knowledge, stress, reputation, discipline, speed,
+     xp, collected_points,
+     day, time_idx, time_tick, last_time_update,
+     victory_awarded, dorm_idx, dorm_action_timer, locker_open,
+     quest_bits, flag_bits, achievement_bits,
+     last_challenge_reset_day, event_cooldown, daily_streak, last_active_day,
+     difficulty_level, stress_multiplier,
+     courses_done, books_read,
+     w_coins, w_quests, w_calm) = r.unpack(CORE)
+    upgrades = r.take(r.byte())
+    challenges = r.take(2 * r.byte())
+    inventory = r.strs()
+    school = r.str()
+    department = r.str()
+    pcourses = r.strs()
+    courses = r.strs()
+
+    s = cls()
+    s.energy, s.knowledge, s.stress = energy, knowledge, stress
+    s.reputation, s.discipline, s.speed = reputation, discipline, speed
+    s.xp, s.collected_points = xp, collected_points
+    s.day, s.time_of_day = day, enum_value(TIME_PERIODS, time_idx)
+    s.time_tick, s.last_time_update = time_tick, last_time_update
+    s.victory_awarded = victory_awarded
+    s.dorm_player_state = enum_value(DORM_STATES, dorm_idx)
+    s.dorm_action_timer, s.locker_open = dorm_action_timer, locker_open
+    s.quests.bits, s.flags.bits, s.achievements.bits = quest_bits, flag_bits, achievement_bits
+    s.last_challenge_reset_day, s.event_cooldown = last_challenge_reset_day, event_cooldown
+    s.daily_streak, s.last_active_day = daily_streak, last_active_day
+    s.difficulty_level, s.stress_multiplier = difficulty_level, stress_multiplier
+    if len(upgrades) != len(s.upgrades.levels) or len(challenges) != len(s.daily_challenges.current) * 2:
+        raise ValueError("Save file does not match this game version")
+    s.upgrades.levels[:] = upgrades
+    s.daily_challenges.current = array('H', challenges)
+    s.inventory = set(inventory)
+    s.meta = build_meta(school, department, courses_done, books_read, pcourses, courses)
+
+    w = s.achievement_tracker
+    w.coins_today, w.quests_today = w_coins, w_quests
+    w.calm_since = None if w_calm < 0 else w_calm
+    for group in ('quests', 'challenges', 'inventory'):
+        s.touch(group)
+    return s
+
+
+def build_meta(school, department, courses_done, books_read, pcourses, courses):
+    """GameState.meta from its saved parts (school and department ids, '' for none).
+
+    Raises ValueError for ids this game doesn't know.
+    """
+    meta = {
+        'school': school or None,
+        'department': None,
+        'coursesDone': courses_done,
+        'courses': dict.fromkeys(courses, True),
+        'programCourses': dict.fromkeys(pcourses, True),
+        'booksRead': books_read,
+    }
+    if school and school not in SCHOOLS:
+        raise ValueError("Save file is corrupt")
+    if department:
+        departments = SCHOOLS[school]['departments'] if school else {}
+        if department not in departments:
+            raise ValueError("Save file is corrupt")
+        name = departments[department]
+        meta['department'] = {'id': department, 'name': name, 'school': school}
+    return meta
+
+
+def write_atomic(path, data):
+    """Write `data` to `path` so a crash leaves either the old file or the new one."""
+    folder = os.path.dirname(path)
+    if folder:
+        os.makedirs(folder, exist_ok=True)
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def save(s, path):
+    write_atomic(path, encode(s))
+
+
+def load(path, cls=GameState):
+    with open(path, 'rb') as f:
+        return decode(f.read(), cls)
+
+
+class Autosaver:
+    """Writes snapshots to `path` on a background thread.
+
+    submit() only hands over the snapshot; if saves arrive faster than the
+    disk keeps up, only the newest pending one is written. close() writes
+    whatever is pending and waits for the thread.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.saves = 0
+        self.last_error = None
+        self._pending = None
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+        self._thread.start()
+
+    def submit(self, snap):
+        with self._cond:
+            self._pending = snap
+            self._cond.notify()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._pending is None and not self._closed:
+                    self._cond.wait()
+                snap, self._pending = self._pending, None
+            if snap is None:
+                return
+            try:
+                write_atomic(self.path, encode_snapshot(snap))
+                self.saves += 1
+            except (OSError, ValueError) as e:
+                self.last_error = e
+
+    def close(self, snap=None):
+        if snap is not None:
+            self.submit(snap)
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
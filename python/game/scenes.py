@@ -0,0 +1,112 @@
+"""Scene stack for the front end: campus at the bottom, city, dorm and other
+interiors pushed on top of it.
+
+A Scene is a bundle of hooks: enter() and exit() when it is pushed or popped,
+update(keys) once per sim tick while it is on top, render(surface) once per
+frame, and layers() returning the BakedLayers its render blits. Those layers
+can be baked before the scene is shown: prebake_all() does it synchronously
+(at startup), prebake(name) on a background thread, e.g. when the player
+walks up to a gate, so switching scenes never waits on a bake.
+"""
+import queue
+import threading
+
+
+def _nothing(*args):
+    return None
+
+
+def _no_layers():
+    return ()
+
+
+class Scene:
+    __slots__ = ('name', 'update', 'render', 'enter', 'exit', 'layers')
+
+    def __init__(self, name, render, update=None, enter=None, exit=None, layers=None):
+        self.name = name
+        self.render = render
+        self.update = update or _nothing
+        self.enter = enter or _nothing
+        self.exit = exit or _nothing
+        self.layers = layers or _no_layers
+
+
+class SceneStack:
+    def __init__(self):
+        self.scenes = {}
+        self.stack = []
+        self.last_error = None
+        self._queued = set()
+        self._queue = None
+        self._thread = None
+
+    def add(self, scene):
+        self.scenes[scene.name] = scene
+        return scene
+
+    @property
+    def top(self):
+        return self.stack[-1]
+
+    @property
+    def current(self):
+        """Name of the scene on top."""
+        return self.stack[-1].name
+
+    def push(self, name):
+        scene = self.scenes[name]
+        self.stack.append(scene)
+        scene.enter()
+
+    def pop(self):
+        scene = self.stack.pop()
+        scene.exit()
+        return scene
+
+    def reset(self, name):
+        """Drop every scene and start over with `name` (no exit hooks run)."""
+        self.stack = []
+        self.push(name)
+
+    def update(self, keys):
+        self.stack[-1].update(keys)
+
+    def render(self, surface):
+        self.stack[-1].render(surface)
+
+    def prebake_all(self):
+        for scene in self.scenes.values():
+            for layer in scene.layers():
+                layer.get()
+
+    def prebake(self, name):
+        """Bake scene `name`'s stale layers on the background thread."""
+        for layer in self.scenes[name].layers():
+            if layer.ready or layer in self._queued:
+                continue
+            if self._thread is None:
+                self._queue = queue.Queue()
+                self._thread = threading.Thread(target=self._run, name='prebake', daemon=True)
+                self._thread.start()
+            self._queued.add(layer)
+            self._queue.put(layer)
+
+    def _run(self):
+        while True:
+            layer = self._queue.get()
+            if layer is None:
+                return
+            try:
+                layer.get()
+            except Exception as e:
+                # Keep the worker alive; the layer is baked again on first use
+                self.last_error = e
+            finally:
+                self._queued.discard(layer)
+
+    def close(self):
+        if self._thread is not None:
+            self._queue.put(None)
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,95 @@
+import heapq
+
+
+class Job:
+    """A callback registered with a Scheduler. Keep it to cancel or postpone."""
+
+    __slots__ = ('due', 'period', 'fn', 'args', 'order', 'cancelled')
+
+    def __init__(self, due, period, fn, args, order):
+        self.due = due
+        self.period = period
+        self.fn = fn
+        self.args = args
+        self.order = order
+        self.cancelled = False
+
+
+class Scheduler:
+    """Timed callbacks on an integer tick clock, kept in a heap.
+
+    Subsystems register what they need ("at tick T", "in N ticks", "every N
+    ticks") and advance() jumps straight from one due job to the next, so
+    ticks with nothing due cost nothing and fast-forwarding is cheap. Jobs due
+    on the same tick run in the order they were registered.
+    """
+
+    def __init__(self, now=0):
+        self.now = now
+        self._heap = []
+        self._order = 0
+
+    def _push(self, job):
+        heapq.heappush(self._heap, (job.due, job.order, job))
+        return job
+
+    def at(self, tick, fn, *args):
+        """Run fn(*args) once when the clock reaches `tick`."""
+        self._order += 1
+        return self._push(Job(max(tick, self.now), None, fn, args, self._order))
+
+    def after(self, delay, fn, *args):
+        return self.at(self.now + delay, fn, *args)
+
+    def every(self, period, fn, *args, first=None):
+        """Run fn(*args) every `period` ticks, first after `first` ticks (default: one period)."""
+        if period <= 0:
+            raise ValueError("period must be positive")
+        self._order += 1
+        due = self.now + (period if first is None else first)
+        return self._push(Job(due, period, fn, args, self._order))
+
+    def cancel(self, job):
+        # Removed lazily when it reaches the top of the heap
+        job.cancelled = True
+
+    def postpone(self, job, delay):
+        """Push a pending job back by `delay` ticks."""
+        if delay <= 0:
+            return job
+        # The old heap entry no longer matches job.due and is skipped
+        job.due += delay
+        return self._push(job)
+
+    @staticmethod
+    def _stale(entry):
+        return entry[2].cancelled or entry[0] != entry[2].due
+
+    def next_due(self):
+        """Tick of the next pending job, or None."""
+        heap = self._heap
+        while heap and self._stale(heap[0]):
+            heapq.heappop(heap)
+        return heap[0][0] if heap else None
+
+    def advance(self, ticks):
+        """Move the clock `ticks` forward, running every job that falls due."""
+        target = self.now + ticks
+        heap = self._heap
+        ran = 0
+        while heap and heap[0][0] <= target:
+            entry = heapq.heappop(heap)
+            if self._stale(entry):
+                continue
+            due, _, job = entry
+            self.now = due
+            if job.period is not None:
+                job.due = due + job.period
+                heapq.heappush(heap, (job.due, job.order, job))
+            job.fn(*job.args)
+            ran += 1
+        self.now = target
+        return ran
+
+    def __len__(self):
+        return sum(1 for entry in self._heap if not self._stale(entry))
@@ -0,0 +1,67 @@
+class SpatialHash:
+    """Uniform-grid index of point entities (coins, NPCs, pickups...).
+
+    Items are bucketed by the cell their (x, y) falls in, so `query()` only
+    looks at the few cells around a point instead of every item. Items can be
+    any object (dicts included); they are tracked by identity.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self._cells = {}
+        self._where = {}
+
+    def __len__(self):
+        return len(self._where)
+
+    def __iter__(self):
+        for bucket in self._cells.values():
+            yield from bucket.values()
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def insert(self, item, x, y):
+        key = id(item)
+        if key in self._where:
+            self.remove(item)
+        cell = self._cell(x, y)
+        self._cells.setdefault(cell, {})[key] = item
+        self._where[key] = cell
+
+    def remove(self, item):
+        key = id(item)
+        cell = self._where.pop(key, None)
+        if cell is None:
+            return False
+        bucket = self._cells[cell]
+        del bucket[key]
+        if not bucket:
+            del self._cells[cell]
+        return True
+
+    def move(self, item, x, y):
+        """Update an item's position, re-bucketing it only if it changed cell."""
+        cell = self._cell(x, y)
+        if self._where.get(id(item)) != cell:
+            self.insert(item, x, y)
+
+    def query(self, x, y, radius):
+        """Yield the items in every cell touched by the square around (x, y).
+
+        This is a broad phase: callers still do the exact distance check.
+        """
+        cs = self.cell_size
+        cx0, cy0 = int((x - radius) // cs), int((y - radius) // cs)
+        cx1, cy1 = int((x + radius) // cs), int((y + radius) // cs)
+        cells = self._cells
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    # Copy so callers may remove items while iterating
+                    yield from list(bucket.values())
+
+    def clear(self):
+        self._cells.clear()
+        self._where.clear()
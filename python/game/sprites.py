@@ -0,0 +1,81 @@
+import math
+import pygame
+from pygame import Rect
+
+
+class CoinAtlas:
+    """Pre-rendered animation frames for the collectible coins.
+
+    Every frame of the glow pulse and rotating sparkles is baked once into a
+    single sheet, so drawing a coin is one blit of the right frame instead of
+    allocating glow/sparkle surfaces and calling sin/cos per coin per frame.
+
+    A coin's animation angle is `t * 2 + anim_phase`; the pulse runs at 1.5x
+    that angle, so the whole cycle repeats every 4*pi.
+    """
+
+    SIZE = 32
+    CYCLE = 4 * math.pi
+
+    def __init__(self, frames=96):
+        self.frames = frames
+        self.sheet = None
+        self.areas = [Rect(i * self.SIZE, 0, self.SIZE, self.SIZE) for i in range(frames)]
+        # Vertical float offset (pixels) for each frame
+        self.offsets = [int(math.sin(i * self.CYCLE / frames) * 3.0) for i in range(frames)]
+        self._scale = frames / self.CYCLE
+
+    def build(self):
+        sheet = pygame.Surface((self.SIZE * self.frames, self.SIZE), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            sheet = sheet.convert_alpha()
+        sheet.fill((0, 0, 0, 0))
+        c = self.SIZE // 2
+        for i in range(self.frames):
+            angle = i * self.CYCLE / self.frames
+            ox = i * self.SIZE
+            pulse = (math.sin(angle * 1.5) + 1.0) / 2.0  # 0 to 1
+
+            # Outer glow ring (animated pulsing)
+            glow_alpha = int(120 + pulse * 80)
+            glow_surf = pygame.Surface((24, 24), pygame.SRCALPHA)
+            pygame.draw.circle(glow_surf, (255, 215, 0, glow_alpha), (12, 12), int(9 + pulse * 2))
+            sheet.blit(glow_surf, (ox + c - 12, c - 12))
+
+            # Main coin body (gold with gradient)
+            pygame.draw.circle(sheet, (255, 200, 50), (ox + c, c), 8)
+            pygame.draw.circle(sheet, (255, 235, 120), (ox + c, c), 6)
+            # Inner highlight for 3D effect
+            pygame.draw.circle(sheet, (255, 255, 220), (ox + c, c - 2), 5)
+            pygame.draw.circle(sheet, (255, 255, 255), (ox + c - 1, c - 3), 2)
+            # Coin border/rim for depth
+            pygame.draw.circle(sheet, (200, 160, 40), (ox + c, c), 8, 2)
+
+            # Rotating sparkles at 90-degree intervals
+            sparkle_alpha = int(150 + pulse * 80)
+            sparkle_surf = pygame.Surface((4, 4), pygame.SRCALPHA)
+            pygame.draw.circle(sparkle_surf, (255, 255, 255, sparkle_alpha), (2, 2), 1)
+            for k in range(4):
+                a = angle + k * 1.57
+                sx = ox + c + int(math.cos(a) * 11)
+                sy = c + int(math.sin(a) * 11)
+                sheet.blit(sparkle_surf, (sx - 2, sy - 2))
+        self.sheet = sheet
+        return sheet
+
+    def frame_at(self, t, phase):
+        """Frame index for a coin with `phase` at time `t` (seconds)."""
+        return int((t * 2.0 + phase) * self._scale) % self.frames
+
+    def draw(self, surface, coins, t):
+        """Blit every (x, base_y, phase) in `coins` in a single batched call."""
+        if self.sheet is None:
+            self.build()
+        sheet, areas, offsets = self.sheet, self.areas, self.offsets
+        scale, n, half = self._scale, self.frames, self.SIZE // 2
+        base = t * 2.0 * scale
+        batch = []
+        for x, base_y, phase in coins:
+            i = int(base + phase * scale) % n
+            batch.append((sheet, (int(x) - half, int(base_y) + offsets[i] - half), areas[i]))
+        surface.blits(batch, doreturn=False)
@@ -1,13 +1,181 @@
 import random
-from .consts import MAP_H
+from operator import attrgetter
+
+from .packed import FlagSet, LevelMap, ChallengeSet
+from .achievements import AchievementTracker
+
+# Fields that caches (e.g. the HUD) watch, mapped to the group they belong to.
+# These are properties on GameState that bump the group's version when the
+# value changes; containers (inventory, quests, daily challenges) are reported
+# through touch() by the methods that mutate them.
+TRACKED_FIELDS = {
+    'day': 'clock',
+    'time_of_day': 'clock',
+    'xp': 'progress',
+    'collected_points': 'progress',
+    'daily_streak': 'progress',
+    'difficulty_level': 'progress',
+    'energy': 'stats',
+    'knowledge': 'stats',
+    'stress': 'stats',
+    'reputation': 'stats',
+    'discipline': 'stats',
+}
+# Every group, touched once when a game starts so no stamp is left at 0
+GROUPS = ('clock', 'progress', 'stats', 'inventory', 'quests', 'challenges')
+
+
+def _tracked(name, group):
+    """Property for a TRACKED_FIELDS field, stored in slot '_' + name."""
+    slot = '_' + name
+
+    def set_value(self, value):
+        if value != getattr(self, slot, None):
+            self.touch(group)
+        setattr(self, slot, value)
+
+    return property(attrgetter(slot), set_value)
+
+
+QUEST_NAMES = (
+    'firstClass',
+    'studentId',
+    'libraryVisit',
+    'timetable',
+    'eatMeal',
+    'chooseSchool',
+    'programOrientation',
+    'completeProgramCourses',
+    'chooseDepartment',
+    'completeDepartmentCourses',
+)
+FLAG_NAMES = (
+    'dormKey',
+    'firstClassBadge',
+    'libraryCard',
+    'mealCoupon',
+    'studentId',
+    'timetable',
+    'ateMeal',
+    'dormStudyDone',
+    'cityVisited',  # Has been to the city (City Explorer achievement)
+)
+ACHIEVEMENT_NAMES = (
+    'firstSteps',  # Complete first quest
+    'coinCollector',  # Collect 10 coins
+    'coinMaster',  # Collect 50 coins
+    'cityExplorer',  # Visit city for first time
+    'nightOwl',  # Complete activity at night
+    'earlyBird',  # Complete activity in morning
+    'socialButterfly',  # Reach 50 reputation
+    'scholar',  # Reach 50 knowledge
+    'zenMaster',  # Keep stress below 20 for 3 days
+    'speedDemon',  # Collect 5 coins in one day
+    'perfectDay',  # Complete all quests in one day
+    'veteran',  # Reach day 10
+)
+UPGRADE_NAMES = (
+    'speed',  # Max level 5, +1 speed per level
+    'energy_max',  # Max level 3, +10 energy per level
+    'coin_magnet',  # Max level 3, increases coin collection radius
+    'stress_resistance',  # Max level 3, reduces stress gain
+    'knowledge_boost',  # Max level 3, increases knowledge gain
+)
+
+Quests = FlagSet.schema('Quests', QUEST_NAMES)
+Flags = FlagSet.schema('Flags', FLAG_NAMES)
+Achievements = FlagSet.schema('Achievements', ACHIEVEMENT_NAMES)
+Upgrades = LevelMap.schema('Upgrades', UPGRADE_NAMES)
+DailyChallenges = ChallengeSet.schema('DailyChallenges', {
+    'collect_coins': (5, 10),  # (target, reward)
+    'visit_buildings': (3, 15),
+    'maintain_stress': (50, 20),  # Keep stress below target
+    'gain_knowledge': (10, 25),
+})
+
+
+# Periods of the day, each lasting PERIOD_TICKS game ticks
+TIME_PERIODS = ('Morning', 'Afternoon', 'Evening', 'Night')
+PERIOD_INDEX = {name: i for i, name in enumerate(TIME_PERIODS)}
+PERIOD_TICKS = 600
+
+
+class SceneState:
+    """Presentation state of the pygame front end (positions, fades).
+
+    Kept apart from GameState so headless sessions don't carry it. Which view
+    is showing is the scene stack in main.py.
+    """
+
+    __slots__ = (
+        'x', 'y', 'popup_open', 'suppress_until_exit',
+        'transition_alpha', 'city_car_positions',
+        'city_player_x', 'city_player_y', 'dorm_player_x', 'dorm_player_y',
+    )
 
-class GameState:
     def __init__(self):
         # Start player on main road (center of map vertically)
         # MAP_H = 560, so main road is at y = 280
         # PLAYER_SIZE = 22 (defined in main.py), so center player at y = 280 - 11 = 269
         self.x = 100
         self.y = 269  # Center on main road
+        self.popup_open = False
+        self.suppress_until_exit = False
+        self.transition_alpha = 0
+        self.city_car_positions = [100, 300, 500, 700, 900]  # Initial car positions
+        self.city_player_x = 600  # Start player in center of city road (SCREEN_W/2 = 600)
+        self.city_player_y = 525  # On the city road (SCREEN_H - 75 = 525)
+        self.dorm_player_x = 600  # Start player in center of dorm (SCREEN_W/2 = 600)
+        self.dorm_player_y = 500  # Start player near floor/entrance area
+
+
+class GameState:
+    """Game rules state of one session.
+
+    Compact by design so a server or simulator can hold many sessions: fixed
+    __slots__ (no per-instance __dict__), the core stats as plain slots,
+    quests/flags/achievements as bitmask FlagSets, upgrades in a bytearray
+    and challenge progress in a small array. Views and positions live in
+    SceneState.
+    """
+
+    __slots__ = (
+        'version', 'versions',
+        'speed', 'inventory', 'quests', 'flags', 'meta',
+        'time_tick', 'last_time_update',
+        'victory_awarded', 'dorm_player_state', 'dorm_action_timer', 'locker_open',
+        'achievements', 'daily_challenges', 'last_challenge_reset_day', 'upgrades',
+        'event_cooldown', 'last_active_day',
+        'stress_multiplier', 'achievement_tracker',
+        # Stats, xp, coins, clock...: the TRACKED_FIELDS properties' storage
+    ) + tuple('_' + name for name in TRACKED_FIELDS)
+
+    # Balance parameters. Class-level so a run (or a balance sweep) can
+    # override them with variant() without touching the rules below.
+    EVENT_CHANCE = 0.05  # Chance of a random event per roll
+    EVENT_COOLDOWN = 300  # Rolls skipped after an event fires
+    STREAK_BONUSES = ((7, 0.5), (3, 0.25))  # (min streak days, XP bonus)
+    UPGRADE_COSTS = {
+        'speed': [5, 10, 15, 20, 25],  # 5 levels
+        'energy_max': [10, 20, 30],  # 3 levels
+        'coin_magnet': [8, 15, 25],  # 3 levels
+        'stress_resistance': [12, 25, 40],  # 3 levels
+        'knowledge_boost': [10, 20, 30]  # 3 levels
+    }
+    # Source of randomness for events; swap for a seeded random.Random
+    rng = random
+
+    @classmethod
+    def variant(cls, **params):
+        """Subclass with some class-level parameters (EVENT_CHANCE, rng...) replaced."""
+        return type(cls.__name__, (cls,), dict(params, __slots__=()))
+
+    def __init__(self):
+        # Change tracking: `version` keeps counting across reset() so cached
+        # views never mistake a fresh game for the one they were built from
+        self.version = getattr(self, 'version', 0)
+        self.versions = {}
+
         self.speed = 3
         
         # Core stats (0-100 range)
@@ -19,28 +187,8 @@ class GameState:
         
         self.xp = 0
         self.inventory = set()
-        self.quests = {
-            'firstClass': False,
-            'studentId': False,
-            'libraryVisit': False,
-            'timetable': False,
-            'eatMeal': False,
-            'chooseSchool': False,
-            'programOrientation': False,
-            'completeProgramCourses': False,
-            'chooseDepartment': False,
-            'completeDepartmentCourses': False
-        }
-        self.flags = {
-            'dormKey': False,
-            'firstClassBadge': False,
-            'libraryCard': False,
-            'mealCoupon': False,
-            'studentId': False,
-            'timetable': False,
-            'ateMeal': False,
-            'dormStudyDone': False
-        }
+        self.quests = Quests()
+        self.flags = Flags()
         self.meta = {
             'school': None,
             'department': None,
@@ -56,59 +204,23 @@ class GameState:
         self.time_tick = 0  # Internal counter for time progression
         self.last_time_update = 0  # Track when time last updated (in game ticks)
         
-        self.popup_open = False
-        self.suppress_until_exit = False
         self.victory_awarded = False
-        self.show_city_view = False
-        self.show_dorm_interior = False
-        self.transition_alpha = 0
-        self.city_car_positions = [100, 300, 500, 700, 900]  # Initial car positions
-        self.city_player_x = 600  # Start player in center of city road (SCREEN_W/2 = 600)
-        self.city_player_y = 525  # On the city road (SCREEN_H - 75 = 525)
-        self.dorm_player_x = 600  # Start player in center of dorm (SCREEN_W/2 = 600)
-        self.dorm_player_y = 500  # Start player near floor/entrance area
         self.dorm_player_state = 'idle'  # idle, sleeping, showering, studying, exiting
         self.dorm_action_timer = 0  # Timer for actions
-        self.shower_water_particles = []  # Water particles for shower animation
         self.locker_open = False  # Track if locker is open
         self.collected_points = 0  # Track collected points/coins
         
         # Achievement system
-        self.achievements = {
-            'firstSteps': False,  # Complete first quest
-            'coinCollector': False,  # Collect 10 coins
-            'coinMaster': False,  # Collect 50 coins
-            'cityExplorer': False,  # Visit city for first time
-            'nightOwl': False,  # Complete activity at night
-            'earlyBird': False,  # Complete activity in morning
-            'socialButterfly': False,  # Reach 50 reputation
-            'scholar': False,  # Reach 50 knowledge
-            'zenMaster': False,  # Keep stress below 20 for 3 days
-            'speedDemon': False,  # Collect 5 coins in one day
-            'perfectDay': False,  # Complete all quests in one day
-            'veteran': False  # Reach day 10
-        }
+        self.achievements = Achievements()
         
         # Daily challenges
-        self.daily_challenges = {
-            'collect_coins': {'target': 5, 'current': 0, 'reward': 10},
-            'visit_buildings': {'target': 3, 'current': 0, 'reward': 15},
-            'maintain_stress': {'target': 50, 'current': 0, 'reward': 20},  # Keep stress below target
-            'gain_knowledge': {'target': 10, 'current': 0, 'reward': 25}
-        }
+        self.daily_challenges = DailyChallenges()
         self.last_challenge_reset_day = 1
         
         # Skill/Upgrade system (purchased with coins)
-        self.upgrades = {
-            'speed': 0,  # Max level 5, +1 speed per level
-            'energy_max': 0,  # Max level 3, +10 energy per level
-            'coin_magnet': 0,  # Max level 3, increases coin collection radius
-            'stress_resistance': 0,  # Max level 3, reduces stress gain
-            'knowledge_boost': 0  # Max level 3, increases knowledge gain
-        }
+        self.upgrades = Upgrades()
         
         # Random events
-        self.active_events = []  # List of active random events
         self.event_cooldown = 0  # Cooldown before next event
         
         # Streak system
@@ -119,6 +231,22 @@ class GameState:
         self.difficulty_level = 1  # Increases with progress
         self.stress_multiplier = 1.0  # Increases with difficulty
 
+        for group in GROUPS:
+            self.touch(group)
+        # Which achievement rules need re-testing, and their day windows
+        self.achievement_tracker = AchievementTracker(self)
+
+    def touch(self, group):
+        """Record that something in `group` changed."""
+        v = self.version + 1
+        self.version = v
+        self.versions[group] = v
+
+    def version_of(self, *groups):
+        """Change stamp for `groups`; it differs whenever any of them changed."""
+        versions = self.versions
+        return tuple(versions.get(g, 0) for g in groups)
+
     def reset(self):
         # Reset collectibles when resetting game
         self.__init__()
@@ -127,11 +255,27 @@ class GameState:
         self.xp += int(n)
 
     def add_item(self, name):
-        self.inventory.add(str(name))
+        name = str(name)
+        if name not in self.inventory:
+            self.inventory.add(name)
+            self.touch('inventory')
 
     def complete_quest(self, q):
         if q in self.quests and not self.quests[q]:
             self.quests[q] = True
+            self.achievement_tracker.quest_completed(self.quests.INDEX[q])
+            self.touch('quests')
+
+    def set_quest(self, q, done):
+        """Set a quest's completion directly (e.g. when restarting a track)."""
+        if q in self.quests and self.quests[q] != done:
+            self.quests[q] = done
+            self.touch('quests')
+
+    def progress_challenge(self, key, amount=1):
+        """Advance a daily challenge counter."""
+        self.daily_challenges[key]['current'] += amount
+        self.touch('challenges')
 
     def set_energy(self, v):
         self.energy = max(0, min(100, int(v)))
@@ -178,28 +322,20 @@ class GameState:
         
         # Time progression: every 600 ticks (10 seconds at 60 FPS) = advance time of day
         # This means each time period lasts 10 seconds, full day cycle = 40 seconds
+        if self.time_tick < PERIOD_TICKS:
+            return False
+        periods_passed, self.time_tick = divmod(self.time_tick, PERIOD_TICKS)
+        return self.advance_period(periods_passed)
+    
+    def advance_period(self, periods=1):
+        """Move the clock on by whole periods of the day. Returns True if the time of day changed."""
+        idx = PERIOD_INDEX[self.time_of_day] + periods
+        days_passed, new_idx = divmod(idx, len(TIME_PERIODS))
+        if days_passed:
+            self.day += days_passed
+            self.achievement_tracker.new_day()
         old_time = self.time_of_day
-        time_sequence = ['Morning', 'Afternoon', 'Evening', 'Night']
-        current_idx = time_sequence.index(self.time_of_day)
-        
-        # Calculate how many time periods have passed
-        periods_passed = self.time_tick // 600
-        
-        if periods_passed > 0:
-            # Calculate new time index
-            new_idx = (current_idx + periods_passed) % 4
-            self.time_of_day = time_sequence[new_idx]
-            
-            # Calculate days passed
-            total_periods = current_idx + periods_passed
-            days_passed = total_periods // 4
-            if days_passed > 0:
-                self.day += days_passed
-            
-            # Reset time_tick to prevent overflow (keep remainder)
-            self.time_tick = self.time_tick % 600
-        
-        # Return True if time of day changed
+        self.time_of_day = TIME_PERIODS[new_idx]
         return old_time != self.time_of_day
     
     def get_time_display(self):
@@ -264,41 +400,8 @@ class GameState:
         return all(self.quests.values())
     
     def check_achievements(self):
-        """Check and unlock achievements based on current state."""
-        # First steps
-        if not self.achievements['firstSteps'] and any(self.quests.values()):
-            self.achievements['firstSteps'] = True
-            return "Achievement Unlocked: First Steps!"
-        
-        # Coin achievements
-        if not self.achievements['coinCollector'] and self.collected_points >= 10:
-            self.achievements['coinCollector'] = True
-            return "Achievement Unlocked: Coin Collector!"
-        if not self.achievements['coinMaster'] and self.collected_points >= 50:
-            self.achievements['coinMaster'] = True
-            return "Achievement Unlocked: Coin Master!"
-        
-        # City explorer
-        if not self.achievements['cityExplorer'] and self.show_city_view:
-            self.achievements['cityExplorer'] = True
-            return "Achievement Unlocked: City Explorer!"
-        
-        # Reputation
-        if not self.achievements['socialButterfly'] and self.reputation >= 50:
-            self.achievements['socialButterfly'] = True
-            return "Achievement Unlocked: Social Butterfly!"
-        
-        # Knowledge
-        if not self.achievements['scholar'] and self.knowledge >= 50:
-            self.achievements['scholar'] = True
-            return "Achievement Unlocked: Scholar!"
-        
-        # Veteran
-        if not self.achievements['veteran'] and self.day >= 10:
-            self.achievements['veteran'] = True
-            return "Achievement Unlocked: Veteran!"
-        
-        return None
+        """Unlock achievements whose conditions changed to true. Returns all their messages."""
+        return self.achievement_tracker.check(self)
     
     def update_daily_challenges(self):
         """Reset daily challenges if new day."""
@@ -309,6 +412,7 @@ class GameState:
             self.daily_challenges['visit_buildings']['current'] = 0
             self.daily_challenges['maintain_stress']['current'] = 0
             self.daily_challenges['gain_knowledge']['current'] = 0
+            self.touch('challenges')
     
     def check_daily_challenges(self):
         """Check if daily challenges are completed and award rewards."""
@@ -316,38 +420,32 @@ class GameState:
         for challenge_key, challenge in self.daily_challenges.items():
             if challenge_key == 'maintain_stress':
                 # For stress, check if current stress is below target
-                if self.stress <= challenge['target']:
-                    challenge['current'] = 1
-                else:
-                    challenge['current'] = 0
+                met = 1 if self.stress <= challenge['target'] else 0
+                if challenge['current'] != met:
+                    challenge['current'] = met
+                    self.touch('challenges')
             elif challenge_key == 'gain_knowledge':
                 # For knowledge, track how much gained today
                 if challenge['current'] >= challenge['target']:
                     rewards.append(f"Daily Challenge Complete: {challenge_key} (+{challenge['reward']} XP)")
                     self.add_xp(challenge['reward'])
                     challenge['current'] = 0  # Reset after completion
+                    self.touch('challenges')
             else:
                 if challenge['current'] >= challenge['target']:
                     rewards.append(f"Daily Challenge Complete: {challenge_key} (+{challenge['reward']} XP)")
                     self.add_xp(challenge['reward'])
                     challenge['current'] = 0  # Reset after completion
+                    self.touch('challenges')
         return rewards
     
     def purchase_upgrade(self, upgrade_key):
         """Purchase an upgrade using coins."""
-        upgrade_costs = {
-            'speed': [5, 10, 15, 20, 25],  # 5 levels
-            'energy_max': [10, 20, 30],  # 3 levels
-            'coin_magnet': [8, 15, 25],  # 3 levels
-            'stress_resistance': [12, 25, 40],  # 3 levels
-            'knowledge_boost': [10, 20, 30]  # 3 levels
-        }
-        
         if upgrade_key not in self.upgrades:
             return False, "Invalid upgrade"
         
         current_level = self.upgrades[upgrade_key]
-        costs = upgrade_costs.get(upgrade_key, [])
+        costs = self.UPGRADE_COSTS.get(upgrade_key, [])
         
         if current_level >= len(costs):
             return False, "Upgrade maxed out"
@@ -381,10 +479,9 @@ class GameState:
     
     def get_streak_bonus(self):
         """Get XP bonus based on streak."""
-        if self.daily_streak >= 7:
-            return 0.5  # 50% bonus
-        elif self.daily_streak >= 3:
-            return 0.25  # 25% bonus
+        for min_days, bonus in self.STREAK_BONUSES:
+            if self.daily_streak >= min_days:
+                return bonus
         return 0
     
     def update_difficulty(self):
@@ -398,13 +495,13 @@ class GameState:
         self.stress_multiplier = 1.0 + (self.difficulty_level - 1) * 0.2
     
     def trigger_random_event(self):
-        """Trigger a random event based on game state."""
-        if self.event_cooldown > 0:
-            self.event_cooldown -= 1
-            return None
-        
-        # Events trigger randomly (5% chance per frame when conditions met)
-        if random.random() < 0.05:
+        """Roll for a random event based on game state.
+
+        Sets event_cooldown (in rolls) when one fires; the Simulation skips
+        that many rolls before calling this again.
+        """
+        # Events trigger randomly (EVENT_CHANCE per roll when conditions met)
+        if self.rng.random() < self.EVENT_CHANCE:
             event_types = []
             
             # Stress event (if stress is high)
@@ -423,8 +520,8 @@ class GameState:
                 event_types.append('energy_boost')
             
             if event_types:
-                event_type = random.choice(event_types)
-                self.event_cooldown = 300  # 5 seconds cooldown at 60 FPS
+                event_type = self.rng.choice(event_types)
+                self.event_cooldown = self.EVENT_COOLDOWN
                 
                 if event_type == 'stress_relief':
                     self.add_stress(-10)
@@ -433,7 +530,7 @@ class GameState:
                     self.add_knowledge(5)
                     return "Random Event: Study group session! Knowledge +5"
                 elif event_type == 'coin_bonus':
-                    bonus = random.randint(2, 5)
+                    bonus = self.rng.randint(2, 5)
                     self.collected_points += bonus
                     return f"Random Event: Found {bonus} coins on the ground!"
                 elif event_type == 'energy_boost':
@@ -441,3 +538,7 @@ class GameState:
                     return "Random Event: Energy drink found! Energy +15"
         
         return None
+
+
+for _name, _group in TRACKED_FIELDS.items():
+    setattr(GameState, _name, _tracked(_name, _group))
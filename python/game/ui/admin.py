@@ -1,4 +1,5 @@
 from ..popup import Popup
+from .. import actions
 
 
 def build_popup(h):
@@ -7,26 +8,10 @@ def build_popup(h):
     p.add_line("Complete your registration tasks.")
 
     def get_id():
-        if not s.flags['studentId']:
-            if s.energy < 10:
-                h['toast']("Too tired! Need at least 10 energy.")
-                return
-            s.flags['studentId'] = True
-            h['addItem']('Student ID Card')
-            h['addXP'](15)
-            h['addReputation'](3)  # Official student status
-            h['addEnergy'](-10)
-            h['completeQuest']('studentId')
-            h['toast']('Student ID collected (+15 XP, +3 Reputation)')
-            h['rebuild']()
+        h['act'](actions.get_student_id)
 
     def get_tt():
-        if not s.flags['timetable']:
-            s.flags['timetable'] = True
-            h['addItem']('Timetable')
-            h['completeQuest']('timetable')
-            h['toast']('Timetable collected')
-            h['rebuild']()
+        h['act'](actions.collect_timetable)
 
     p.add_button("Get Student ID (+15 XP)", get_id, primary=True, disabled=s.flags['studentId'])
     p.add_button("Collect Timetable", get_tt, primary=False, disabled=s.flags['timetable'])
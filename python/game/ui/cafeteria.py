@@ -1,4 +1,5 @@
 from ..popup import Popup
+from .. import actions
 
 
 def build_popup(h):
@@ -7,28 +8,10 @@ def build_popup(h):
     p.add_line("Grab a meal and recharge.")
 
     def get_coupon():
-        if not s.flags['mealCoupon']:
-            s.flags['mealCoupon'] = True
-            h['addItem']('Meal Coupon')
-            h['toast']('Meal coupon collected')
-            h['rebuild']()
+        h['act'](actions.get_meal_coupon)
 
     def eat():
-        if not s.flags['ateMeal'] and s.flags['mealCoupon']:
-            s.flags['ateMeal'] = True
-            h['setEnergy'](100)
-            h['addXP'](5)
-            h['addStress'](-5)  # Eating reduces stress
-            h['addReputation'](2)  # Socializing at cafeteria
-            h['completeQuest']('eatMeal')
-            h['toast']('Meal eaten (+5 XP, Energy 100, -5 Stress, +2 Reputation)')
-            h['rebuild']()
-        elif s.flags['mealCoupon'] and s.energy < 80:
-            # Can eat again if energy is low (but no quest completion)
-            h['setEnergy'](min(100, s.energy + 30))
-            h['addStress'](-3)
-            h['addReputation'](1)
-            h['toast']('Meal eaten (Energy +30, -3 Stress, +1 Reputation)')
+        h['act'](actions.eat_meal)
 
     p.add_button(
         "Get Meal Coupon",
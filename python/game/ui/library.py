@@ -1,10 +1,6 @@
 from ..popup import Popup
-
-CATEGORIES = {
-    'Engineering': ['Statics Basics', 'Digital Logic', 'Fluid Flow 101'],
-    'Science': ['Physics Primer', 'Organic Chemistry', 'Biology of Cells'],
-    'Literature': ['Poetry Classics', 'Modern Novels', 'World Myths']
-}
+from .. import actions
+from ..actions import BOOK_CATEGORIES as CATEGORIES
 
 
 def build_popup(h):
@@ -14,17 +10,7 @@ def build_popup(h):
     if not s.flags['libraryCard']:
         p.add_line("Register for a library card to access books.")
         def register():
-            if s.energy < 10:
-                h['toast']("Too tired! Need at least 10 energy.")
-                return
-            s.flags['libraryCard'] = True
-            h['addItem']('Library Card')
-            h['addXP'](20)
-            h['addReputation'](5)  # Getting library card is a responsible action
-            h['addEnergy'](-10)
-            h['completeQuest']('libraryVisit')
-            h['toast']("Library card registered (+20 XP, +5 Reputation)")
-            h['rebuild']()
+            h['act'](actions.register_library_card)
         p.add_button("Register (+20 XP)", register, primary=True)
         return p
 
@@ -32,21 +18,7 @@ def build_popup(h):
     # Only one action at a time in this compact popup; rotate categories
     def make_read(title):
         def _read():
-            if s.energy < 15:
-                h['toast']("Too tired to read! Need at least 15 energy.")
-                return
-            s.meta['booksRead'] = int(s.meta.get('booksRead', 0)) + 1
-            h['addXP'](2)
-            knowledge_gain = 6
-            # High knowledge makes reading more effective
-            if s.knowledge > 50:
-                knowledge_gain += 2
-            h['addKnowledge'](knowledge_gain)
-            h['addStress'](-2)  # Reading is relaxing
-            h['addEnergy'](-15)
-            h['addDiscipline'](2)
-            h['toast'](f'Read: {title} (+2 XP, +{knowledge_gain} Knowledge, -2 Stress)')
-            h['rebuild']()
+            h['act'](actions.read_book, title)
         return _read
 
     added = 0
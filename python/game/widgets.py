@@ -1,5 +1,7 @@
 import pygame
 from .consts import PANEL, BORDER, PRIMARY, TEXT, MUTED, WHITE
+from .fonts import render_text
+from . import overlay
 
 class Button:
     def __init__(self, rect, text, on_click=None, primary=False, disabled=False):
@@ -8,8 +10,25 @@ class Button:
         self.on_click = on_click
         self.primary = primary
         self.disabled = disabled
+        self._face = None
+        self._face_key = None
 
     def draw(self, surface, font):
+        # The button look only depends on its size, text, style and font, so
+        # it is rendered once and re-blitted until one of those changes
+        key = (self.rect.size, self.text, self.primary, self.disabled, font)
+        if key != self._face_key:
+            self._face = self._render_face(font)
+            self._face_key = key
+        surface.blit(self._face, self.rect.topleft)
+
+    def _render_face(self, font):
+        """Render shadow, background, border and label at the origin."""
+        w, h = self.rect.size
+        face = pygame.Surface((w + 2, h + 2), pygame.SRCALPHA)
+        face.fill((0, 0, 0, 0))
+        rect = pygame.Rect(0, 0, w, h)
+
         # Enhanced button styling with shadows and gradients
         if self.primary and not self.disabled:
             bg = (79, 70, 229)
@@ -28,28 +47,23 @@ class Button:
             border = BORDER
         
         # Button shadow
-        shadow_rect = pygame.Rect(self.rect.x + 2, self.rect.y + 2, self.rect.w, self.rect.h)
-        shadow_surf = pygame.Surface((self.rect.w, self.rect.h), pygame.SRCALPHA)
-        shadow_surf.fill((0, 0, 0, 40))
-        surface.blit(shadow_surf, (shadow_rect.x, shadow_rect.y), special_flags=pygame.BLEND_ALPHA_SDL2)
+        face.fill((0, 0, 0, 40), pygame.Rect(2, 2, w, h))
         
         # Main button background
-        pygame.draw.rect(surface, bg, self.rect, border_radius=10)
+        pygame.draw.rect(face, bg, rect, border_radius=10)
         
         # Top highlight for 3D effect
         if not self.disabled:
-            highlight_rect = pygame.Rect(self.rect.x, self.rect.y, self.rect.w, self.rect.h // 2)
-            highlight_surf = pygame.Surface((self.rect.w, self.rect.h // 2), pygame.SRCALPHA)
-            highlight_surf.fill((*bg_light[:3], 60))
-            surface.blit(highlight_surf, (highlight_rect.x, highlight_rect.y), special_flags=pygame.BLEND_ALPHA_SDL2)
+            highlight = overlay.tinted((w, h // 2), (*bg_light[:3], 60))
+            face.blit(highlight, (0, 0), special_flags=pygame.BLEND_ALPHA_SDL2)
         
         # Enhanced border
-        pygame.draw.rect(surface, border, self.rect, 2, border_radius=10)
+        pygame.draw.rect(face, border, rect, 2, border_radius=10)
         
         # Text with better centering and wrapping if needed
         # Check if text fits, if not, wrap it
         text_width = font.size(self.text)[0]
-        max_width = self.rect.w - 20  # Leave padding
+        max_width = w - 20  # Leave padding
         
         if text_width > max_width:
             # Wrap text - split into multiple lines
@@ -73,17 +87,18 @@ class Button:
             # Render multiple lines
             line_height = font.get_height()
             total_height = len(lines) * line_height
-            start_y = self.rect.centery - total_height // 2 + line_height // 2
+            start_y = rect.centery - total_height // 2 + line_height // 2
             
             for i, line_text in enumerate(lines):
-                label = font.render(line_text, True, fg)
-                label_rect = label.get_rect(centerx=self.rect.centerx, y=start_y + i * line_height)
-                surface.blit(label, label_rect)
+                label = render_text(font, line_text, fg)
+                label_rect = label.get_rect(centerx=rect.centerx, y=start_y + i * line_height)
+                face.blit(label, label_rect)
         else:
             # Single line - render normally
-            label = font.render(self.text, True, fg)
-            label_rect = label.get_rect(center=self.rect.center)
-            surface.blit(label, label_rect)
+            label = render_text(font, self.text, fg)
+            label_rect = label.get_rect(center=rect.center)
+            face.blit(label, label_rect)
+        return face
 
     def handle_event(self, event):
         if self.disabled:
@@ -2,13 +2,32 @@ import os
 import sys
 import random
 import math
+import hashlib
+import time
 import pygame
 from pygame import Rect
 
-from game.state import GameState
-from game.consts import SCREEN_W, SCREEN_H, MAP_W, MAP_H, HUD_W, FPS, WHITE, BLACK, SLATE, BG_TOP, GRASS1, GRASS2, ASPHALT, ASPHALT_DARK, ROAD_LINE, ROAD_EDGE, BORDER, PANEL, TEXT, MUTED, PRIMARY, SUCCESS, ENERGY_BG, ENERGY_BAR, DOOR, KNOWLEDGE_BAR, STRESS_BAR, REPUTATION_BAR, DISCIPLINE_BAR
+from game.state import GameState, SceneState
+from game.consts import SCREEN_W, SCREEN_H, MAP_W, MAP_H, HUD_W, FPS, SIM_HZ, MAX_SIM_STEPS, AUTOSAVE_SECONDS, JOURNAL_COMMIT_SECONDS, WHITE, BLACK, SLATE, BG_TOP, GRASS1, GRASS2, ASPHALT, ASPHALT_DARK, ROAD_LINE, ROAD_EDGE, BORDER, PANEL, TEXT, MUTED, PRIMARY, SUCCESS, ENERGY_BG, ENERGY_BAR, DOOR, KNOWLEDGE_BAR, STRESS_BAR, REPUTATION_BAR, DISCIPLINE_BAR
 from game.buildings import get_buildings, color_for
+from game.roads import RoadNetwork
+from game.spatial import SpatialHash
+from game.engine import Simulation
+from game import actions
+from game import save
+from game.journal import Journal
+from game.rng import RandomStreams
+from game.replay import Recorder, Replay, HeldKeys, key_mask
 from game.widgets import Button
+from game.popup import Popup
+from game.profiler import FrameProfiler
+from game.layers import BakedLayer, register as register_layer, invalidate_all as invalidate_layers
+from game.scenes import Scene, SceneStack
+from game import overlay
+from game.dirty import DirtyRects
+from game.sprites import CoinAtlas
+from game.fonts import get_font, render_text
+from game.particles import ParticlePool
 from game import ui as UI
 
 pygame.init()
@@ -17,46 +36,117 @@ SCREEN = pygame.display.set_mode((SCREEN_W, SCREEN_H))
 pygame.display.set_caption("Freshman Quest — Python Edition")
 CLOCK = pygame.time.Clock()
 
-FONT = pygame.font.SysFont("Segoe UI", 18)
-FONT_SM = pygame.font.SysFont("Segoe UI", 14)
-FONT_LG = pygame.font.SysFont("Segoe UI", 22, bold=True)
+# Opt-in dirty-rectangle presentation: only changed regions are pushed to the
+# display instead of flipping the whole window every frame.
+DIRTY_RECTS = '--dirty-rects' in sys.argv
+DIRTY = DirtyRects((SCREEN_W, SCREEN_H))
+
+# Render frame cap (--fps=N, 0 = uncapped). The simulation always steps at
+# SIM_HZ regardless of how fast frames are drawn.
+RENDER_FPS = FPS
+for _arg in sys.argv:
+    if _arg.startswith('--fps='):
+        RENDER_FPS = max(0, int(_arg.split('=', 1)[1]))
+SIM_DT = 1.0 / SIM_HZ
+
+# Input recording (--record=PATH) and replay (--replay=PATH)
+RECORD_PATH = REPLAY_PATH = None
+for _arg in sys.argv:
+    if _arg.startswith('--record='):
+        RECORD_PATH = _arg.split('=', 1)[1]
+    elif _arg.startswith('--replay='):
+        REPLAY_PATH = _arg.split('=', 1)[1]
+REPLAY = Replay.load(REPLAY_PATH) if REPLAY_PATH else None
+
+# Session seed (--seed=N); a replay brings its own
+SEED = random.SystemRandom().randrange(1 << 32)
+for _arg in sys.argv:
+    if _arg.startswith('--seed='):
+        SEED = int(_arg.split('=', 1)[1])
+if REPLAY:
+    SEED = REPLAY.seed
+# One stream per subsystem. The campus layout keeps its own fixed seeds so it
+# is the same map in every session.
+RNG = RandomStreams(SEED, pinned={'trees': 42, 'coins': 123, 'grass': 7})
+GameSession = GameState.variant(rng=RNG['events'])
+
+# Save file (--save=PATH, --no-save to play without one)
+SAVE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'saves', 'freshman.sav')
+for _arg in sys.argv:
+    if _arg.startswith('--save='):
+        SAVE_PATH = _arg.split('=', 1)[1]
+if '--no-save' in sys.argv or REPLAY:
+    SAVE_PATH = None
+# --journal: log every change next to the save instead of rewriting it whole
+JOURNAL = Journal(SAVE_PATH) if SAVE_PATH and '--journal' in sys.argv else None
+
+# F4 writes a cProfile of the next PROFILE_FRAMES frames (--profile-frames=N)
+PROFILE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'profiles')
+PROFILE_FRAMES = 300
+for _arg in sys.argv:
+    if _arg.startswith('--profile-frames='):
+        PROFILE_FRAMES = max(1, int(_arg.split('=', 1)[1]))
+
+FONT = get_font("Segoe UI", 18)
+FONT_SM = get_font("Segoe UI", 14)
+FONT_LG = get_font("Segoe UI", 22, bold=True)
 FONTS = { 'font': FONT, 'font_sm': FONT_SM, 'font_lg': FONT_LG }
 
-state = GameState()
-
-MAP_SURF = pygame.Surface((MAP_W, MAP_H), pygame.SRCALPHA)
+state = None
+if REPLAY:
+    state = save.decode(REPLAY.start_state, GameSession)
+elif JOURNAL or (SAVE_PATH and os.path.exists(SAVE_PATH)):
+    try:
+        state = JOURNAL.recover(GameSession) if JOURNAL else save.load(SAVE_PATH, GameSession)
+    except (OSError, ValueError) as e:
+        print(f"Could not load {SAVE_PATH}, starting a new game: {e}")
+if state is None:
+    state = GameSession()
+RECORDER = Recorder(RECORD_PATH, SEED, save.encode(state), SIM_HZ) if RECORD_PATH else None
+# Views, positions and fades of this front end; not part of the game rules
+scene = SceneState()
+
+
+def reset_game():
+    close_popup()
+    state.reset()
+    SIM.reset()
+    scene.__init__()
+    SCENES.reset('campus')
+
+# The campus is fully opaque, so keep it in display format for fast blits
+MAP_SURF = pygame.Surface((MAP_W, MAP_H)).convert()
 HUD_SURF = pygame.Surface((HUD_W, MAP_H), pygame.SRCALPHA)
 
 PLAYER_SIZE = 22
-player_rect = Rect(state.x, state.y, PLAYER_SIZE, PLAYER_SIZE)
+
+
+def bake_player_shadow():
+    """Soft shadow under the player sprite, fading out over its 5 rows."""
+    shadow = pygame.Surface((PLAYER_SIZE, 5), pygame.SRCALPHA)
+    for i in range(5):
+        alpha = max(0, 50 - i * 10)
+        shadow.fill((0, 0, 0, alpha), Rect(0, i, PLAYER_SIZE, 1))
+    return shadow
+
+
+PLAYER_SHADOW = bake_player_shadow()
+player_rect = Rect(scene.x, scene.y, PLAYER_SIZE, PLAYER_SIZE)
+# Position at the start of the last sim tick and how far (0-1) the renderer
+# is into the next one, for smooth drawing when frames and ticks don't align
+player_prev = player_rect.copy()
+render_alpha = 1.0
+INTERPOLATE_PLAYER = True
 
 buildings = get_buildings()
 
+# Road occupancy is rasterized once per margin variant; queries are O(1)
+ROADS = RoadNetwork((MAP_W, MAP_H), buildings, MAP_H // 2)
+
+
 def is_on_road(x, y, road_width=50, side_road_width=40, margin=0):
     """Check if a point (or player center) is on a road."""
-    main_road_y = MAP_H // 2
-    main_road_margin = road_width // 2 + margin
-    
-    # Check if on main horizontal road
-    if abs(y - main_road_y) < main_road_margin:
-        return True
-    
-    # Check if on any vertical road connecting to buildings
-    for b in buildings:
-        building_rect = b['rect']
-        gate_x = building_rect.centerx
-        gate_y = building_rect.bottom
-        
-        road_margin = side_road_width // 2 + margin
-        if abs(x - gate_x) < road_margin:
-            if gate_y < main_road_y:
-                if gate_y <= y <= main_road_y:
-                    return True
-            else:
-                if main_road_y <= y <= gate_y:
-                    return True
-    
-    return False
+    return ROADS.grid(road_width, side_road_width, margin).contains(x, y)
 
 def is_player_on_road(player_rect, road_width=50, side_road_width=40):
     """Check if player (using center point) is on a road."""
@@ -66,11 +156,11 @@ def is_player_on_road(player_rect, road_width=50, side_road_width=40):
 # Generate decor trees not overlapping buildings or roads
 # Trees must be at least 30 pixels away from any road
 TREE_POS = []
-random.seed(42)
+_rng = RNG['trees']
 for _ in range(26):
     for tries in range(100):
-        tx = random.randint(30, MAP_W - 30)
-        ty = random.randint(30, MAP_H - 30)
+        tx = _rng.randint(30, MAP_W - 30)
+        ty = _rng.randint(30, MAP_H - 30)
         pt_rect = Rect(tx-8, ty-8, 16, 16)
         # Check if tree overlaps with buildings
         if any(pt_rect.colliderect(b['rect']) for b in buildings):
@@ -78,39 +168,18 @@ for _ in range(26):
         # Check if tree is far enough from roads (30 pixel margin)
         if is_on_road(tx, ty, margin=30):
             continue
-        # Additional check: ensure tree is not near any road edge
-        main_road_y = MAP_H // 2
-        road_margin = 30
-        if abs(ty - main_road_y) < road_margin:
-            continue
-        # Check vertical roads to buildings
-        too_close_to_road = False
-        for b in buildings:
-            building_rect = b['rect']
-            gate_x = building_rect.centerx
-            if abs(tx - gate_x) < road_margin:
-                gate_y = building_rect.bottom
-                if gate_y < main_road_y:
-                    if gate_y <= ty <= main_road_y:
-                        too_close_to_road = True
-                        break
-                else:
-                    if main_road_y <= ty <= gate_y:
-                        too_close_to_road = True
-                        break
-        if not too_close_to_road:
-            TREE_POS.append((tx, ty))
-            break
+        TREE_POS.append((tx, ty))
+        break
 
 # Generate collectible coins on roads
 COLLECTIBLES = []
-random.seed(123)  # Different seed for collectibles
+_rng = RNG['coins']
 main_road_y = MAP_H // 2
 # Generate coins along main horizontal road
 for _ in range(20):
     for tries in range(30):
-        cx = random.randint(80, MAP_W - 80)
-        cy = main_road_y + random.randint(-20, 20)
+        cx = _rng.randint(80, MAP_W - 80)
+        cy = main_road_y + _rng.randint(-20, 20)
         # Ensure coin is on road
         if is_on_road(cx, cy):
             COLLECTIBLES.append({
@@ -118,7 +187,7 @@ for _ in range(20):
                 'y': cy, 
                 'base_y': cy,  # Store original Y for floating animation
                 'collected': False,
-                'anim_phase': random.uniform(0, 6.28)  # Random animation phase for variety
+                'anim_phase': _rng.uniform(0, 6.28)  # Random animation phase for variety
             })
             break
 # Generate coins on vertical roads to buildings
@@ -129,30 +198,36 @@ for b in buildings:
     if gate_y < main_road_y:
         # Building above main road
         for _ in range(3):
-            cy = random.randint(gate_y + 20, main_road_y - 20)
+            cy = _rng.randint(gate_y + 20, main_road_y - 20)
             if is_on_road(gate_x, cy):
                 COLLECTIBLES.append({
-                    'x': gate_x + random.randint(-15, 15), 
+                    'x': gate_x + _rng.randint(-15, 15), 
                     'y': cy,
                     'base_y': cy,
                     'collected': False,
-                    'anim_phase': random.uniform(0, 6.28)
+                    'anim_phase': _rng.uniform(0, 6.28)
                 })
     else:
         # Building below main road
         for _ in range(3):
-            cy = random.randint(main_road_y + 20, gate_y - 20)
+            cy = _rng.randint(main_road_y + 20, gate_y - 20)
             if is_on_road(gate_x, cy):
                 COLLECTIBLES.append({
-                    'x': gate_x + random.randint(-15, 15), 
+                    'x': gate_x + _rng.randint(-15, 15), 
                     'y': cy,
                     'base_y': cy,
                     'collected': False,
-                    'anim_phase': random.uniform(0, 6.28)
+                    'anim_phase': _rng.uniform(0, 6.28)
                 })
 
+# Uncollected coins indexed by position; collected ones are removed
+COIN_INDEX = SpatialHash(cell_size=64)
+for c in COLLECTIBLES:
+    COIN_INDEX.insert(c, c['x'], c['base_y'])
+
 # Popup state
 active_popup = None
+active_popup_key = None
 suppress_until_exit = False
 current_overlap = None
 
@@ -172,6 +247,31 @@ def toast(text, color=(30,30,30)):
         print("[Toast]", text_clean)
 
 
+# Headless rules engine driving `state`; its messages become toasts
+SIM = Simulation(state, on_message=toast)
+
+# Autosaves take a snapshot between ticks; encoding and the disk write happen
+# on the saver's thread so a frame never waits on I/O
+AUTOSAVE = save.Autosaver(SAVE_PATH) if SAVE_PATH and not JOURNAL else None
+
+
+def autosave():
+    SIM.sync()
+    AUTOSAVE.submit(save.snapshot(state))
+
+
+def commit_journal():
+    SIM.sync()
+    JOURNAL.commit()
+
+
+if AUTOSAVE:
+    SIM.clock.every(AUTOSAVE_SECONDS * SIM_HZ, autosave)
+if JOURNAL:
+    JOURNAL.attach(state)
+    SIM.clock.every(JOURNAL_COMMIT_SECONDS * SIM_HZ, commit_journal)
+
+
 def draw_grass(surface: pygame.Surface):
     """Draw grass covering the entire campus area."""
     # Fill entire surface with base grass color
@@ -188,12 +288,13 @@ def draw_grass(surface: pygame.Surface):
                 c = GRASS1
             pygame.draw.rect(surface, c, Rect(x, y, 8, 8))
     
-    # Add some random grass texture spots for realism
+    # Add some random grass texture spots for realism (same spots on every bake)
+    rng = RNG.fresh('grass')
     for _ in range(50):
-        tx = random.randint(0, MAP_W - 4)
-        ty = random.randint(0, MAP_H - 4)
+        tx = rng.randint(0, MAP_W - 4)
+        ty = rng.randint(0, MAP_H - 4)
         # Slightly darker or lighter grass patches
-        patch_color = GRASS2 if random.random() > 0.5 else (220, 245, 210)
+        patch_color = GRASS2 if rng.random() > 0.5 else (220, 245, 210)
         pygame.draw.rect(surface, patch_color, Rect(tx, ty, 4, 4))
 
 
@@ -228,7 +329,7 @@ def draw_gates(surface: pygame.Surface):
     pygame.draw.arc(surface, gate_dark, Rect(left_gate_x + 2, arch_top - 18, gate_width - 4, 36), 0, 3.14, 8)
     
     # Gate sign
-    sign_text = FONT.render("EXIT", True, BLACK)
+    sign_text = render_text(FONT, "EXIT", BLACK)
     sign_bg = Rect(left_gate_x + gate_width//2 - sign_text.get_width()//2 - 5, arch_top - 8, 
                   sign_text.get_width() + 10, sign_text.get_height() + 6)
     pygame.draw.rect(surface, WHITE, sign_bg, border_radius=3)
@@ -251,7 +352,7 @@ def draw_gates(surface: pygame.Surface):
     pygame.draw.arc(surface, gate_color, Rect(right_gate_x, arch_top - 20, gate_width, 40), 0, 3.14, 12)
     pygame.draw.arc(surface, gate_dark, Rect(right_gate_x + 2, arch_top - 18, gate_width - 4, 36), 0, 3.14, 8)
     
-    sign_text2 = FONT.render("EXIT", True, BLACK)
+    sign_text2 = render_text(FONT, "EXIT", BLACK)
     sign_bg2 = Rect(right_gate_x + gate_width//2 - sign_text2.get_width()//2 - 5, arch_top - 8, 
                    sign_text2.get_width() + 10, sign_text2.get_height() + 6)
     pygame.draw.rect(surface, WHITE, sign_bg2, border_radius=3)
@@ -278,8 +379,8 @@ def update_city_player(keys):
         vy = (dy/length) * state.speed
         
         # New position
-        new_x = state.city_player_x + vx
-        new_y = state.city_player_y + vy
+        new_x = scene.city_player_x + vx
+        new_y = scene.city_player_y + vy
         
         # Allow horizontal movement across the entire screen (to reach gates)
         new_x = clamp(new_x, 0, SCREEN_W)
@@ -287,36 +388,33 @@ def update_city_player(keys):
         # Keep player on the road (center Y should be near road center)
         road_margin = 25  # Allow some vertical movement on road
         if abs(new_y - road_center_y) <= road_margin:
-            state.city_player_x = new_x
-            state.city_player_y = new_y
+            scene.city_player_x = new_x
+            scene.city_player_y = new_y
         else:
             # Allow horizontal movement, but constrain vertical to road
-            state.city_player_x = new_x
+            scene.city_player_x = new_x
             # Snap back to road center if trying to go off road
             if new_y < road_center_y - road_margin:
-                state.city_player_y = road_center_y - road_margin
+                scene.city_player_y = road_center_y - road_margin
             elif new_y > road_center_y + road_margin:
-                state.city_player_y = road_center_y + road_margin
+                scene.city_player_y = road_center_y + road_margin
 
 
 def check_city_gate_collision():
     """Check if player collides with city gate to return to campus."""
-    if not state.show_city_view:
-        return
-    
-    px = state.city_player_x
+    px = scene.city_player_x
     road_center_y = SCREEN_H - 50
     
     # Check if player is near left gate (to return to campus)
     left_gate_x = 60  # Gate position on left
-    if px <= left_gate_x + 30 and abs(state.city_player_y - road_center_y) < 40:
-        if state.transition_alpha < 255:
+    if px <= left_gate_x + 30 and abs(scene.city_player_y - road_center_y) < 40:
+        if scene.transition_alpha < 255:
             # Continue fade transition
-            state.transition_alpha = min(255, state.transition_alpha + 20)
+            scene.transition_alpha = min(255, scene.transition_alpha + 20)
         else:
             # Transition complete, switch to campus
-            state.show_city_view = False
-            state.transition_alpha = 255  # Start fade in from black (campus will fade in)
+            SCENES.pop()
+            scene.transition_alpha = 255  # Start fade in from black (campus will fade in)
             toast("Returning to campus...")
             
             # Set campus player position at left gate
@@ -324,20 +422,20 @@ def check_city_gate_collision():
             player_rect.y = MAP_H // 2 - PLAYER_SIZE // 2
             
             # Reset city player position for next visit
-            state.city_player_x = 600
-            state.city_player_y = road_center_y
+            scene.city_player_x = 600
+            scene.city_player_y = road_center_y
             return
     
     # Check if player is near right gate (to return to campus)
     right_gate_x = SCREEN_W - 60  # Gate position on right
-    if px >= right_gate_x - 30 and abs(state.city_player_y - road_center_y) < 40:
-        if state.transition_alpha < 255:
+    if px >= right_gate_x - 30 and abs(scene.city_player_y - road_center_y) < 40:
+        if scene.transition_alpha < 255:
             # Continue fade transition
-            state.transition_alpha = min(255, state.transition_alpha + 20)
+            scene.transition_alpha = min(255, scene.transition_alpha + 20)
         else:
             # Transition complete, switch to campus
-            state.show_city_view = False
-            state.transition_alpha = 255  # Start fade in from black (campus will fade in)
+            SCENES.pop()
+            scene.transition_alpha = 255  # Start fade in from black (campus will fade in)
             toast("Returning to campus...")
             
             # Set campus player position at right gate
@@ -345,8 +443,8 @@ def check_city_gate_collision():
             player_rect.y = MAP_H // 2 - PLAYER_SIZE // 2
             
             # Reset city player position for next visit
-            state.city_player_x = 600
-            state.city_player_y = road_center_y
+            scene.city_player_x = 600
+            scene.city_player_y = road_center_y
 
 
 def draw_city_gates(surface: pygame.Surface):
@@ -370,7 +468,7 @@ def draw_city_gates(surface: pygame.Surface):
     arch_top = road_center_y - gate_height//2
     pygame.draw.arc(surface, gate_color, Rect(left_gate_x, arch_top - 15, gate_width, 30), 0, 3.14, 10)
     
-    sign_text = FONT_SM.render("CAMPUS", True, BLACK)
+    sign_text = render_text(FONT_SM, "CAMPUS", BLACK)
     sign_bg = Rect(left_gate_x + gate_width//2 - sign_text.get_width()//2 - 5, arch_top - 5, 
                   sign_text.get_width() + 10, sign_text.get_height() + 4)
     pygame.draw.rect(surface, WHITE, sign_bg, border_radius=3)
@@ -386,7 +484,7 @@ def draw_city_gates(surface: pygame.Surface):
     
     pygame.draw.arc(surface, gate_color, Rect(right_gate_x, arch_top - 15, gate_width, 30), 0, 3.14, 10)
     
-    sign_text2 = FONT_SM.render("CAMPUS", True, BLACK)
+    sign_text2 = render_text(FONT_SM, "CAMPUS", BLACK)
     sign_bg2 = Rect(right_gate_x + gate_width//2 - sign_text2.get_width()//2 - 5, arch_top - 5, 
                    sign_text2.get_width() + 10, sign_text2.get_height() + 4)
     pygame.draw.rect(surface, WHITE, sign_bg2, border_radius=3)
@@ -396,16 +494,12 @@ def draw_city_gates(surface: pygame.Surface):
 
 def draw_city_player(surface: pygame.Surface):
     """Draw player sprite in city view."""
-    px, py = state.city_player_x, state.city_player_y
+    px, py = scene.city_player_x, scene.city_player_y
     size = PLAYER_SIZE
     
     # Shadow
     shadow_rect = Rect(px - size//2 + 2, py + size//2 - 1, size - 4, 5)
-    shadow_surf = pygame.Surface((size, 5), pygame.SRCALPHA)
-    for i in range(5):
-        alpha = max(0, 50 - i * 10)
-        shadow_surf.fill((0, 0, 0, alpha), Rect(0, i, size, 1))
-    surface.blit(shadow_surf, (shadow_rect.x, shadow_rect.y))
+    surface.blit(PLAYER_SHADOW, (shadow_rect.x, shadow_rect.y))
     
     # Head
     head_radius = 8
@@ -496,7 +590,7 @@ def draw_city_player(surface: pygame.Surface):
 
 def draw_dorm_player(surface: pygame.Surface):
     """Draw player character in dorm interior view with different states."""
-    px, py = state.dorm_player_x, state.dorm_player_y
+    px, py = scene.dorm_player_x, scene.dorm_player_y
     size = PLAYER_SIZE
     player_state = state.dorm_player_state
     
@@ -530,7 +624,7 @@ def draw_dorm_player(surface: pygame.Surface):
             zzz_x = bed_center_x + 10 + i * 8
             zzz_offset = int(math.sin(current_time * 0.01 + i) * 2)
             pygame.draw.circle(surface, (200, 200, 255), (zzz_x, zzz_y + zzz_offset), 3)
-            text = FONT_SM.render("z", True, (150, 150, 200))
+            text = render_text(FONT_SM, "z", (150, 150, 200))
             surface.blit(text, (zzz_x - 3, zzz_y + zzz_offset - 8))
         
     elif player_state == 'showering':
@@ -642,11 +736,7 @@ def draw_dorm_player(surface: pygame.Surface):
         # Normal standing player (idle)
         # Enhanced shadow with blur effect
         shadow_rect = Rect(px - size//2 + 2, py + size//2 - 1, size - 4, 5)
-        shadow_surf = pygame.Surface((size, 5), pygame.SRCALPHA)
-        for i in range(5):
-            alpha = max(0, 50 - i * 10)
-            shadow_surf.fill((0, 0, 0, alpha), Rect(0, i, size, 1))
-        surface.blit(shadow_surf, (shadow_rect.x, shadow_rect.y))
+        surface.blit(PLAYER_SHADOW, (shadow_rect.x, shadow_rect.y))
         
         # Head with better proportions
         head_radius = 8
@@ -739,49 +829,59 @@ def draw_dorm_player(surface: pygame.Surface):
         pygame.draw.arc(surface, (180, 100, 100), Rect(px - 3, head_y + 2, 6, 3), 0, 3.14, 1)
 
 
-def draw_shower_water(surface: pygame.Surface, center_x: int, center_y: int):
-    """Draw animated water particles for shower effect."""
-    # Update water particles - continuously generate when showering
+SHOWER_PARTICLES = ParticlePool(512)
+SHOWER_FALL = 140  # Pixels from the shower head to where drops disappear
+SHOWER_DROP_FRAMES = 8
+SHOWER_DROP_SPRITES = None
+
+
+def bake_shower_drops():
+    """Pre-render water drops: one fade sequence per drop size (2-5 px)."""
+    sprites = []
+    for size in range(2, 6):
+        frames = []
+        for k in range(SHOWER_DROP_FRAMES):
+            # Drops fade out as they fall, same curve as the old per-drop alpha
+            fallen = SHOWER_FALL * (k + 0.5) / SHOWER_DROP_FRAMES
+            alpha = int(220 * (1 - (fallen - 10) / 130))
+            alpha = max(80, min(220, alpha))
+            water_surf = pygame.Surface((size * 2 + 2, size * 2 + 2), pygame.SRCALPHA)
+            # Water drop shape
+            pygame.draw.ellipse(water_surf, (150, 200, 255, alpha), Rect(1, 1, size * 2, size * 2))
+            # Highlight
+            pygame.draw.ellipse(water_surf, (200, 230, 255, alpha), Rect(2, 2, size, size))
+            frames.append(water_surf.convert_alpha() if pygame.display.get_surface() else water_surf)
+        sprites.append(frames)
+    return sprites
+
+
+def update_shower_water(center_x: int, center_y: int):
+    """Emit and advance the shower water particles by one tick."""
+    # Continuously generate while showering
     if state.dorm_player_state == 'showering':
-        # Always add new particles while showering
+        rng = RNG['cosmetic']
         for _ in range(5):  # More particles for better effect
-            state.shower_water_particles.append({
-                'x': center_x + random.randint(-15, 15),
-                'y': center_y - 60,  # Start from shower head
-                'speed': random.uniform(3, 6),
-                'size': random.randint(2, 5),
-                'wobble': random.uniform(-0.8, 0.8)
-            })
-    
-    # Update and draw particles
-    particles_to_remove = []
-    for i, particle in enumerate(state.shower_water_particles):
-        particle['y'] += particle['speed']
-        particle['x'] += particle['wobble']  # Sideways movement
-        
-        # Remove particles that fall too far
-        if particle['y'] > center_y + 80:
-            particles_to_remove.append(i)
-            continue
-        
-        # Draw water drop with transparency
-        alpha = int(220 * (1 - (particle['y'] - (center_y - 50)) / 130))
-        alpha = max(80, min(220, alpha))
-        water_surf = pygame.Surface((particle['size'] * 2 + 2, particle['size'] * 2 + 2), pygame.SRCALPHA)
-        # Water drop shape
-        pygame.draw.ellipse(water_surf, (150, 200, 255, alpha), 
-                           Rect(1, 1, particle['size'] * 2, particle['size'] * 2))
-        # Highlight
-        pygame.draw.ellipse(water_surf, (200, 230, 255, alpha), 
-                           Rect(2, 2, particle['size'], particle['size']))
-        surface.blit(water_surf, (int(particle['x']) - particle['size'] - 1, int(particle['y']) - particle['size'] - 1))
-    
-    # Remove old particles
-    for i in reversed(particles_to_remove):
-        state.shower_water_particles.pop(i)
-
-
-def draw_dorm_interior(surface: pygame.Surface):
+            speed = rng.uniform(3, 6)
+            SHOWER_PARTICLES.emit(
+                center_x + rng.randint(-15, 15),
+                center_y - 60,  # Start from shower head
+                rng.uniform(-0.8, 0.8),  # Sideways wobble
+                speed,
+                int(SHOWER_FALL / speed) + 1,
+                rng.randint(2, 5) - 2,
+            )
+    SHOWER_PARTICLES.update()
+
+
+def draw_shower_water(surface: pygame.Surface):
+    """Draw the shower water particles."""
+    global SHOWER_DROP_SPRITES
+    if SHOWER_DROP_SPRITES is None:
+        SHOWER_DROP_SPRITES = bake_shower_drops()
+    SHOWER_PARTICLES.draw(surface, SHOWER_DROP_SPRITES)
+
+
+def draw_dorm_room(surface: pygame.Surface):
     """Draw dormitory interior with bed, locker, shower, desk, and other dorm items."""
     global dorm_bed_rect, dorm_desk_rect, dorm_locker_rect, dorm_shower_rect, dorm_exit_door_rect
     
@@ -1044,7 +1144,7 @@ def draw_dorm_interior(surface: pygame.Surface):
     pygame.draw.circle(surface, (40, 40, 50), (handle_x, handle_y), 8, 2)
     
     # Exit label
-    exit_text = FONT.render("EXIT", True, (200, 200, 200))
+    exit_text = render_text(FONT, "EXIT", (200, 200, 200))
     text_x = exit_door_x + (exit_door_width - exit_text.get_width()) // 2
     text_y = exit_door_y + 15
     pygame.draw.rect(surface, (50, 50, 50), Rect(text_x - 5, text_y - 2, exit_text.get_width() + 10, exit_text.get_height() + 4))
@@ -1062,21 +1162,31 @@ def draw_dorm_interior(surface: pygame.Surface):
     ]
     
     for label_text, label_x, label_y in labels:
-        text_surface = FONT_SM.render(label_text, True, (100, 100, 100))
+        text_surface = render_text(FONT_SM, label_text, (100, 100, 100))
         text_rect = text_surface.get_rect(center=(label_x, label_y))
         # Background for label
         bg_rect = text_rect.inflate(10, 5)
         pygame.draw.rect(surface, (255, 255, 255, 200), bg_rect, border_radius=5)
         surface.blit(text_surface, text_rect)
+
+
+# The room only changes with the locker; it is re-baked when that does
+DORM_LAYER = register_layer(BakedLayer((SCREEN_W, SCREEN_H), draw_dorm_room))
+
+
+def dorm_layers():
+    DORM_LAYER.sync((state.locker_open, state.flags['dormKey']))
+    return (DORM_LAYER,)
+
+
+def draw_dorm_interior(surface: pygame.Surface):
+    """Draw the dorm room with the player (and shower water) in it."""
+    dorm_layers()
+    DORM_LAYER.blit_to(surface)
     
     # Draw shower water if player is showering
     if state.dorm_player_state == 'showering':
-        shower_x, shower_y = SCREEN_W - 140, 180
-        shower_width = 110
-        shower_height = 220
-        shower_center_x = shower_x + shower_width // 2
-        shower_center_y = shower_y + shower_height // 2
-        draw_shower_water(surface, shower_center_x, shower_center_y)
+        draw_shower_water(surface)
     
     # Draw player character in dorm interior
     draw_dorm_player(surface)
@@ -1084,31 +1194,12 @@ def draw_dorm_interior(surface: pygame.Surface):
 
 def update_dorm_player(keys):
     """Update player movement in dorm interior view."""
-    # Update action timer
-    if state.dorm_action_timer > 0:
-        state.dorm_action_timer -= 1
-        
-        # Handle action completion
-        if state.dorm_action_timer == 0:
-            current_state = state.dorm_player_state
-            if current_state == 'exiting':
-                # Exit dorm
-                state.show_dorm_interior = False
-                state.popup_open = False
-                state.dorm_player_state = 'idle'
-                toast("Exited dormitory")
-                return
-            elif current_state == 'sleeping':
-                # Apply sleep effects
-                state.set_energy(100)
-                stress_reduction = min(20, state.stress)
-                state.add_stress(-stress_reduction)
-                toast(f"💤 Slept! Energy restored to 100, Stress -{stress_reduction}")
-                state.dorm_player_state = 'idle'
-            elif current_state in ['showering', 'studying']:
-                # Return to idle after action
-                state.dorm_player_state = 'idle'
-    
+    if state.dorm_player_state == 'showering':
+        shower_x, shower_y = SCREEN_W - 140, 180
+        shower_width = 110
+        shower_height = 220
+        update_shower_water(shower_x + shower_width // 2, shower_y + shower_height // 2)
+
     # Only allow movement when idle
     if state.dorm_player_state != 'idle':
         return
@@ -1125,8 +1216,8 @@ def update_dorm_player(keys):
         vy = (dy/length) * state.speed
         
         # New position
-        new_x = state.dorm_player_x + vx
-        new_y = state.dorm_player_y + vy
+        new_x = scene.dorm_player_x + vx
+        new_y = scene.dorm_player_y + vy
         
         # Keep player within screen bounds (with some margin)
         margin = 20
@@ -1135,8 +1226,8 @@ def update_dorm_player(keys):
         floor_y = SCREEN_H - 150
         new_y = clamp(new_y, 100, floor_y - PLAYER_SIZE)
         
-        state.dorm_player_x = new_x
-        state.dorm_player_y = new_y
+        scene.dorm_player_x = new_x
+        scene.dorm_player_y = new_y
         
         # Check if player reached exit door (proximity check)
         exit_door_x = SCREEN_W // 2 - 60
@@ -1145,75 +1236,163 @@ def update_dorm_player(keys):
         if exit_door_rect.collidepoint(new_x, new_y):
             # Auto-exit when player reaches door
             state.dorm_player_state = 'exiting'
-            state.dorm_player_x = exit_door_x + 30
-            state.dorm_player_y = exit_door_y + 40
+            scene.dorm_player_x = exit_door_x + 30
+            scene.dorm_player_y = exit_door_y + 40
             state.dorm_action_timer = 30  # Quick exit
 
 
-def draw_city_view(surface: pygame.Surface):
-    """Draw city view with named buildings and moving cars when player reaches gate."""
-    # Update car positions for animation
-    if state.show_city_view:
-        for i in range(len(state.city_car_positions)):
-            state.city_car_positions[i] += 2  # Move cars to the right
-            if state.city_car_positions[i] > SCREEN_W + 100:
-                state.city_car_positions[i] = -100  # Reset to left side
-    
-    # Sky gradient
-    for y in range(SCREEN_H):
-        sky_color = (135 - y//8, 206 - y//8, 250 - y//8)
-        pygame.draw.line(surface, sky_color, (0, y), (SCREEN_W, y))
-    
-    # City buildings with names
-    buildings_data = [
-        {'name': 'Geda Hotel', 'x': 50, 'color': (100, 80, 80), 'height': 240, 'width': 100},
-        {'name': 'Stationary', 'x': 180, 'color': (80, 100, 80), 'height': 200, 'width': 90},
-        {'name': 'Supermarket', 'x': 300, 'color': (80, 80, 100), 'height': 220, 'width': 110},
-    ]
-    
-    for building in buildings_data:
-        building_rect = Rect(building['x'], SCREEN_H - building['height'], building['width'], building['height'])
-        # Building body
-        pygame.draw.rect(surface, building['color'], building_rect)
-        # Building border
-        pygame.draw.rect(surface, (60, 60, 60), building_rect, 2)
-        
-        # Windows
-        for wy in range(building_rect.top + 25, building_rect.bottom - 35, 30):
-            for wx in range(building_rect.left + 10, building_rect.right - 10, 25):
-                if random.random() > 0.3:  # Some windows lit
-                    window_color = (255, 255, 200) if random.random() > 0.5 else (200, 200, 150)
-                    pygame.draw.rect(surface, window_color, Rect(wx, wy, 15, 20))
-        
-        # Building name sign
-        name_text = FONT_SM.render(building['name'], True, WHITE)
-        name_bg = Rect(building_rect.centerx - name_text.get_width()//2 - 5, 
-                      building_rect.bottom - 30, name_text.get_width() + 10, name_text.get_height() + 4)
-        pygame.draw.rect(surface, (0, 0, 0, 200), name_bg, border_radius=3)
-        pygame.draw.rect(surface, WHITE, name_bg, 1, border_radius=3)
-        surface.blit(name_text, (building_rect.centerx - name_text.get_width()//2, building_rect.bottom - 28))
-    
-    # More buildings on right side
+# Window lights in the city come from a fixed seed so they stay put between
+# frames; every CITY_WINDOW_CYCLE_TICKS of game time a few windows switch on
+# or off.
+CITY_WINDOW_SEED = 2024
+CITY_WINDOW_CYCLE_TICKS = 4 * SIM_HZ  # 0 disables the slow window animation
+
+# Left-hand buildings (with name signs); city_buildings() adds the right-hand ones
+CITY_NAMED_BUILDINGS = (
+    {'name': 'Geda Hotel', 'x': 50, 'color': (100, 80, 80), 'height': 240, 'width': 100},
+    {'name': 'Stationary', 'x': 180, 'color': (80, 100, 80), 'height': 200, 'width': 90},
+    {'name': 'Supermarket', 'x': 300, 'color': (80, 80, 100), 'height': 220, 'width': 110},
+)
+
+
+def city_buildings():
+    """(rect, colour, name or None) of every city building, in drawing order."""
+    out = [(Rect(b['x'], SCREEN_H - b['height'], b['width'], b['height']), b['color'], b['name'])
+           for b in CITY_NAMED_BUILDINGS]
     building_x = SCREEN_W - 350
-    building_colors = [(90, 90, 110), (70, 70, 90), (60, 60, 80)]
-    for i, color in enumerate(building_colors):
+    for i, color in enumerate([(90, 90, 110), (70, 70, 90), (60, 60, 80)]):
         height = 180 + i * 50
         width = 70 + i * 15
-        building_rect = Rect(building_x, SCREEN_H - height, width, height)
-        pygame.draw.rect(surface, color, building_rect)
-        pygame.draw.rect(surface, (60, 60, 60), building_rect, 2)
-        # Windows
-        for wy in range(building_rect.top + 20, building_rect.bottom - 10, 30):
-            for wx in range(building_rect.left + 10, building_rect.right - 10, 25):
-                if random.random() > 0.3:
-                    window_color = (255, 255, 200) if random.random() > 0.5 else (200, 200, 150)
-                    pygame.draw.rect(surface, window_color, Rect(wx, wy, 15, 20))
+        out.append((Rect(building_x, SCREEN_H - height, width, height), color, None))
         building_x += width + 25
-    
+    return out
+
+
+def layout_city_windows():
+    """(rect, period, phase, index) of every city window.
+
+    Each window keeps its state for `period` epochs, staggered by `phase`;
+    both are fixed per window, so they are worked out once here.
+    """
+    windows = []
+    for rect, _, name in CITY_BUILDINGS:
+        top, bottom = (rect.top + 25, rect.bottom - 35) if name else (rect.top + 20, rect.bottom - 10)
+        for wy in range(top, bottom, 30):
+            for wx in range(rect.left + 10, rect.right - 10, 25):
+                index = len(windows)
+                base = random.Random(f"{CITY_WINDOW_SEED}:{index}")
+                period = base.randint(3, 12)
+                windows.append((Rect(wx, wy, 15, 20), period, base.randrange(period), index))
+    return windows
+
+
+CITY_BUILDINGS = city_buildings()
+CITY_WINDOWS = layout_city_windows()
+
+
+def city_window_color(window, epoch):
+    """Colour of a CITY_WINDOWS entry during `epoch`, or None if it is dark."""
+    _, period, phase, index = window
+    rng = random.Random(f"{CITY_WINDOW_SEED}:{index}:{(epoch + phase) // period}")
+    if rng.random() > 0.3:  # Some windows lit
+        return (255, 255, 200) if rng.random() > 0.5 else (200, 200, 150)
+    return None
+
+
+def draw_city_sky(surface: pygame.Surface):
+    """Vertical sky gradient behind the city."""
+    for y in range(SCREEN_H):
+        sky_color = (135 - y//8, 206 - y//8, 250 - y//8)
+        surface.fill(sky_color, Rect(0, y, SCREEN_W, 1))
+
+
+CITY_SKY_LAYER = register_layer(BakedLayer((SCREEN_W, SCREEN_H), draw_city_sky))
+
+
+def draw_city_front(surface: pygame.Surface):
+    """Name signs at the foot of the left-hand buildings, and the road over them."""
+    for rect, _, name in CITY_BUILDINGS:
+        if not name:
+            continue
+        name_text = render_text(FONT_SM, name, WHITE)
+        name_bg = Rect(rect.centerx - name_text.get_width()//2 - 5,
+                      rect.bottom - 30, name_text.get_width() + 10, name_text.get_height() + 4)
+        pygame.draw.rect(surface, (0, 0, 0, 200), name_bg, border_radius=3)
+        pygame.draw.rect(surface, WHITE, name_bg, 1, border_radius=3)
+        surface.blit(name_text, (rect.centerx - name_text.get_width()//2, rect.bottom - 28))
+
     # Road in city
     road_y = SCREEN_H - 100
     road_rect = Rect(0, road_y, SCREEN_W, 100)
     pygame.draw.rect(surface, ASPHALT, road_rect)
+
+
+def draw_city_buildings(surface: pygame.Surface):
+    """Building bodies and borders, without their windows."""
+    for rect, color, _ in CITY_BUILDINGS:
+        pygame.draw.rect(surface, color, rect)
+        pygame.draw.rect(surface, (60, 60, 60), rect, 2)
+
+
+def draw_city_skyline(surface: pygame.Surface):
+    """Draw the static part of the city: sky, buildings, window lights and road."""
+    epoch = CITY_SKYLINE_LAYER.key or 0
+    CITY_SKY_LAYER.blit_to(surface)
+    draw_city_buildings(surface)
+    for window in CITY_WINDOWS:
+        window_color = city_window_color(window, epoch)
+        if window_color:
+            pygame.draw.rect(surface, window_color, window[0])
+    draw_city_front(surface)
+
+
+def repaint_city_windows(surface: pygame.Surface, old_epoch):
+    """Move the baked skyline from `old_epoch` to the layer's current epoch.
+
+    Only windows that switched in between are repainted: what lies under them
+    (sky, wall, border) is redrawn clipped to the window, then the new light.
+    The signs and road that cover the lowest rows go back on top.
+    """
+    epoch = CITY_SKYLINE_LAYER.key
+    for window in CITY_WINDOWS:
+        rect, period, phase, _ = window
+        if (old_epoch + phase) // period == (epoch + phase) // period:
+            continue
+        surface.set_clip(rect)
+        CITY_SKY_LAYER.blit_to(surface, rect.topleft, rect)
+        draw_city_buildings(surface)
+        window_color = city_window_color(window, epoch)
+        if window_color:
+            surface.fill(window_color, rect)
+    surface.set_clip(None)
+    draw_city_front(surface)
+
+
+# Baked once; when the window-light epoch changes only the windows that
+# switched are repainted (see city_layers)
+CITY_SKYLINE_LAYER = register_layer(BakedLayer((SCREEN_W, SCREEN_H), draw_city_skyline))
+
+
+def update_city_cars():
+    """Move the city cars one tick to the right, wrapping around the screen."""
+    for i in range(len(scene.city_car_positions)):
+        scene.city_car_positions[i] += 2  # Move cars to the right
+        if scene.city_car_positions[i] > SCREEN_W + 100:
+            scene.city_car_positions[i] = -100  # Reset to left side
+
+
+def city_layers():
+    epoch = SIM.ticks // CITY_WINDOW_CYCLE_TICKS if CITY_WINDOW_CYCLE_TICKS else 0
+    CITY_SKYLINE_LAYER.patch(epoch, repaint_city_windows)
+    return (CITY_SKY_LAYER, CITY_SKYLINE_LAYER)
+
+
+def draw_city_view(surface: pygame.Surface):
+    """Draw city view with named buildings and moving cars when player reaches gate."""
+    # Baked sky, buildings and road; only cars, dashes and the player are live
+    city_layers()
+    CITY_SKYLINE_LAYER.blit_to(surface)
+    road_y = SCREEN_H - 100
     
     # Road center line (moving for animation effect)
     dash_length = 30
@@ -1229,7 +1408,7 @@ def draw_city_view(surface: pygame.Surface):
     
     # Moving cars on the road
     car_colors = [(200, 50, 50), (50, 50, 200), (50, 150, 50), (200, 150, 50), (150, 50, 200)]
-    for i, car_x in enumerate(state.city_car_positions[:5]):
+    for i, car_x in enumerate(scene.city_car_positions[:5]):
         if -100 <= car_x <= SCREEN_W + 100:  # Only draw if visible
             car_y = road_y + 25 + (i % 2) * 35
             car_color = car_colors[i % len(car_colors)]
@@ -1249,13 +1428,13 @@ def draw_city_view(surface: pygame.Surface):
     draw_city_player(surface)
     
     # Show hint when player is near a gate
-    px, py = state.city_player_x, state.city_player_y
+    px, py = scene.city_player_x, scene.city_player_y
     road_center_y = SCREEN_H - 50
     near_left = px < 150 and abs(py - road_center_y) < 60
     near_right = px > SCREEN_W - 150 and abs(py - road_center_y) < 60
     
     if near_left or near_right:
-        hint_text = FONT_SM.render("Returning to campus...", True, WHITE)
+        hint_text = render_text(FONT_SM, "Returning to campus...", WHITE)
         hint_bg = Rect(px - hint_text.get_width()//2 - 10, py - 40, 
                       hint_text.get_width() + 20, hint_text.get_height() + 8)
         pygame.draw.rect(surface, (0, 0, 0, 220), hint_bg, border_radius=6)
@@ -1263,14 +1442,14 @@ def draw_city_view(surface: pygame.Surface):
         surface.blit(hint_text, (px - hint_text.get_width()//2, py - 36))
     
     # Title text
-    title_text = FONT_LG.render("Welcome to the City!", True, WHITE)
+    title_text = render_text(FONT_LG, "Welcome to the City!", WHITE)
     title_bg = Rect(SCREEN_W//2 - title_text.get_width()//2 - 20, 50, 
                    title_text.get_width() + 40, title_text.get_height() + 20)
     pygame.draw.rect(surface, (0, 0, 0, 180), title_bg, border_radius=10)
     surface.blit(title_text, (SCREEN_W//2 - title_text.get_width()//2, 60))
     
     # Instructions
-    return_text = FONT_SM.render("Walk to gate to return to campus", True, WHITE)
+    return_text = render_text(FONT_SM, "Walk to gate to return to campus", WHITE)
     return_bg = Rect(SCREEN_W//2 - return_text.get_width()//2 - 20, SCREEN_H - 40, 
                     return_text.get_width() + 40, return_text.get_height() + 10)
     pygame.draw.rect(surface, (0, 0, 0, 180), return_bg, border_radius=8)
@@ -1486,7 +1665,7 @@ def draw_building(surface: pygame.Surface, b):
     
     # Building name sign
     building_name = b.get('name', 'Building')
-    name_text = FONT_SM.render(building_name, True, WHITE)
+    name_text = render_text(FONT_SM, building_name, WHITE)
     # Position name above the door or on the building front
     name_y = rect.y + 25
     name_bg = Rect(rect.centerx - name_text.get_width()//2 - 5, 
@@ -1499,59 +1678,34 @@ def draw_building(surface: pygame.Surface, b):
     surface.blit(name_text, (rect.centerx - name_text.get_width()//2, name_y))
 
 
+# Pulse/sparkle frames for the coins, baked on first use
+COIN_ATLAS = CoinAtlas()
+
+
 def draw_collectibles(surface: pygame.Surface):
     """Draw professional animated collectible coins on the roads."""
-    current_time = pygame.time.get_ticks() / 1000.0  # Time in seconds for smooth animation
-    
-    for c in COLLECTIBLES:
-        if not c['collected']:
-            # Smooth floating animation using sine wave
-            float_offset = math.sin(current_time * 2.0 + c['anim_phase']) * 3.0
-            px = int(c['x'])
-            py = int(c['base_y'] + float_offset)
-            
-            # Pulsing glow effect for better visibility
-            pulse = (math.sin(current_time * 3.0 + c['anim_phase']) + 1.0) / 2.0  # 0 to 1
-            glow_alpha = int(120 + pulse * 80)  # Varying glow intensity
-            
-            # Draw coin with professional layered effect
-            # Outer glow ring (animated pulsing)
-            glow_surf = pygame.Surface((24, 24), pygame.SRCALPHA)
-            glow_size = int(9 + pulse * 2)
-            pygame.draw.circle(glow_surf, (255, 215, 0, glow_alpha), (12, 12), glow_size)
-            surface.blit(glow_surf, (px - 12, py - 12))
-            
-            # Main coin body (gold with gradient)
-            pygame.draw.circle(surface, (255, 200, 50), (px, py), 8)
-            pygame.draw.circle(surface, (255, 235, 120), (px, py), 6)
-            
-            # Inner highlight for 3D effect
-            highlight_y = py - 2
-            pygame.draw.circle(surface, (255, 255, 220), (px, highlight_y), 5)
-            pygame.draw.circle(surface, (255, 255, 255), (px - 1, highlight_y - 1), 2)
-            
-            # Coin border/rim for depth
-            pygame.draw.circle(surface, (200, 160, 40), (px, py), 8, 2)
-            
-            # Subtle sparkle effect (rotating sparkles)
-            sparkle_angle = current_time * 2.0 + c['anim_phase']
-            for i in range(4):
-                angle = sparkle_angle + (i * 1.57)  # 4 sparkles at 90-degree intervals
-                sparkle_x = px + int(math.cos(angle) * 11)
-                sparkle_y = py + int(math.sin(angle) * 11)
-                sparkle_alpha = int(150 + pulse * 80)
-                sparkle_surf = pygame.Surface((4, 4), pygame.SRCALPHA)
-                pygame.draw.circle(sparkle_surf, (255, 255, 255, sparkle_alpha), (2, 2), 1)
-                surface.blit(sparkle_surf, (sparkle_x - 2, sparkle_y - 2))
+    # Sim time in seconds, so a replay collects coins on the same tick
+    current_time = SIM.ticks / SIM_HZ
+    COIN_ATLAS.draw(surface, ((c['x'], c['base_y'], c['anim_phase']) for c in COIN_INDEX), current_time)
 
 
-def draw_map(surface: pygame.Surface):
+def draw_static_map(surface: pygame.Surface):
+    """Draw everything on the campus that does not change between frames."""
     draw_grass(surface)
     draw_paths(surface)
     draw_gates(surface)  # Draw gates at road edges
     for b in buildings:
         draw_building(surface, b)
     draw_trees(surface)
+
+
+# Static campus (grass, roads, gates, buildings, trees) baked once and reused.
+# Call CAMPUS_LAYER.invalidate() whenever any of those change.
+CAMPUS_LAYER = register_layer(BakedLayer((MAP_W, MAP_H), draw_static_map))
+
+
+def draw_map(surface: pygame.Surface):
+    CAMPUS_LAYER.blit_to(surface)
     draw_collectibles(surface)  # Draw collectible points
 
 
@@ -1573,92 +1727,76 @@ def draw_stat_bar(surface, x, y, w, h, pct, color, bg_color=None):
     pygame.draw.rect(surface, BORDER, Rect(x, y, w, h), 1, border_radius=8)
 
 
-def draw_hud(surface: pygame.Surface):
-    surface.fill((0,0,0,0))
-    # panel base
-    pygame.draw.rect(surface, PANEL, Rect(0,0,HUD_W, MAP_H), border_radius=14)
-    pygame.draw.rect(surface, BORDER, Rect(0,0,HUD_W, MAP_H), 1, border_radius=14)
+# The HUD is split into panels that are each baked into their own surface and
+# re-rendered only when the GameState groups they show have changed.
+# Each draw function paints its panel at the origin of its section surface.
 
-    y = 12
-    title = FONT_LG.render("Freshman Quest", True, TEXT)
-    surface.blit(title, (14,y)); y += 30
+def draw_hud_header(surface: pygame.Surface):
+    title = render_text(FONT_LG, "Freshman Quest", TEXT)
+    surface.blit(title, (14, 12))
 
     # Time display
-    time_text = FONT_SM.render(state.get_time_display(), True, PRIMARY)
-    time_bg = Rect(12, y, HUD_W-24, 28)
+    time_text = render_text(FONT_SM, state.get_time_display(), PRIMARY)
+    time_bg = Rect(12, 42, HUD_W-24, 28)
     pygame.draw.rect(surface, (239, 246, 255), time_bg, border_radius=8)
     pygame.draw.rect(surface, PRIMARY, time_bg, 1, border_radius=8)
     surface.blit(time_text, (time_bg.centerx - time_text.get_width()//2, time_bg.centery - time_text.get_height()//2))
-    y += 32
 
+
+def draw_hud_stats(surface: pygame.Surface):
     # Stats panel - expanded to show all stats
-    stats_y = y
-    stats_panel_h = 240  # Increased height for all stats
-    pygame.draw.rect(surface, PANEL, Rect(12, stats_y, HUD_W-24, stats_panel_h), border_radius=12)
-    pygame.draw.rect(surface, BORDER, Rect(12, stats_y, HUD_W-24, stats_panel_h), 1, border_radius=12)
-    y += 10
+    stats_panel_h = surface.get_height()
+    pygame.draw.rect(surface, PANEL, Rect(12, 0, HUD_W-24, stats_panel_h), border_radius=12)
+    pygame.draw.rect(surface, BORDER, Rect(12, 0, HUD_W-24, stats_panel_h), 1, border_radius=12)
+    y = 10
     
     # XP and Rank
-    surface.blit(FONT_SM.render(f"XP: {state.xp}", True, TEXT), (24, y)); y += 18
-    surface.blit(FONT_SM.render(f"Rank: {state.rank_for_xp()}", True, TEXT), (24, y)); y += 18
-    surface.blit(FONT_SM.render(f"💰 Coins: {state.collected_points}", True, PRIMARY), (24, y)); y += 18
+    surface.blit(render_text(FONT_SM, f"XP: {state.xp}", TEXT), (24, y)); y += 18
+    surface.blit(render_text(FONT_SM, f"Rank: {state.rank_for_xp()}", TEXT), (24, y)); y += 18
+    surface.blit(render_text(FONT_SM, f"💰 Coins: {state.collected_points}", PRIMARY), (24, y)); y += 18
     
     # Streak display
     if state.daily_streak > 0:
         streak_text = f"🔥 Streak: {state.daily_streak} days"
         streak_color = (255, 150, 0) if state.daily_streak >= 7 else (255, 200, 100)
-        surface.blit(FONT_SM.render(streak_text, True, streak_color), (24, y)); y += 18
+        surface.blit(render_text(FONT_SM, streak_text, streak_color), (24, y)); y += 18
     
     # Difficulty level
     if state.difficulty_level > 1:
         diff_text = f"⚡ Difficulty: {state.difficulty_level}"
-        surface.blit(FONT_SM.render(diff_text, True, (255, 100, 100)), (24, y)); y += 18
+        surface.blit(render_text(FONT_SM, diff_text, (255, 100, 100)), (24, y)); y += 18
     
     y += 4
     
-    # Energy bar
-    surface.blit(FONT_SM.render("⚡ Energy:", True, TEXT), (24, y));
-    draw_stat_bar(surface, 100, y+2, HUD_W-24-100, 12, state.energy/100.0, ENERGY_BAR)
-    surface.blit(FONT_SM.render(f"{state.energy}", True, MUTED), (HUD_W-50, y)); y += 20
-    
-    # Knowledge bar
-    surface.blit(FONT_SM.render("📘 Knowledge:", True, TEXT), (24, y));
-    draw_stat_bar(surface, 100, y+2, HUD_W-24-100, 12, state.knowledge/100.0, KNOWLEDGE_BAR)
-    surface.blit(FONT_SM.render(f"{state.knowledge}", True, MUTED), (HUD_W-50, y)); y += 20
-    
-    # Stress bar
-    surface.blit(FONT_SM.render("😓 Stress:", True, TEXT), (24, y));
-    draw_stat_bar(surface, 100, y+2, HUD_W-24-100, 12, state.stress/100.0, STRESS_BAR)
-    surface.blit(FONT_SM.render(f"{state.stress}", True, MUTED), (HUD_W-50, y)); y += 20
-    
-    # Reputation bar
-    surface.blit(FONT_SM.render("🤝 Reputation:", True, TEXT), (24, y));
-    draw_stat_bar(surface, 100, y+2, HUD_W-24-100, 12, state.reputation/100.0, REPUTATION_BAR)
-    surface.blit(FONT_SM.render(f"{state.reputation}", True, MUTED), (HUD_W-50, y)); y += 20
-    
-    # Discipline bar
-    surface.blit(FONT_SM.render("🎓 Discipline:", True, TEXT), (24, y));
-    draw_stat_bar(surface, 100, y+2, HUD_W-24-100, 12, state.discipline/100.0, DISCIPLINE_BAR)
-    surface.blit(FONT_SM.render(f"{state.discipline}", True, MUTED), (HUD_W-50, y)); y += 20
-    
-    y = stats_y + stats_panel_h + 12
-
-    # Inventory panel
-    inv_h = 140
-    pygame.draw.rect(surface, PANEL, Rect(12, y, HUD_W-24, inv_h), border_radius=12)
-    pygame.draw.rect(surface, BORDER, Rect(12, y, HUD_W-24, inv_h), 1, border_radius=12)
-    surface.blit(FONT.render("Inventory", True, TEXT), (24, y+8))
-    iy = y + 36
+    for label, value, color in (
+        ("⚡ Energy:", state.energy, ENERGY_BAR),
+        ("📘 Knowledge:", state.knowledge, KNOWLEDGE_BAR),
+        ("😓 Stress:", state.stress, STRESS_BAR),
+        ("🤝 Reputation:", state.reputation, REPUTATION_BAR),
+        ("🎓 Discipline:", state.discipline, DISCIPLINE_BAR),
+    ):
+        surface.blit(render_text(FONT_SM, label, TEXT), (24, y))
+        draw_stat_bar(surface, 100, y+2, HUD_W-24-100, 12, value/100.0, color)
+        surface.blit(render_text(FONT_SM, f"{value}", MUTED), (HUD_W-50, y)); y += 20
+
+
+def draw_hud_inventory(surface: pygame.Surface):
+    inv_h = surface.get_height()
+    pygame.draw.rect(surface, PANEL, Rect(12, 0, HUD_W-24, inv_h), border_radius=12)
+    pygame.draw.rect(surface, BORDER, Rect(12, 0, HUD_W-24, inv_h), 1, border_radius=12)
+    surface.blit(render_text(FONT, "Inventory", TEXT), (24, 8))
+    iy = 36
     for item in sorted(list(state.inventory))[:8]:
-        surface.blit(FONT_SM.render(f"• {item}", True, TEXT), (24, iy)); iy += 20
-    y += inv_h + 12
+        surface.blit(render_text(FONT_SM, f"• {item}", TEXT), (24, iy)); iy += 20
+
 
+def draw_hud_challenges(surface: pygame.Surface):
     # Daily Challenges panel (compact)
-    challenges_h = 80
-    pygame.draw.rect(surface, PANEL, Rect(12, y, HUD_W-24, challenges_h), border_radius=12)
-    pygame.draw.rect(surface, BORDER, Rect(12, y, HUD_W-24, challenges_h), 1, border_radius=12)
-    surface.blit(FONT_SM.render("Daily Challenges", True, PRIMARY), (24, y+6))
-    cy = y + 24
+    challenges_h = surface.get_height()
+    pygame.draw.rect(surface, PANEL, Rect(12, 0, HUD_W-24, challenges_h), border_radius=12)
+    pygame.draw.rect(surface, BORDER, Rect(12, 0, HUD_W-24, challenges_h), 1, border_radius=12)
+    surface.blit(render_text(FONT_SM, "Daily Challenges", PRIMARY), (24, 6))
+    cy = 24
     # Show top 2 challenges
     challenge_list = [
         ('collect_coins', f"Collect {state.daily_challenges['collect_coins']['target']} coins"),
@@ -1670,15 +1808,15 @@ def draw_hud(surface: pygame.Surface):
         target = challenge.get('target', 0)
         status = f"{progress}/{target}"
         color = SUCCESS if progress >= target else TEXT
-        surface.blit(FONT_SM.render(f"• {label}: {status}", True, color), (24, cy)); cy += 16
-    y += challenges_h + 12
-
-    # Quests panel
-    quests_h = MAP_H - y - 12
-    pygame.draw.rect(surface, PANEL, Rect(12, y, HUD_W-24, quests_h), border_radius=12)
-    pygame.draw.rect(surface, BORDER, Rect(12, y, HUD_W-24, quests_h), 1, border_radius=12)
-    surface.blit(FONT.render("Quests", True, TEXT), (24, y+8))
-    qy = y + 36
+        surface.blit(render_text(FONT_SM, f"• {label}: {status}", color), (24, cy)); cy += 16
+
+
+def draw_hud_quests(surface: pygame.Surface):
+    quests_h = surface.get_height()
+    pygame.draw.rect(surface, PANEL, Rect(12, 0, HUD_W-24, quests_h), border_radius=12)
+    pygame.draw.rect(surface, BORDER, Rect(12, 0, HUD_W-24, quests_h), 1, border_radius=12)
+    surface.blit(render_text(FONT, "Quests", TEXT), (24, 8))
+    qy = 36
     for key, label in [
         ('firstClass','Attend your first class'),
         ('studentId','Get your student ID'),
@@ -1693,7 +1831,79 @@ def draw_hud(surface: pygame.Surface):
     ]:
         done = state.quests.get(key, False)
         check = '☑' if done else '☐'
-        surface.blit(FONT_SM.render(f"{check} {label}", True, (6,95,70) if done else TEXT), (24, qy)); qy += 20
+        surface.blit(render_text(FONT_SM, f"{check} {label}", (6,95,70) if done else TEXT), (24, qy)); qy += 20
+
+
+def _hud_sections():
+    """(rect, layer, watched GameState groups) for each HUD panel, top to bottom."""
+    sections = []
+    y = 0
+    for h, gap, draw_fn, groups in (
+        (74, 0, draw_hud_header, ('clock',)),
+        (240, 12, draw_hud_stats, ('progress', 'stats')),
+        (140, 12, draw_hud_inventory, ('inventory',)),
+        (80, 12, draw_hud_challenges, ('challenges',)),
+        (None, 12, draw_hud_quests, ('quests',)),
+    ):
+        if h is None:
+            h = MAP_H - y - 12
+        # The quests panel only shows if the panels above leave room for it
+        if h > 0:
+            rect = Rect(0, y, HUD_W, h)
+            sections.append((rect, BakedLayer(rect.size, draw_fn, alpha=True), groups))
+        y += h + gap
+    return sections
+
+
+HUD_SECTIONS = _hud_sections()
+_hud_composed = None
+
+
+def draw_hud(surface: pygame.Surface):
+    """Recompose the HUD from its cached panels if any of them changed.
+
+    Returns the HUD-local rects that were repainted (empty when nothing changed).
+    """
+    global _hud_composed
+    changed = []
+    for rect, layer, groups in HUD_SECTIONS:
+        layer.sync(state.version_of(*groups))
+        if layer.dirty:
+            changed.append(rect)
+    if not changed and _hud_composed is surface:
+        return []
+    surface.fill((0,0,0,0))
+    # panel base
+    pygame.draw.rect(surface, PANEL, Rect(0,0,HUD_W, MAP_H), border_radius=14)
+    pygame.draw.rect(surface, BORDER, Rect(0,0,HUD_W, MAP_H), 1, border_radius=14)
+    for rect, layer, groups in HUD_SECTIONS:
+        layer.blit_to(surface, rect.topleft)
+    _hud_composed = surface
+    return changed
+
+
+def coin_bounds(c):
+    """Map-space rect covering a coin over its whole float/glow/sparkle animation."""
+    return Rect(int(c['x']) - 16, int(c['base_y']) - 19, 32, 38)
+
+
+def mark_campus_dirty(hint_rect, hud_rects):
+    """Record the screen regions of the campus view that may have changed."""
+    ox, oy = 12, 20
+    # Shadow and hair stick out of player_rect
+    DIRTY.track('player', player_draw_rect().inflate(8, 12).move(ox, oy))
+    for i, c in enumerate(COLLECTIBLES):
+        if c['collected']:
+            DIRTY.track(('coin', i), None)
+        else:
+            # Coins animate in place, so they are repainted every frame
+            r = coin_bounds(c).move(ox, oy)
+            DIRTY.track(('coin', i), r)
+            DIRTY.mark(r)
+    DIRTY.track('hint', hint_rect)
+    # Only the HUD panels that were re-rendered this frame
+    for r in hud_rects:
+        DIRTY.mark(r.move(12 + MAP_W + 20, 20))
 
 
 def clamp(v, lo, hi):
@@ -1723,88 +1933,86 @@ dorm_shower_rect = None
 dorm_exit_door_rect = None
 
 
+POPUP_BUILDERS = {
+    'classroom': UI.classroom.build_popup,
+    'library': UI.library.build_popup,
+    'cafeteria': UI.cafeteria.build_popup,
+    'admin': UI.admin.build_popup,
+}
+
+_popup_helpers = None
+
+
+def popup_helpers():
+    """Callbacks handed to the building UIs (built once, shared by every popup)."""
+    global _popup_helpers
+    if _popup_helpers is None or _popup_helpers['state'] is not state:
+        _popup_helpers = {
+            'addXP': state.add_xp,
+            'addItem': state.add_item,
+            'completeQuest': state.complete_quest,
+            'setEnergy': state.set_energy,
+            'addEnergy': state.add_energy,
+            'addKnowledge': state.add_knowledge,
+            'addStress': state.add_stress,
+            'addReputation': state.add_reputation,
+            'addDiscipline': state.add_discipline,
+            'state': state,
+            'toast': toast,
+            'close': close_popup,
+            'rebuild': rebuild_popup,
+            'act': SIM.act
+        }
+    return _popup_helpers
+
+
 def open_popup_for(key: str):
-    global active_popup, suppress_until_exit
-    # Check if building is accessible at current time
-    if not state.can_access_building(key):
-        toast(f"{key.capitalize()} is closed at this time.")
+    global active_popup, active_popup_key, suppress_until_exit
+    # Checks opening hours, tracks the visit and toasts any achievements
+    if not SIM.visit(key):
         return
     
-    # Track building visit for daily challenge
-    if key in ['dorm', 'classroom', 'library', 'cafeteria', 'admin']:
-        state.daily_challenges['visit_buildings']['current'] += 1
-    
-    # Check achievements when visiting buildings
-    achievement_msg = state.check_achievements()
-    if achievement_msg:
-        toast(achievement_msg)
-    
-    helpers = {
-        'addXP': state.add_xp,
-        'addItem': state.add_item,
-        'completeQuest': state.complete_quest,
-        'setEnergy': state.set_energy,
-        'addEnergy': state.add_energy,
-        'addKnowledge': state.add_knowledge,
-        'addStress': state.add_stress,
-        'addReputation': state.add_reputation,
-        'addDiscipline': state.add_discipline,
-        'state': state,
-        'toast': toast,
-        'close': close_popup,
-        'rebuild': rebuild_popup
-    }
     if key == 'dorm':
         # Show dorm interior view instead of popup
-        state.show_dorm_interior = True
-        state.popup_open = True
-        suppress_until_exit = True
-        # Position player near the entrance (exit door area)
-        state.dorm_player_x = SCREEN_W // 2  # Center horizontally
-        state.dorm_player_y = SCREEN_H - 150  # Near the floor/entrance area
-        state.dorm_player_state = 'idle'  # Reset to idle
-        state.dorm_action_timer = 0
-        state.shower_water_particles = []  # Reset water particles
+        SCENES.push('dorm')
         toast("Entered dormitory - Click on items to interact")
-    elif key == 'classroom':
-        active_popup = UI.classroom.build_popup(helpers)
-    elif key == 'library':
-        active_popup = UI.library.build_popup(helpers)
-    elif key == 'cafeteria':
-        active_popup = UI.cafeteria.build_popup(helpers)
-    elif key == 'admin':
-        active_popup = UI.admin.build_popup(helpers)
+    elif key in POPUP_BUILDERS:
+        active_popup = POPUP_BUILDERS[key](popup_helpers())
+        active_popup_key = key
     else:
         return
-    state.popup_open = True
+    scene.popup_open = True
     suppress_until_exit = True
 
 
 def rebuild_popup():
-    # For UIs that want to refresh, re-open based on current_overlap
-    global current_overlap
-    if current_overlap:
-        open_popup_for(current_overlap['key'])
+    """Bring the open popup in line with the current state.
+
+    The building UI is re-declared and reconciled into the existing popup, so
+    only the lines and buttons that actually changed are re-rendered. Unlike
+    opening a building, this has no side effects (visit counter, achievements).
+    """
+    if active_popup is None or active_popup_key not in POPUP_BUILDERS:
+        return
+    if active_popup.update_from(POPUP_BUILDERS[active_popup_key](popup_helpers())):
+        # Same popup object, so sync_mode() won't notice; push it all again
+        DIRTY.request_full()
 
 
 def close_popup():
-    global active_popup
+    global active_popup, active_popup_key
     active_popup = None
-    state.popup_open = False
+    active_popup_key = None
+    scene.popup_open = False
 
 
 def draw_player(surface: pygame.Surface):
-    px, py = player_rect.centerx, player_rect.centery
+    px, py = player_draw_rect().center
     size = PLAYER_SIZE
     
     # Enhanced shadow with blur effect
     shadow_rect = Rect(px - size//2 + 2, py + size//2 - 1, size - 4, 5)
-    shadow_surf = pygame.Surface((size, 5), pygame.SRCALPHA)
-    # Create gradient shadow
-    for i in range(5):
-        alpha = max(0, 50 - i * 10)
-        shadow_surf.fill((0, 0, 0, alpha), Rect(0, i, size, 1))
-    surface.blit(shadow_surf, (shadow_rect.x, shadow_rect.y))
+    surface.blit(PLAYER_SHADOW, (shadow_rect.x, shadow_rect.y))
     
     # Head with better proportions
     head_radius = 8
@@ -1920,30 +2128,20 @@ def check_collectibles():
     base_radius = 18
     collect_radius = base_radius + (state.upgrades.get('coin_magnet', 0) * 5)
     
-    for c in COLLECTIBLES:
-        if not c['collected']:
-            # Use base_y for distance check to account for floating animation
-            current_y = c['base_y'] + math.sin(pygame.time.get_ticks() / 1000.0 * 2.0 + c['anim_phase']) * 3.0
-            dist = ((px - c['x'])**2 + (py - current_y)**2) ** 0.5
-            if dist < collect_radius:
-                c['collected'] = True
-                state.collected_points += 1
-                
-                # Apply streak bonus to XP
-                base_xp = 5
-                streak_bonus = state.get_streak_bonus()
-                xp_gain = int(base_xp * (1 + streak_bonus))
-                state.add_xp(xp_gain)
-                
-                # Update daily challenge
-                state.daily_challenges['collect_coins']['current'] += 1
-                
-                # Check achievements
-                achievement_msg = state.check_achievements()
-                if achievement_msg:
-                    toast(achievement_msg)
-                
-                toast(f"💰 Coin collected! (+{xp_gain} XP, Total: {state.collected_points} coins)")
+    # Coins float up to 3px off base_y; widen the broad phase by that much
+    t = SIM.ticks / SIM_HZ
+    offsets = COIN_ATLAS.offsets
+    r2 = collect_radius * collect_radius
+    for c in COIN_INDEX.query(px, py, collect_radius + 3):
+        # Same float offset the coin is drawn with
+        current_y = c['base_y'] + offsets[COIN_ATLAS.frame_at(t, c['anim_phase'])]
+        dx = px - c['x']
+        dy = py - current_y
+        if dx * dx + dy * dy < r2:
+            c['collected'] = True
+            COIN_INDEX.remove(c)
+            # Toasts the coin and any achievements it unlocked
+            SIM.act(actions.collect_coin)
 
 
 def update_player(keys):
@@ -1997,86 +2195,139 @@ def check_gate_collision():
     # Check collision with gates (using center point for better detection)
     px, py = player_rect.centerx, player_rect.centery
     if (left_gate_rect.collidepoint(px, py) or right_gate_rect.collidepoint(px, py)):
-        if not state.show_city_view:
+        if SCENES.current == 'campus':
             # Smooth transition to city
-            state.show_city_view = True
-            state.transition_alpha = 0  # Start fade transition
+            SCENES.push('city')
+            scene.transition_alpha = 0  # Start fade transition
+            state.flags['cityVisited'] = True
+            SIM.check_achievements()
             toast("Entering the city...")
             # Set city player position based on which gate was used
             road_center_y = SCREEN_H - 50  # City road center Y (road_y + 50)
             if left_gate_rect.collidepoint(px, py):  # Left gate
-                state.city_player_x = 150  # Start near left gate area
+                scene.city_player_x = 150  # Start near left gate area
             else:  # Right gate
-                state.city_player_x = SCREEN_W - 150  # Start near right gate area
-            state.city_player_y = road_center_y  # On the road center
+                scene.city_player_x = SCREEN_W - 150  # Start near right gate area
+            scene.city_player_y = road_center_y  # On the road center
+
+
+def update_city(keys):
+    update_city_cars()
+    update_city_player(keys)
+    check_city_gate_collision()
+
+
+# Start baking the next scene this close (px) to its gate or door
+PREBAKE_DISTANCE = 150
+
+
+def prebake_nearby():
+    """Bake the city or dorm in the background when the player walks up to it."""
+    px, py = player_rect.center
+    main_road_y = MAP_H // 2
+    if abs(py - main_road_y) < PREBAKE_DISTANCE and (px < PREBAKE_DISTANCE or px > MAP_W - PREBAKE_DISTANCE):
+        SCENES.prebake('city')
+    door = DORM_DOOR
+    if abs(px - door[0]) < PREBAKE_DISTANCE and abs(py - door[1]) < PREBAKE_DISTANCE:
+        SCENES.prebake('dorm')
+
+
+def update_campus(keys):
+    update_player(keys)  # This also checks collectibles
+    check_gate_collision()
+    prebake_nearby()
+
+
+def update_transition():
+    """Advance the city/campus fade by one tick."""
+    current = SCENES.current
+    if current == 'city':
+        # Fade in city view smoothly
+        if scene.transition_alpha < 255:
+            scene.transition_alpha = min(255, scene.transition_alpha + 15)  # Fade in speed
+    elif current == 'campus' and scene.transition_alpha > 0:
+        # Campus view - fade out transition overlay when returning
+        scene.transition_alpha = max(0, scene.transition_alpha - 20)  # Faster fade out speed
+
+
+def player_draw_rect():
+    """Campus player rect to draw: blended between the last two sim ticks."""
+    if not INTERPOLATE_PLAYER or render_alpha >= 1.0:
+        return player_rect
+    dx = player_rect.x - player_prev.x
+    dy = player_rect.y - player_prev.y
+    # Teleports (gates) snap instead of sliding across the map
+    if abs(dx) > PLAYER_SIZE or abs(dy) > PLAYER_SIZE:
+        return player_rect
+    return Rect(round(player_prev.x + dx * render_alpha), round(player_prev.y + dy * render_alpha), PLAYER_SIZE, PLAYER_SIZE)
 
 
 def render():
-    # Handle dorm interior view
-    if state.show_dorm_interior:
-        SCREEN.fill((0, 0, 0))
-        draw_dorm_interior(SCREEN)
-        return
-    
-    # Handle smooth transition
-    if state.show_city_view:
-        # Fade in city view smoothly - ensure city is always visible when show_city_view is True
-        if state.transition_alpha < 255:
-            state.transition_alpha = min(255, state.transition_alpha + 15)  # Fade in speed
-        
-        # Always draw city view when show_city_view is True
-        SCREEN.fill((0, 0, 0))
-        draw_city_view(SCREEN)
-        
-        # Apply fade transition overlay (fade from black to city view)
-        if state.transition_alpha < 255:
-            fade_overlay = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
-            fade_overlay.fill((0, 0, 0, 255 - state.transition_alpha))
-            SCREEN.blit(fade_overlay, (0, 0), special_flags=pygame.BLEND_ALPHA_SDL2)
-        return
-    
-    # Campus view - fade out transition overlay when returning
-    if state.transition_alpha > 0:
-        state.transition_alpha = max(0, state.transition_alpha - 20)  # Faster fade out speed
+    # Any switch of scene or modal layer repaints the whole window once
+    DIRTY.sync_mode((SCENES.current, id(active_popup), state.victory_awarded))
+    SCENES.render(SCREEN)
+
+
+def render_dorm(surface: pygame.Surface):
+    surface.fill((0, 0, 0))
+    draw_dorm_interior(surface)
+    DIRTY.request_full()
+
+
+def render_city(surface: pygame.Surface):
+    surface.fill((0, 0, 0))
+    draw_city_view(surface)
+    DIRTY.request_full()
     
+    # Apply fade transition overlay (fade from black to city view)
+    if scene.transition_alpha < 255:
+        overlay.fade(surface, (0, 0, 0), 255 - scene.transition_alpha)
+
+
+VICTORY_CARD = Rect((SCREEN_W-520)//2, (SCREEN_H-220)//2, 520, 220)
+# Kept across frames so its face is rendered once
+VICTORY_BUTTON = Button(Rect(VICTORY_CARD.x+18, VICTORY_CARD.y+140, 150, 38), "Play Again", on_click=reset_game, primary=True)
+
+
+def render_campus(surface: pygame.Surface):
     # Clear screen completely first
-    SCREEN.fill(BG_TOP)
+    surface.fill(BG_TOP)
     
-    # Draw campus map
-    MAP_SURF.fill((0,0,0,0))
+    # Draw campus map (the baked background covers the whole surface)
     draw_map(MAP_SURF)
     draw_player(MAP_SURF)
 
-    # Draw HUD
-    HUD_SURF.fill((0,0,0,0))
-    draw_hud(HUD_SURF)
+    # Draw HUD (only repainted when the state it shows changed)
+    hud_rects = draw_hud(HUD_SURF)
 
     # Blit map and hud to screen
-    SCREEN.blit(MAP_SURF, (12, 20))
-    SCREEN.blit(HUD_SURF, (12 + MAP_W + 20, 20))
+    surface.blit(MAP_SURF, (12, 20))
+    surface.blit(HUD_SURF, (12 + MAP_W + 20, 20))
     
     # Apply fade transition overlay when returning to campus (fades from black to campus)
     # Only show overlay if there's actually a transition happening
-    if state.transition_alpha > 0:
-        fade_overlay = pygame.Surface((SCREEN_W, SCREEN_H))
-        fade_overlay.fill((0, 0, 0))
-        fade_overlay.set_alpha(state.transition_alpha)
-        SCREEN.blit(fade_overlay, (0, 0))
+    if scene.transition_alpha > 0:
+        overlay.fade(surface, (0, 0, 0), scene.transition_alpha)
+        DIRTY.request_full()
 
     # interact hint
-    if current_overlap and not state.popup_open:
+    hint_rect = None
+    if current_overlap and not scene.popup_open:
         bx = 12 + current_overlap['rect'].x + current_overlap['rect'].w//2
         by = 20 + current_overlap['rect'].y - 12
-        tip = FONT_SM.render("Press E or Click", True, WHITE)
+        tip = render_text(FONT_SM, "Press E or Click", WHITE)
         pad = 6
         bg_rect = Rect(bx - tip.get_width()//2 - pad, by - tip.get_height()//2 - pad, tip.get_width()+pad*2, tip.get_height()+pad*2)
-        pygame.draw.rect(SCREEN, BLACK, bg_rect, border_radius=12)
-        SCREEN.blit(tip, (bg_rect.x+pad, bg_rect.y+pad))
+        pygame.draw.rect(surface, BLACK, bg_rect, border_radius=12)
+        surface.blit(tip, (bg_rect.x+pad, bg_rect.y+pad))
+        hint_rect = bg_rect
+
+    if DIRTY_RECTS:
+        mark_campus_dirty(hint_rect, hud_rects)
 
     # popup
     if active_popup:
-        from game.popup import Popup  # noqa: F401 (ensures class available)
-        active_popup.draw(SCREEN, FONTS, (SCREEN_W, SCREEN_H))
+        active_popup.draw(surface, FONTS, (SCREEN_W, SCREEN_H))
 
     # victory overlay
     if state.all_quests_done() and not state.victory_awarded:
@@ -2084,21 +2335,18 @@ def render():
         toast("Victory! +100 XP")
         state.add_xp(100)
     if state.victory_awarded:
-        overlay = pygame.Surface((SCREEN_W, SCREEN_H), pygame.SRCALPHA)
-        overlay.fill((15,23,42,160))
-        SCREEN.blit(overlay, (0,0))
-        card = Rect((SCREEN_W-520)//2, (SCREEN_H-220)//2, 520, 220)
-        pygame.draw.rect(SCREEN, PANEL, card, border_radius=16)
-        pygame.draw.rect(SCREEN, BORDER, card, 1, border_radius=16)
-        SCREEN.blit(FONT_LG.render("Freshman Master Badge Earned!", True, TEXT), (card.x+18, card.y+16))
-        SCREEN.blit(FONT.render("All orientation tasks completed. +100 XP", True, MUTED), (card.x+18, card.y+58))
-        btn = Button(Rect(card.x+18, card.y+140, 150, 38), "Play Again", on_click=lambda: state.reset(), primary=True)
-        btn.draw(SCREEN, FONT)
+        surface.blit(overlay.tinted((SCREEN_W, SCREEN_H), (15,23,42,160)), (0,0))
+        card = VICTORY_CARD
+        pygame.draw.rect(surface, PANEL, card, border_radius=16)
+        pygame.draw.rect(surface, BORDER, card, 1, border_radius=16)
+        surface.blit(render_text(FONT_LG, "Freshman Master Badge Earned!", TEXT), (card.x+18, card.y+16))
+        surface.blit(render_text(FONT, "All orientation tasks completed. +100 XP", MUTED), (card.x+18, card.y+58))
+        VICTORY_BUTTON.draw(surface, FONT)
 
 
 def check_dorm_proximity():
     """Check if player is near any interactable item in dorm."""
-    px, py = state.dorm_player_x, state.dorm_player_y
+    px, py = scene.dorm_player_x, scene.dorm_player_y
     proximity_radius = 50  # Distance to trigger interaction
     
     # Check bed proximity
@@ -2139,260 +2387,64 @@ def check_dorm_proximity():
     return None
 
 
+# Dorm interior: what each item does and where the player goes meanwhile
+DORM_ACTIONS = {
+    'bed': actions.go_to_bed,
+    'shower': actions.take_shower,
+    'locker': actions.use_locker,
+    'desk': actions.study_at_desk,
+    'exit': actions.leave_dorm,
+}
+DORM_SPOTS = {
+    'sleeping': (80 + 70, SCREEN_H - 220 + 65),  # Bed center
+    'showering': (SCREEN_W - 140 + 55, 180 + 110),  # Shower center
+    'studying': (SCREEN_W - 380 + 100, SCREEN_H - 180 + 30),  # Chair position
+    'exiting': (SCREEN_W // 2, SCREEN_H - 100),  # Exit door
+}
+
+
+def use_dorm_item(item):
+    """Run the dorm action for `item` and place the player for it."""
+    msg = SIM.act(DORM_ACTIONS[item])
+    spot = DORM_SPOTS.get(state.dorm_player_state)
+    if spot:
+        scene.dorm_player_x, scene.dorm_player_y = spot
+    if item == 'shower' and state.dorm_player_state == 'showering':
+        SHOWER_PARTICLES.clear()  # Reset water particles
+    return msg
+
+
 def handle_dorm_interior_enter():
     """Handle Enter key press in dorm interior - interact with nearest item."""
     item = check_dorm_proximity()
-    
-    if item == 'bed':
-        # Sleep when Enter pressed near bed
-        if state.energy < 100 or state.stress > 0:
-            state.dorm_player_state = 'sleeping'
-            state.dorm_player_x = 80 + 70  # Bed center
-            state.dorm_player_y = SCREEN_H - 220 + 65  # Bed center
-            state.dorm_action_timer = 180  # 3 seconds
-            # Award points for sleeping
-            state.add_xp(5)
-            state.collected_points += 2
-            toast("💤 Going to sleep... (+5 XP, +2 coins)")
-        else:
-            toast("You're already well-rested!")
-    
-    elif item == 'shower':
-        # Start showering when Enter pressed near shower
-        if state.energy < 5:
-            toast("Too tired to shower! Need at least 5 energy.")
-            return
-        
-        state.dorm_player_state = 'showering'
-        state.dorm_player_x = SCREEN_W - 140 + 55  # Shower center
-        state.dorm_player_y = 180 + 110  # Shower center
-        state.dorm_action_timer = 120  # 2 seconds
-        state.shower_water_particles = []  # Reset water particles
-        state.add_stress(-10)
-        state.add_energy(-5)
-        # Award points for showering
-        state.add_xp(3)
-        state.collected_points += 1
-        toast("🚿 Showering... Stress -10, Energy -5 (+3 XP, +1 coin)")
-    
-    elif item == 'locker':
-        # Open locker when Enter pressed near it
-        if not state.locker_open:
-            state.locker_open = True
-            if not state.flags['dormKey']:
-                state.flags['dormKey'] = True
-                state.add_item('Dorm Key')
-                # Award points for getting key
-                state.add_xp(10)
-                state.collected_points += 3
-                toast("🔑 Locker opened! Dorm Key collected! (+10 XP, +3 coins)")
-            else:
-                # Still award small points for opening
-                state.add_xp(1)
-                state.collected_points += 1
-                toast("🔑 Locker opened (empty) (+1 XP, +1 coin)")
-        else:
-            state.locker_open = False
-            toast("🔒 Locker closed")
-    
-    elif item == 'desk':
-        # Study when Enter pressed near desk - player sits
-        if state.energy < 20:
-            toast("Too tired to study! Need at least 20 energy.")
-            return
-        
-        state.dorm_player_state = 'studying'
-        state.dorm_player_x = SCREEN_W - 380 + 100  # Desk center
-        state.dorm_player_y = SCREEN_H - 180 + 30  # Chair position
-        state.dorm_action_timer = 180  # 3 seconds
-        
-        if not state.flags['dormStudyDone']:
-            state.flags['dormStudyDone'] = True
-            knowledge_gain = 8
-            stress_gain = 3
-            energy_cost = 15
-            
-            if state.stress > 70:
-                knowledge_gain = int(knowledge_gain * 0.7)
-            
-            state.add_xp(10)
-            state.add_knowledge(knowledge_gain)
-            state.add_stress(stress_gain)
-            state.add_energy(-energy_cost)
-            state.add_discipline(2)
-            # Award coins for studying
-            state.collected_points += 5
-            toast(f"📚 Studying... +10 XP, +{knowledge_gain} Knowledge, +5 coins")
-        else:
-            if state.energy < 15:
-                toast("Too tired to study! Need at least 15 energy.")
-                state.dorm_player_state = 'idle'
-                return
-            knowledge_gain = 5
-            stress_gain = 2
-            energy_cost = 15
-            if state.stress > 70:
-                knowledge_gain = int(knowledge_gain * 0.7)
-            state.add_xp(5)
-            state.add_knowledge(knowledge_gain)
-            state.add_stress(stress_gain)
-            state.add_energy(-energy_cost)
-            state.add_discipline(1)
-            # Award coins for studying
-            state.collected_points += 3
-            toast(f"📚 Studying... +5 XP, +{knowledge_gain} Knowledge, +3 coins")
-    
-    elif item == 'exit':
-        # Exit when Enter pressed near exit door
-        state.dorm_player_state = 'exiting'
-        state.dorm_player_x = SCREEN_W // 2
-        state.dorm_player_y = SCREEN_H - 100
-        state.dorm_action_timer = 60  # 1 second at 60 FPS
-        toast("Exiting dormitory...")
+    if item in DORM_ACTIONS:
+        use_dorm_item(item)
 
 
 def handle_dorm_interior_click(mx, my):
     """Handle clicks in dorm interior view."""
-    global dorm_bed_rect, dorm_desk_rect, dorm_locker_rect, dorm_shower_rect, dorm_exit_door_rect
-    
-    helpers = {
-        'addXP': state.add_xp,
-        'addItem': state.add_item,
-        'completeQuest': state.complete_quest,
-        'setEnergy': state.set_energy,
-        'addEnergy': state.add_energy,
-        'addKnowledge': state.add_knowledge,
-        'addStress': state.add_stress,
-        'addReputation': state.add_reputation,
-        'addDiscipline': state.add_discipline,
-        'state': state,
-        'toast': toast,
-        'close': close_popup,
-        'rebuild': rebuild_popup
-    }
-    
-    # Check exit door - player moves to exit and then exits
-    if dorm_exit_door_rect and dorm_exit_door_rect.collidepoint(mx, my):
-        # Set player to exit state and position
-        state.dorm_player_state = 'exiting'
-        state.dorm_player_x = SCREEN_W // 2
-        state.dorm_player_y = SCREEN_H - 100
-        state.dorm_action_timer = 60  # 1 second at 60 FPS
-        toast("Exiting dormitory...")
-        return True
-    
-    # Check bed (sleep) - player goes to bed and sleeps
-    if dorm_bed_rect and dorm_bed_rect.collidepoint(mx, my):
-        if state.energy < 100 or state.stress > 0:
-            # Set player to sleeping state
-            state.dorm_player_state = 'sleeping'
-            state.dorm_player_x = 80 + 70  # Bed center (updated coordinates)
-            state.dorm_player_y = SCREEN_H - 220 + 65  # Bed center
-            state.dorm_action_timer = 180  # 3 seconds
-            # Award points for sleeping
-            state.add_xp(5)
-            state.collected_points += 2
-            toast("💤 Going to sleep... (+5 XP, +2 coins)")
-        else:
-            toast("You're already well-rested!")
-        return True
-    
-    # Check desk (study) - player sits at desk and studies
-    if dorm_desk_rect and dorm_desk_rect.collidepoint(mx, my):
-        if state.energy < 20:
-            toast("Too tired to study! Need at least 20 energy.")
-            return True
-        
-        # Set player to studying state
-        state.dorm_player_state = 'studying'
-        state.dorm_player_x = SCREEN_W - 380 + 100  # Desk center
-        state.dorm_player_y = SCREEN_H - 180 + 30  # Chair position
-        state.dorm_action_timer = 180  # 3 seconds
-        
-        if not state.flags['dormStudyDone']:
-            state.flags['dormStudyDone'] = True
-            knowledge_gain = 8
-            stress_gain = 3
-            energy_cost = 15
-            
-            if state.stress > 70:
-                knowledge_gain = int(knowledge_gain * 0.7)
-            
-            state.add_xp(10)
-            state.add_knowledge(knowledge_gain)
-            state.add_stress(stress_gain)
-            state.add_energy(-energy_cost)
-            state.add_discipline(2)
-            # Award coins for studying
-            state.collected_points += 5
-            toast(f"📚 Studying... +10 XP, +{knowledge_gain} Knowledge, +5 coins")
-        else:
-            if state.energy < 15:
-                toast("Too tired to study! Need at least 15 energy.")
-                state.dorm_player_state = 'idle'
-                return True
-            knowledge_gain = 5
-            stress_gain = 2
-            energy_cost = 15
-            if state.stress > 70:
-                knowledge_gain = int(knowledge_gain * 0.7)
-            state.add_xp(5)
-            state.add_knowledge(knowledge_gain)
-            state.add_stress(stress_gain)
-            state.add_energy(-energy_cost)
-            state.add_discipline(1)
-            # Award coins for studying
-            state.collected_points += 3
-            toast(f"📚 Studying... +5 XP, +{knowledge_gain} Knowledge, +3 coins")
-        return True
-    
-    # Check locker (get dorm key) - click to open/close
-    if dorm_locker_rect and dorm_locker_rect.collidepoint(mx, my):
-        if not state.locker_open:
-            state.locker_open = True
-            if not state.flags['dormKey']:
-                state.flags['dormKey'] = True
-                state.add_item('Dorm Key')
-                # Award points for getting key
-                state.add_xp(10)
-                state.collected_points += 3
-                toast("🔑 Locker opened! Dorm Key collected! (+10 XP, +3 coins)")
-            else:
-                # Still award small points for opening
-                state.add_xp(1)
-                state.collected_points += 1
-                toast("🔑 Locker opened (empty) (+1 XP, +1 coin)")
-        else:
-            state.locker_open = False
-            toast("🔒 Locker closed")
-        return True
-    
-    # Check shower (reduce stress) - player goes to shower
-    if dorm_shower_rect and dorm_shower_rect.collidepoint(mx, my):
-        if state.energy < 5:
-            toast("Too tired to shower! Need at least 5 energy.")
+    targets = (
+        ('exit', dorm_exit_door_rect),
+        ('bed', dorm_bed_rect),
+        ('desk', dorm_desk_rect),
+        ('locker', dorm_locker_rect),
+        ('shower', dorm_shower_rect),
+    )
+    for item, rect in targets:
+        if rect and rect.collidepoint(mx, my):
+            use_dorm_item(item)
             return True
-        
-        # Set player to showering state
-        state.dorm_player_state = 'showering'
-        state.dorm_player_x = SCREEN_W - 140 + 55  # Shower center
-        state.dorm_player_y = 180 + 110  # Shower center
-        state.dorm_action_timer = 120  # 2 seconds
-        state.shower_water_particles = []  # Reset water particles
-        state.add_stress(-10)
-        state.add_energy(-5)
-        # Award points for showering
-        state.add_xp(3)
-        state.collected_points += 1
-        toast("🚿 Showering... Stress -10, Energy -5 (+3 XP, +1 coin)")
-        return True
-    
     return False
 
 
 def handle_mouse(event):
+    # The victory card covers the campus (popup included) until Play Again
+    if state.victory_awarded and SCENES.current == 'campus':
+        VICTORY_BUTTON.handle_event(event)
+        return event.type == pygame.MOUSEBUTTONUP
+
     # Handle dorm interior clicks
-    if state.show_dorm_interior:
+    if SCENES.current == 'dorm':
         if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
             mx, my = event.pos
             if handle_dorm_interior_click(mx, my):
@@ -2400,6 +2452,8 @@ def handle_mouse(event):
     
     # popup buttons
     if active_popup and active_popup.handle_event(event, (SCREEN_W, SCREEN_H)):
+        # Not every action asks for a rebuild; reconciling is cheap, so always do it
+        rebuild_popup()
         return True
     # click on building to open
     if event.type == pygame.MOUSEBUTTONUP and event.button == 1:
@@ -2407,87 +2461,171 @@ def handle_mouse(event):
         mx -= 12; my -= 20
         for b in buildings:
             if b['rect'].collidepoint((mx, my)):
-                if not state.popup_open:
+                if not scene.popup_open:
                     open_popup_for(b['key'])
                 return True
     return False
 
 
+def sim_step(keys):
+    """Advance the game by one fixed tick (1 / SIM_HZ seconds of game time).
+
+    The game rules (clock, decay, events, dorm timers) run in the headless
+    engine; this adds movement and the presentation that moves with time.
+    """
+    player_prev.topleft = player_rect.topleft
+    leaving_dorm = state.dorm_player_state == 'exiting'
+    SIM.step()
+    # The player may already be out (Esc), or the exit came from a save
+    if leaving_dorm and state.dorm_player_state != 'exiting' and SCENES.current == 'dorm':
+        SCENES.pop()
+
+    SCENES.update(keys)
+    update_transition()
+
+
+def enter_dorm():
+    # Position player near the entrance (exit door area)
+    scene.popup_open = True
+    scene.dorm_player_x = SCREEN_W // 2  # Center horizontally
+    scene.dorm_player_y = SCREEN_H - 150  # Near the floor/entrance area
+    state.dorm_player_state = 'idle'  # Reset to idle
+    state.dorm_action_timer = 0
+    SHOWER_PARTICLES.clear()  # Reset water particles
+
+
+def exit_dorm():
+    scene.popup_open = False
+    if state.dorm_player_state == 'exiting':
+        # Left with Esc before the exit finished; don't let it fire on campus
+        state.dorm_player_state = 'idle'
+        state.dorm_action_timer = 0
+
+
+# Campus at the bottom; the city and the dorm are pushed on top of it
+SCENES = SceneStack()
+SCENES.add(Scene('campus', render_campus, update=update_campus, layers=lambda: (CAMPUS_LAYER,)))
+SCENES.add(Scene('city', render_city, update=update_city, layers=city_layers))
+# Looked up per call so the F3 profiler's timing wrapper is picked up
+SCENES.add(Scene('dorm', render_dorm, update=lambda keys: update_dorm_player(keys),
+                 enter=enter_dorm, exit=exit_dorm, layers=dorm_layers))
+SCENES.push('campus')
+# Where the player walks into the dorm, for prebaking it on approach
+DORM_DOOR = next((b['rect'].centerx, b['rect'].bottom) for b in buildings if b['key'] == 'dorm')
+
+
+def present():
+    """Show the finished frame."""
+    if DIRTY_RECTS:
+        DIRTY.present()
+    else:
+        pygame.display.flip()
+
+
+# F3 overlay: what each of these costs per frame, nested by depth
+_this = sys.modules[__name__]
+PROFILER = FrameProfiler([
+    (_this, 'sim_step', 0),
+    (Simulation, 'step', 1),
+    (_this, 'update_player', 1),
+    (_this, 'check_collectibles', 2),
+    (_this, 'update_dorm_player', 1),
+    (_this, 'update_city_player', 1),
+    (_this, 'update_city_cars', 1),
+    (_this, 'check_overlap', 0),
+    (_this, 'render', 0),
+    (_this, 'draw_map', 1),
+    (_this, 'draw_grass', 2),
+    (_this, 'draw_building', 2),
+    (_this, 'draw_collectibles', 2),
+    (_this, 'draw_player', 1),
+    (_this, 'draw_hud', 1),
+    (_this, 'draw_dorm_interior', 1),
+    (_this, 'draw_city_view', 1),
+    (Popup, 'draw', 1),
+    (_this, 'present', 0),
+])
+
+
 def main():
-    global suppress_until_exit, current_overlap
+    global suppress_until_exit, current_overlap, render_alpha
     running = True
-    frame_count = 0
+    accumulator = 0.0
+    # Bake every scene's static layers now so no transition has to
+    SCENES.prebake_all()
     while running:
-        CLOCK.tick(FPS)
-        frame_count += 1
-        
-        # Update time system every frame (ticks passed = 1)
-        time_changed = state.update_time(1)
-        if time_changed:
-            # Time of day changed - could trigger events here
-            # Note: Toast removed to avoid spam, but time progression is working
-            pass
-        
-        # Process stat decay/regeneration every 60 frames (1 second at 60 FPS)
-        if frame_count % 60 == 0:
-            state.process_stat_decay()
-            # Apply difficulty scaling to stress
-            stress_increase = state.stress_multiplier - 1.0
-            if stress_increase > 0:
-                state.add_stress(stress_increase * 0.1)
-        
-        # Update daily challenges and streak
-        if frame_count % 60 == 0:
-            state.update_daily_challenges()
-            state.update_streak()
-            state.update_difficulty()
-            
-            # Check daily challenges
-            challenge_rewards = state.check_daily_challenges()
-            for reward_msg in challenge_rewards:
-                toast(reward_msg)
-        
-        # Trigger random events occasionally
-        if frame_count % 120 == 0:  # Every 2 seconds
-            event_msg = state.trigger_random_event()
-            if event_msg:
-                toast(event_msg)
-        
-        for event in pygame.event.get():
+        # Real time since the last frame feeds the fixed-step simulation
+        frame_ms = CLOCK.tick(RENDER_FPS)
+        PROFILER.end_frame(frame_ms)
+        accumulator += frame_ms / 1000.0
+        if REPLAY:
+            # The recording decides the ticks, keys and input of each frame;
+            # only window events still come from the real queue
+            frame = REPLAY.next_frame()
+            if frame is None:
+                break
+            steps, mask, events = frame
+            events = events + [e for e in pygame.event.get()
+                               if e.type in (pygame.QUIT, pygame.VIDEORESIZE, pygame.VIDEOEXPOSE)]
+        else:
+            events = pygame.event.get()
+
+        for event in events:
             if event.type == pygame.QUIT:
                 running = False
+            elif event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                # Display format may have changed; re-bake static layers
+                # (the scenes not showing in the background)
+                invalidate_layers()
+                overlay.clear()
+                for name in SCENES.scenes:
+                    if name != SCENES.current:
+                        SCENES.prebake(name)
+                DIRTY.request_full()
             elif event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_F3:
+                    PROFILER.toggle()
+                    DIRTY.request_full()
+                elif event.key == pygame.K_F4:
+                    path = os.path.join(PROFILE_DIR, time.strftime('frames-%Y%m%d-%H%M%S.prof'))
+                    if PROFILER.capture(PROFILE_FRAMES, path):
+                        toast(f"Profiling the next {PROFILE_FRAMES} frames...")
                 if event.key == pygame.K_ESCAPE:
-                    if state.show_dorm_interior:
-                        state.show_dorm_interior = False
-                        state.popup_open = False
+                    if SCENES.current == 'dorm':
+                        SCENES.pop()
                         toast("Exited dormitory")
-                    elif state.show_city_view:
-                        state.transition_alpha = 255  # Start fade out
-                        state.show_city_view = False
+                    elif SCENES.current == 'city':
+                        scene.transition_alpha = 255  # Start fade out
+                        SCENES.pop()
                         toast("Returning to campus...")
-                    elif state.popup_open:
+                    elif scene.popup_open:
                         close_popup()
                 if event.key == pygame.K_e:
-                    if current_overlap and not state.popup_open:
+                    if current_overlap and not scene.popup_open:
                         open_popup_for(current_overlap['key'])
                 # Handle Enter key in dorm interior
                 if event.key == pygame.K_RETURN or event.key == pygame.K_KP_ENTER:
-                    if state.show_dorm_interior and state.dorm_player_state == 'idle':
+                    if SCENES.current == 'dorm' and state.dorm_player_state == 'idle':
                         handle_dorm_interior_enter()
             elif event.type in (pygame.MOUSEBUTTONUP,):
                 handle_mouse(event)
 
-        keys = pygame.key.get_pressed()
-        if state.show_dorm_interior:
-            # Allow player movement in dorm interior
-            update_dorm_player(keys)
-        elif state.show_city_view:
-            update_city_player(keys)
-            check_city_gate_collision()
+        if REPLAY:
+            accumulator = 0.0
         else:
-            update_player(keys)  # This also checks collectibles
-            check_gate_collision()
+            mask = key_mask(pygame.key.get_pressed())
+            steps = min(int(accumulator / SIM_DT), MAX_SIM_STEPS)
+            accumulator -= steps * SIM_DT
+            if accumulator >= SIM_DT:
+                # Too far behind to catch up: drop the backlog rather than spiral
+                accumulator = 0.0
+        # Keys are sampled once per frame and hold for all of its ticks
+        keys = HeldKeys(mask)
+        for _ in range(steps):
+            sim_step(keys)
+        if RECORDER:
+            RECORDER.frame(steps, mask, events)
+        render_alpha = accumulator / SIM_DT
 
         ov = check_overlap()
         if ov is None:
@@ -2498,15 +2636,34 @@ def main():
             if suppress_until_exit:
                 pass
             else:
-                if not state.popup_open:
+                if not scene.popup_open:
                     # auto-open on new overlap
                     if current_overlap is None or ov['key'] != current_overlap['key']:
                         open_popup_for(ov['key'])
             current_overlap = ov
 
         render()
-        pygame.display.flip()
-
+        if PROFILER.enabled:
+            overlay_rect = PROFILER.draw(SCREEN, FONT_SM)
+            DIRTY.track('profiler', overlay_rect)  # Clears what it no longer covers
+            DIRTY.mark(overlay_rect)
+        present()
+
+    PROFILER.close()
+    SCENES.close()
+    if AUTOSAVE:
+        SIM.sync()
+        AUTOSAVE.close(save.snapshot(state))
+    if JOURNAL:
+        SIM.sync()
+        JOURNAL.close()
+    if RECORDER or REPLAY:
+        # Same digest from a recording and its replay means the same session
+        SIM.sync()
+        if RECORDER:
+            RECORDER.close()
+        digest = hashlib.sha1(save.encode(state)).hexdigest()[:12]
+        print(f"{'Recorded' if RECORDER else 'Replayed'} {SIM.ticks} ticks, state {digest}")
     pygame.quit()
 
 